@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:51
+
+from django.db import migrations, models
+import shared.ids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    # The default is applied in Python, so only the migration state changes;
+    # altering the column on SQLite would needlessly rebuild the whole table.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='user',
+                    name='id',
+                    field=models.UUIDField(default=shared.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
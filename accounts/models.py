@@ -1,12 +1,31 @@
 from __future__ import annotations
 
+import string
+import sys
 from typing import Any
 
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 from shared.models import BaseModel
 
+# SQLite's lower() folds only ASCII letters; str.lower() would fold others too
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _prefix_end(prefix: str) -> str | None:
+    """The smallest string above every one starting with `prefix`, if any."""
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    following = ord(prefix[-1]) + 1
+    if 0xD800 <= following <= 0xDFFF:
+        # Surrogates can't be stored; skip to the first character after them
+        following = 0xE000
+    return prefix[:-1] + chr(following)
+
 
 class UserManager(BaseUserManager["User"]):
     """Custom user manager using email as the unique identifier."""
@@ -29,6 +48,31 @@ class UserManager(BaseUserManager["User"]):
         extra_fields.setdefault("is_superuser", True)
         return self.create_user(email, password, **extra_fields)
 
+    def search(self, query: str):
+        """
+        Users whose email, first name or last name starts with each word of
+        `query`, ignoring the case of ASCII letters (as SQLite's ``lower()``
+        does; "É" and "é" still differ).
+
+        Each prefix becomes a range over ``lower()`` of the column, which the
+        expression indexes in ``Meta.indexes`` serve; a LIKE couldn't use them.
+        """
+        queryset = self.get_queryset().alias(
+            email_lower=Lower("email"),
+            first_name_lower=Lower("first_name"),
+            last_name_lower=Lower("last_name"),
+        )
+        for word in query.translate(_ASCII_LOWER).split():
+            end = _prefix_end(word)
+            matches = Q()
+            for column in ("email_lower", "first_name_lower", "last_name_lower"):
+                bounds = {f"{column}__gte": word}
+                if end is not None:
+                    bounds[f"{column}__lt"] = end
+                matches |= Q(**bounds)
+            queryset = queryset.filter(matches)
+        return queryset
+
 
 class User(BaseModel, AbstractBaseUser, PermissionsMixin):
     """
@@ -49,6 +93,11 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         db_table = "users"
+        indexes = [
+            models.Index(Lower("email"), name="users_email_lower_idx"),
+            models.Index(Lower("first_name"), name="users_first_name_lower_idx"),
+            models.Index(Lower("last_name"), name="users_last_name_lower_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.email
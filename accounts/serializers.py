@@ -23,3 +23,14 @@ class UserSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "email", "created_at", "updated_at"]
+
+
+class UserDirectorySerializer(serializers.ModelSerializer):
+    """Read-only listing of users, without the fields only their owner needs."""
+
+    full_name = serializers.ReadOnlyField()
+
+    class Meta:
+        model = User
+        fields = ["id", "email", "first_name", "last_name", "full_name", "created_at"]
+        read_only_fields = fields
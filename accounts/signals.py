@@ -0,0 +1,18 @@
+"""
+Signal handlers for the accounts app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from shared.authentication import user_cache
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, using, **kwargs) -> None:
+    """Drop the user from the authentication cache, covering password changes too."""
+    user_cache.invalidate(instance.pk)
+    # Again once committed, in case a request cached the old row meanwhile
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk), using=using)
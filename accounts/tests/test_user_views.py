@@ -99,3 +99,65 @@ def test_user_list_response_structure(
     assert "last_name" in user_data
     assert "full_name" in user_data
     assert "created_at" in user_data
+
+
+@pytest.mark.django_db
+def test_user_list_pages_by_cursor(
+    authenticated_client: tuple[APIClient, User],
+) -> None:
+    """GET /api/accounts/list pages through users by email with cursors."""
+    client, user = authenticated_client
+    for number in range(4):
+        create_user(email=f"user{number}@example.com")
+
+    first = client.get(f"{BASE_URL}/list", {"page_size": 3})
+    second = client.get(first.data["next"])
+
+    assert "count" not in first.data
+    emails = [u["email"] for u in first.data["results"] + second.data["results"]]
+    assert emails == sorted(User.objects.values_list("email", flat=True))
+    assert second.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_user_list_search_matches_prefixes(
+    authenticated_client: tuple[APIClient, User],
+) -> None:
+    """GET /api/accounts/list?search= matches email and name prefixes, ignoring case."""
+    client, _ = authenticated_client
+    create_user(email="ada@example.com", first_name="Ada", last_name="Lovelace")
+    create_user(email="grace@example.com", first_name="Grace", last_name="Hopper")
+    create_user(email="alan@example.com", first_name="Alan", last_name="Turing")
+
+    def search(query: str) -> set[str]:
+        response = client.get(f"{BASE_URL}/list", {"search": query})
+        return {u["email"] for u in response.data["results"]}
+
+    assert search("GRA") == {"grace@example.com"}
+    assert search("love") == {"ada@example.com"}
+    assert search("a") == {"ada@example.com", "alan@example.com"}
+    assert search("ada love") == {"ada@example.com"}
+    assert search("lace") == set()
+
+
+@pytest.mark.django_db
+def test_user_search_edge_characters() -> None:
+    """User.objects.search() folds only ASCII, like SQLite, and takes any character."""
+    create_user(email="elise@example.com", first_name="Élise")
+
+    def search(query: str) -> set[str]:
+        return set(User.objects.search(query).values_list("email", flat=True))
+
+    assert search("ÉLI") == {"elise@example.com"}
+    assert search("éli") == set()
+    assert search("\U0010ffff") == set()
+    assert search("\ud7ff") == set()
+
+
+@pytest.mark.django_db
+def test_user_search_uses_indexes() -> None:
+    """User.objects.search() is served by the lower() expression indexes."""
+    plan = User.objects.search("ada").explain()
+
+    assert "users_email_lower_idx" in plan
+    assert "users_last_name_lower_idx" in plan
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from rest_framework import generics
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import User
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserDirectorySerializer, UserSerializer
 
 
 class CurrentUserView(APIView):
@@ -23,12 +24,31 @@ class CurrentUserView(APIView):
         return Response(serializer.data)
 
 
+class UserCursorPagination(CursorPagination):
+    """
+    Keyset pagination by email: each page continues from the last email of
+    the previous one, so neither a COUNT nor an OFFSET scans the table.
+    """
+
+    ordering = "email"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
 class UserListView(generics.ListAPIView):
     """
     GET /api/accounts/list/
-    List all users (authenticated only).
+    GET /api/accounts/list?search=ada
+    GET /api/accounts/list?cursor=<next cursor>
+    List users, by email (authenticated only).
     """
 
-    queryset = User.objects.all()
-    serializer_class = UserSerializer
+    serializer_class = UserDirectorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserCursorPagination
+
+    def get_queryset(self):
+        search = self.request.query_params.get("search", "").strip()
+        queryset = User.objects.search(search) if search else User.objects.all()
+        # full_name reads the name and email columns
+        return queryset.only("email", "first_name", "last_name", "created_at")
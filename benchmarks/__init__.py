@@ -0,0 +1,6 @@
+"""
+Standalone performance benchmarks.
+
+Each module is runnable with ``python -m benchmarks.<name>`` from the project
+root and prints its results; none of them are collected by pytest.
+"""
@@ -0,0 +1,209 @@
+"""
+Compare a threaded WSGI worker with an ASGI worker under many connections.
+
+Each run builds a throwaway database with generate_dataset, then keeps
+``--connections`` clients busy for ``--seconds`` requesting catalog pages
+(product list, search, detail, categories) and the cart. Every client is
+slow to read its response (``--client-latency``), as mobile clients are:
+
+* ``wsgi``: the sync views behind ``config.wsgi`` on a pool of
+  ``--threads`` worker threads (a gunicorn gthread worker). A thread stays
+  busy until its client has read the response.
+* ``asgi``: the async views behind ``config.asgi`` on one event loop (a
+  uvicorn worker). A slow client only holds a coroutine.
+
+Both run in-process without sockets, so the numbers isolate how many
+concurrent connections one worker can serve rather than network overhead.
+
+Usage:
+    python -m benchmarks.asgi [--connections 10,100,400] [--threads 4] [--seconds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from shared.benchmarking import percentile
+
+PATHS = [
+    "/api/products/",
+    "/api/products/?page=2",
+    "/api/products/?search=diver",
+    "/api/products/categories/",
+    "/api/cart/",
+]
+
+
+def request_paths(rng: random.Random, product_ids: list[str]) -> str:
+    if rng.random() < 0.3:
+        return f"/api/products/{rng.choice(product_ids)}/"
+    return rng.choice(PATHS)
+
+
+def run_wsgi(args, product_ids: list[str]) -> list[float]:
+    """Return request latencies; requests queued at the deadline still finish."""
+    from django.core.wsgi import get_wsgi_application
+    from django.test.client import RequestFactory
+
+    application = get_wsgi_application()
+    factory = RequestFactory()
+    deadline = time.monotonic() + args.seconds
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def handle(path: str) -> None:
+        path_info, _, query = path.partition("?")
+        environ = factory._base_environ(PATH_INFO=path_info, QUERY_STRING=query)
+        environ["wsgi.input"] = io.BytesIO()
+        body = application(environ, lambda status, headers: None)
+        try:
+            b"".join(body)
+            # The worker thread writes to the socket until the client has it all
+            time.sleep(args.client_latency)
+        finally:
+            getattr(body, "close", lambda: None)()
+
+    with ThreadPoolExecutor(max_workers=args.threads) as workers:
+
+        def client(number: int) -> None:
+            rng = random.Random(number)
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                workers.submit(handle, request_paths(rng, product_ids)).result()
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+
+        with ThreadPoolExecutor(max_workers=args.clients) as clients:
+            list(clients.map(client, range(args.clients)))
+    return latencies
+
+
+def run_asgi(args, product_ids: list[str]) -> list[float]:
+    """Return request latencies; requests in flight at the deadline still finish."""
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    latencies: list[float] = []
+
+    async def handle(path: str) -> None:
+        path_info, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path_info,
+            "raw_path": path_info.encode(),
+            "query_string": query.encode(),
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                # Only this connection waits while the client reads
+                await asyncio.sleep(args.client_latency)
+
+        await application(scope, receive, send)
+
+    async def client(number: int, deadline: float) -> None:
+        rng = random.Random(number)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            await handle(request_paths(rng, product_ids))
+            latencies.append(time.perf_counter() - started)
+
+    async def main() -> None:
+        deadline = time.monotonic() + args.seconds
+        await asyncio.gather(*(client(number, deadline) for number in range(args.clients)))
+
+    asyncio.run(main())
+    return latencies
+
+
+def child(args) -> None:
+    """Run one server mode at one concurrency and print JSON results."""
+    import django
+
+    django.setup()
+    import logging
+
+    from products.models import Product
+    from shared.benchmarking import benchmark_database
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp, benchmark_database(
+        users=50, products=args.products, orders=200, seed=42,
+        test_name=str(Path(tmp) / "asgi.sqlite3"),
+    ):
+        product_ids = [str(pk) for pk in Product.objects.active().values_list("id", flat=True)[:500]]
+        run = run_asgi if args.mode == "asgi" else run_wsgi
+        started = time.perf_counter()
+        latencies = run(args, product_ids)
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(json.dumps({
+        "requests_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--connections", default="10,100,400")
+    parser.add_argument("--threads", type=int, default=4, help="WSGI worker threads")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--client-latency", type=float, default=0.05, help="Seconds per response")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--mode", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--clients", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args)
+        return
+
+    # Each mode runs in its own interpreter: the URLconf picks sync or async
+    # views from ASYNC_VIEWS at import time
+    for clients in [int(value) for value in args.connections.split(",")]:
+        print(f"{clients} connections ({args.client_latency * 1000:g} ms per response to read)")
+        for mode in ("wsgi", "asgi"):
+            env = {
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": "config.settings",
+                "ASYNC_VIEWS": str(mode == "asgi"),
+                "DEBUG": "False",
+            }
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.asgi", *sys.argv[1:],
+                 "--mode", mode, "--clients", str(clients)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results = json.loads(output.strip().splitlines()[-1])
+            label = f"{mode} ({args.threads} threads)" if mode == "wsgi" else f"{mode} (1 event loop)"
+            print(
+                f"  {label:<20} {results['requests_per_s']:>9,.1f} req/s  "
+                f"p50 {results['p50_ms']:>8.1f} ms  p95 {results['p95_ms']:>8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Compare gunicorn worker models under the browse-to-checkout load test.
+
+Builds a throwaway SQLite database with generate_dataset, then for each
+worker model starts gunicorn with gunicorn.conf.py on a local port and
+drives it over HTTP with the load_test journeys (no think time):
+
+* ``sync``: one request per process, 2 x CPUs + 1 processes;
+* ``gthread``: CPUs + 1 processes with 4 threads each;
+* ``uvicorn``: one event loop per CPU serving config.asgi (only when
+  ``uvicorn`` is installed).
+
+Worker and thread counts follow gunicorn.conf.py's defaults unless
+``--workers``/``--threads`` are given.
+
+Usage:
+    python -m benchmarks.gunicorn [--users 16] [--seconds 10] [--models sync,gthread,uvicorn]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODELS = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn.workers.UvicornWorker",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn did not listen on port {port} within {timeout:g}s")
+
+
+def manage(*args: str, env: dict[str, str]) -> None:
+    subprocess.run(
+        [sys.executable, "manage.py", *args], cwd=ROOT, env=env, check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def run_model(worker_class: str, args, env: dict[str, str]) -> dict:
+    """Serve the app with `worker_class` and return the load test report."""
+    from shared.loadtest import report, run_load
+
+    port = free_port()
+    server_env = {**env, "GUNICORN_WORKER_CLASS": worker_class, "GUNICORN_BIND": f"127.0.0.1:{port}"}
+    if args.workers:
+        server_env["GUNICORN_WORKERS"] = str(args.workers)
+    if args.threads:
+        server_env["GUNICORN_THREADS"] = str(args.threads)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=ROOT, env=server_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port, server)
+        started = time.perf_counter()
+        samples = run_load(
+            target=f"http://127.0.0.1:{port}", processes=args.processes,
+            concurrency=max(args.users // args.processes, 1), duration=args.seconds,
+            think_time=0, seed=42,
+        )
+        return report(samples, time.perf_counter() - started)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", default=",".join(MODELS))
+    parser.add_argument("--users", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--processes", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, help="Override the worker processes")
+    parser.add_argument("--threads", type=int, help="Override the gthread threads")
+    parser.add_argument("--products", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+    models = [name for name in args.models.split(",") if name]
+    if "uvicorn" in models and importlib.util.find_spec("uvicorn") is None:
+        print("Skipping uvicorn: not installed")
+        models.remove("uvicorn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_PATH": str(Path(tmp) / "gunicorn.sqlite3"),
+            "DEBUG": "False",
+        }
+        manage("migrate", env=env)
+        manage("generate_dataset", "--products", str(args.products), "--users", "50",
+               "--orders", "200", "--seed", "42", env=env)
+
+        for name in models:
+            results = run_model(MODELS[name], args, env)
+            checkout = results["checkout"]
+            requests = sum(step["requests"] for step in results.values())
+            errors = sum(step["errors"] for step in results.values())
+            print(f"{name} ({args.users} users, {args.seconds:g}s)")
+            print(f"  {'checkouts/s':<20} {checkout['throughput']:>10,.1f}")
+            print(f"  {'requests':<20} {requests:>10,}")
+            print(f"  {'errors':<20} {errors:>10,}")
+            for step, result in results.items():
+                print(f"  {step + ' p95 ms':<20} {result['p95_ms']:>10,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare UUIDv4 and UUIDv7 primary keys on SQLite.
+
+Builds a table shaped like a BaseModel table (``char(32)`` primary key,
+``created_at`` without an index) for each key type and measures:
+
+* insert throughput, committed in batches;
+* fetching the 100 most recent rows, ordered by ``created_at`` (the current
+  ``Meta.ordering``) and, for UUIDv7, by ``id``;
+* counting rows created in the last 10% of the run, by ``created_at`` range
+  and, for UUIDv7, by ``id`` range.
+
+Usage:
+    python -m benchmarks.ids [--rows 200000] [--batch 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from shared.ids import uuid7, uuid7_floor
+
+SCHEMA = (
+    'CREATE TABLE bench ("id" char(32) NOT NULL PRIMARY KEY, '
+    '"created_at" datetime NOT NULL, "payload" text NOT NULL)'
+)
+
+
+def _timed(fn: Callable[[], object], repeat: int = 20) -> float:
+    """Return the best wall time of `fn` in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(name: str, make_id: Callable[[], uuid.UUID], rows: int, batch: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.execute(SCHEMA)
+
+        base = datetime.now(timezone.utc)
+        cutoff_index = int(rows * 0.9)
+        cutoff_at = None
+        cutoff_id = None
+
+        start = time.perf_counter()
+        for offset in range(0, rows, batch):
+            values = []
+            for i in range(offset, min(offset + batch, rows)):
+                created = base + timedelta(microseconds=i)
+                if i == cutoff_index:
+                    cutoff_at = created.isoformat(" ")
+                    cutoff_id = uuid7_floor(datetime.now(timezone.utc)).hex
+                values.append((make_id().hex, created.isoformat(" "), "x" * 64))
+            conn.executemany("INSERT INTO bench VALUES (?, ?, ?)", values)
+            conn.commit()
+        insert_seconds = time.perf_counter() - start
+
+        results = {
+            "insert_rows_per_s": rows / insert_seconds,
+            "db_size_mb": os.path.getsize(path) / 1e6,
+            "latest_100_by_created_at_ms": _timed(lambda: conn.execute(
+                "SELECT * FROM bench ORDER BY created_at DESC LIMIT 100"
+            ).fetchall()),
+            "recent_count_by_created_at_ms": _timed(lambda: conn.execute(
+                "SELECT COUNT(*) FROM bench WHERE created_at >= ?", (cutoff_at,)
+            ).fetchone()),
+        }
+        if name == "uuid7":
+            results["latest_100_by_id_ms"] = _timed(lambda: conn.execute(
+                "SELECT * FROM bench ORDER BY id DESC LIMIT 100"
+            ).fetchall())
+            results["recent_count_by_id_ms"] = _timed(lambda: conn.execute(
+                "SELECT COUNT(*) FROM bench WHERE id >= ?", (cutoff_id,)
+            ).fetchone())
+        conn.close()
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    for name, make_id in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        results = run(name, make_id, args.rows, args.batch)
+        print(f"{name} ({args.rows:,} rows)")
+        for key, value in results.items():
+            print(f"  {key:<32} {value:>12,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare DRF's JSONRenderer/JSONParser with shared.renderers/shared.parsers.
+
+Builds a throwaway database with generate_dataset, then renders and parses
+the payloads the API serves most:
+
+* ``products``: a product list page (ProductListSerializer);
+* ``orders``: orders with their items (OrderSerializer);
+* ``rows``: ``values()`` rows, whose Decimal, UUID and datetime values go
+  through the encoder rather than arriving as strings.
+
+Every payload is checked to render to the same bytes with both renderers.
+
+Usage:
+    python -m benchmarks.renderers [--page-size 100] [--orders 50] [--repeat 200]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import time
+from collections.abc import Callable
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of `fn` in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000_000
+
+
+def payloads(page_size: int, orders: int) -> dict[str, object]:
+    from orders.models import Order
+    from orders.serializers import OrderSerializer
+    from products.models import Product
+    from products.serializers import ProductListSerializer
+
+    products = Product.objects.active().select_related("category")[:page_size]
+    recent = Order.objects.prefetch_related("items")[:orders]
+    return {
+        "products": {
+            "count": page_size,
+            "next": None,
+            "previous": None,
+            "results": ProductListSerializer(products, many=True).data,
+        },
+        "orders": OrderSerializer(recent, many=True).data,
+        "rows": list(Product.objects.values("id", "name", "price", "created_at")[:page_size]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from rest_framework.parsers import JSONParser as DRFJSONParser
+    from rest_framework.renderers import JSONRenderer as DRFJSONRenderer
+
+    from shared import parsers, renderers
+    from shared.benchmarking import benchmark_database
+
+    if renderers.orjson is None:
+        print("orjson is not installed; both renderers use the stdlib json module.")
+
+    with benchmark_database(users=50, products=max(args.page_size, 500), orders=200, seed=42):
+        data = payloads(args.page_size, args.orders)
+
+    columns = ("render drf", "render new", "parse drf", "parse new")
+    print(f"{'payload':<10} {'bytes':>8}" + "".join(f"{column:>12}" for column in columns))
+    for name, payload in data.items():
+        drf, fast = DRFJSONRenderer(), renderers.JSONRenderer()
+        body = drf.render(payload)
+        if fast.render(payload) != body:
+            raise SystemExit(f"{name}: the renderers disagree")
+        drf_parser, fast_parser = DRFJSONParser(), parsers.JSONParser()
+        times = [
+            _timed(lambda: drf.render(payload), args.repeat),
+            _timed(lambda: fast.render(payload), args.repeat),
+            _timed(lambda: drf_parser.parse(io.BytesIO(body)), args.repeat),
+            _timed(lambda: fast_parser.parse(io.BytesIO(body)), args.repeat),
+        ]
+        print(f"{name:<10} {len(body):>8,}" + "".join(f"{value:>10,.0f}µs" for value in times))
+
+
+if __name__ == "__main__":
+    main()
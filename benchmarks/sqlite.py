@@ -0,0 +1,162 @@
+"""
+Concurrent SQLite write throughput, before and after connection tuning.
+
+Worker processes (standing in for gunicorn workers) hammer one database
+file with request-sized transactions shaped like the app's hot writes:
+
+* a session save (read the row, then insert or update it);
+* a checkout (read a product, insert an order and two items).
+
+Each configuration is run for the same time:
+
+* ``default``: Django's stock SQLite setup (rollback journal,
+  ``synchronous=FULL``, deferred transactions, a new connection per request);
+* ``wal``: the PRAGMAs from settings, still deferred and per-request;
+* ``tuned``: the PRAGMAs, ``BEGIN IMMEDIATE`` and persistent connections,
+  i.e. ``DATABASES["default"]`` as configured.
+
+Usage:
+    python -m benchmarks.sqlite [--workers 8] [--seconds 5] [--checkout-ratio 0.2]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+from multiprocessing import get_context
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+from django.conf import settings  # noqa: E402
+
+from shared.sqlite import apply_pragmas  # noqa: E402
+
+SCHEMA = [
+    'CREATE TABLE session ("key" varchar(40) PRIMARY KEY, "data" text, "expire" datetime)',
+    'CREATE TABLE product ("id" char(32) PRIMARY KEY, "price" decimal, "stock" integer)',
+    'CREATE TABLE "order" ("id" char(32) PRIMARY KEY, "email" varchar(254), "total" decimal, '
+    '"created_at" datetime)',
+    'CREATE TABLE item ("id" char(32) PRIMARY KEY, "order_id" char(32), "product_id" char(32), '
+    '"quantity" integer)',
+]
+
+
+def configurations() -> dict[str, dict]:
+    options = settings.DATABASES["default"].get("OPTIONS", {})
+    pragmas = options.get("pragmas", {})
+    return {
+        "default": {"pragmas": {}, "mode": "DEFERRED", "persistent": False},
+        "wal": {"pragmas": pragmas, "mode": "DEFERRED", "persistent": False},
+        "tuned": {
+            "pragmas": pragmas,
+            "mode": options.get("transaction_mode", "IMMEDIATE"),
+            "persistent": True,
+        },
+    }
+
+
+def connect(path: str, config: dict) -> sqlite3.Connection:
+    # Same as Django: autocommit at the sqlite3 level, default 5 s timeout
+    conn = sqlite3.connect(path, isolation_level=None)
+    apply_pragmas(conn, config["pragmas"])
+    return conn
+
+
+def save_session(conn: sqlite3.Connection, rng: random.Random, mode: str) -> None:
+    key = f"s{rng.randrange(5000)}"
+    conn.execute(f"BEGIN {mode}")
+    exists = conn.execute('SELECT 1 FROM session WHERE "key" = ?', (key,)).fetchone()
+    if exists:
+        conn.execute('UPDATE session SET "data" = ? WHERE "key" = ?', ("x" * 300, key))
+    else:
+        conn.execute("INSERT INTO session VALUES (?, ?, datetime('now'))", (key, "x" * 300))
+    conn.execute("COMMIT")
+
+
+def checkout(conn: sqlite3.Connection, rng: random.Random, mode: str) -> None:
+    conn.execute(f"BEGIN {mode}")
+    product_id, price = conn.execute(
+        "SELECT id, price FROM product WHERE rowid = ?", (rng.randint(1, 1000),)
+    ).fetchone()
+    order_id = uuid.uuid4().hex
+    conn.execute(
+        "INSERT INTO \"order\" VALUES (?, ?, ?, datetime('now'))",
+        (order_id, "load@example.com", price),
+    )
+    for _ in range(2):
+        conn.execute(
+            "INSERT INTO item VALUES (?, ?, ?, ?)", (uuid.uuid4().hex, order_id, product_id, 1)
+        )
+    conn.execute("COMMIT")
+
+
+def worker(path: str, config: dict, seconds: float, checkout_ratio: float, seed: int):
+    rng = random.Random(seed)
+    commits = errors = 0
+    conn = connect(path, config) if config["persistent"] else None
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        request_conn = conn or connect(path, config)
+        try:
+            if rng.random() < checkout_ratio:
+                checkout(request_conn, rng, config["mode"])
+            else:
+                save_session(request_conn, rng, config["mode"])
+            commits += 1
+        except sqlite3.OperationalError:
+            # "database is locked": the request would have returned a 500
+            errors += 1
+            if request_conn.in_transaction:
+                request_conn.execute("ROLLBACK")
+        finally:
+            if conn is None:
+                request_conn.close()
+    return commits, errors
+
+
+def run(config: dict, workers: int, seconds: float, checkout_ratio: float) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        setup = connect(path, config)
+        for statement in SCHEMA:
+            setup.execute(statement)
+        setup.executemany(
+            "INSERT INTO product VALUES (?, ?, ?)",
+            [(uuid.uuid4().hex, 99.5, 10) for _ in range(1000)],
+        )
+        setup.close()
+
+        with get_context("fork").Pool(workers) as pool:
+            results = pool.starmap(
+                worker,
+                [(path, config, seconds, checkout_ratio, seed) for seed in range(workers)],
+            )
+    commits = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    return {
+        "commits_per_s": commits / seconds,
+        "errors_per_s": errors / seconds,
+        "error_rate_pct": 100 * errors / max(commits + errors, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--checkout-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    for name, config in configurations().items():
+        results = run(config, args.workers, args.seconds, args.checkout_ratio)
+        print(f"{name} ({args.workers} writers, {args.seconds:g}s)")
+        for key, value in results.items():
+            print(f"  {key:<16} {value:>12,.2f}")
+
+
+if __name__ == "__main__":
+    main()
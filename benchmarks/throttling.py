@@ -0,0 +1,73 @@
+"""
+Time throttle decisions in each store (see shared/throttling).
+
+For each store and algorithm, measures the mean time of one decision over
+`--clients` client keys, plus a full ``Throttle.allow_request()`` against the
+configured store. The file store is created on /dev/shm when available, as
+gunicorn.conf.py does.
+
+Usage:
+    python -m benchmarks.throttling [--clients 1000] [--decisions 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def _mean(update, keys: list[str], decisions: int) -> float:
+    """Return the mean time of `update(key)` in microseconds."""
+    start = time.perf_counter()
+    for number in range(decisions):
+        update(keys[number % len(keys)])
+    return (time.perf_counter() - start) / decisions * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--decisions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.test import override_settings
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from shared import throttling
+
+    keys = [f"products:ip:10.0.{number // 256}.{number % 256}" for number in range(args.clients)]
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    with tempfile.NamedTemporaryFile(dir=directory) as file:
+        stores = {
+            "memory": throttling.MemoryStore(),
+            "file": throttling.FileStore(file.name),
+            "cache": throttling.CacheStore("default"),
+        }
+        print(f"{'store':<8}{'token bucket':>14}{'sliding window':>16}")
+        for name, store in stores.items():
+            times = []
+            for algorithm in (throttling.token_bucket, throttling.sliding_window):
+                def update(key, algorithm=algorithm):
+                    store.update(key, lambda state, now: algorithm(state, now, 10**9, 60), 120)
+                times.append(_mean(update, keys, args.decisions))
+            print(f"{name:<8}" + "".join(f"{value:>14.2f}µs" for value in times))
+
+        # A whole decision: rate lookup, client address and the file store
+        view = type("View", (), {"throttle_scope": "products"})()
+        request = Request(APIRequestFactory().get("/api/products/"))
+        request.user = None
+        throttle = throttling.SlidingWindowThrottle()
+        with override_settings(THROTTLE_STORE="file", THROTTLE_FILE=file.name, THROTTLING=True):
+            throttling.reset()
+            elapsed = _mean(lambda key: throttle.allow_request(request, view), keys, args.decisions)
+        print(f"allow_request() with the file store: {elapsed:.2f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Serve the catalog and cart through their async views
+os.environ.setdefault("ASYNC_VIEWS", "True")
+application = get_asgi_application()
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from decimal import Decimal
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,9 +43,18 @@ AUTH_USER_MODEL = "accounts.User"
 # Middleware
 # =============================================================================
 MIDDLEWARE = [
+    # First, so every log record of the request carries its id
+    "shared.middleware.RequestIdMiddleware",
+    # Next, so its total covers every other middleware
+    "shared.middleware.RequestTimingMiddleware",
+    # Before anything that reads or changes the body
+    "shared.middleware.CompressionMiddleware",
+    # Inside compression, so ETags are computed on the uncompressed body
+    "django.middleware.http.ConditionalGetMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "shared.middleware.WhiteNoiseMiddleware",
+    "shared.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -75,17 +85,62 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
+
+# Route the catalog and cart to their async views; config/asgi.py turns this on
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False").lower() == "true"
 
 # =============================================================================
 # Database
 # =============================================================================
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        # Django's SQLite backend with connection PRAGMAs (see shared/sqlite)
+        "ENGINE": "shared.sqlite",
+        "NAME": os.getenv("DATABASE_PATH", BASE_DIR / "db.sqlite3"),
+        # Reuse connections across requests (seconds; 0 closes after each request)
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Take the write lock when atomic() starts so writers queue up
+            "transaction_mode": os.getenv("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+            # Set a variable to an empty string to keep SQLite's default
+            "pragmas": {
+                "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "wal"),
+                "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "normal"),
+                "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),  # milliseconds
+                "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),  # bytes
+                "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),  # negative means KiB
+                "temp_store": os.getenv("SQLITE_TEMP_STORE", "memory"),
+            },
+        },
     }
 }
 
+# Read replicas: comma-separated SQLite files kept in sync with the primary,
+# e.g. DB_REPLICAS=/data/replica1.sqlite3,/data/replica2.sqlite3
+DATABASE_REPLICAS = []
+for number, path in enumerate(filter(None, os.getenv("DB_REPLICAS", "").split(",")), start=1):
+    alias = f"replica{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "NAME": path.strip(),
+        "OPTIONS": {
+            **DATABASES["default"]["OPTIONS"],
+            "pragmas": {**DATABASES["default"]["OPTIONS"]["pragmas"], "query_only": "on"},
+        },
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["shared.routers.ReplicaRouter"]
+
+# Apps whose reads may be served by a replica (see shared/routers.py)
+DATABASE_REPLICA_APPS = os.getenv("DB_REPLICA_APPS", "products").split(",")
+
+# How long a client reads from the primary after writing replicated data
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
 # =============================================================================
 # Password Validation
 # =============================================================================
@@ -132,10 +187,32 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWTAuthentication, with users cached per process between requests
+        "shared.authentication.CachedJWTAuthentication",
         # DevAutoAuthentication auto-authenticates in DEBUG mode when no JWT is provided
         "shared.authentication.DevAutoAuthentication",
     ],
+    # DRF's JSON renderer and parser, sped up with orjson when installed
+    "DEFAULT_RENDERER_CLASSES": [
+        "shared.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "shared.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Per-client limits for views with a throttle_scope (see shared/throttling);
+    # "<scope>:user" applies to signed-in clients
+    "DEFAULT_THROTTLE_RATES": {
+        "cart": os.getenv("THROTTLE_RATE_CART", "60/min"),
+        "checkout": os.getenv("THROTTLE_RATE_CHECKOUT", "10/min"),
+        "products": os.getenv("THROTTLE_RATE_PRODUCTS", "300/min"),
+    },
+    # Proxies (load balancer, CDN) in front of the app. Client addresses, for
+    # throttling, are read from the X-Forwarded-For entry they appended; at
+    # 0 REMOTE_ADDR is used, since clients can write any X-Forwarded-For
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
 }
@@ -149,6 +226,10 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+# Users kept in each process's authentication cache, and for how many seconds
+# (0 disables it); saves elsewhere are seen once an entry expires
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
 
 # =============================================================================
 # CORS Settings
@@ -170,19 +251,138 @@ CSRF_TRUSTED_ORIGINS = [
 SESSION_COOKIE_AGE = 60 * 60 * 24 * 30  # 30 days
 SESSION_COOKIE_HTTPONLY = True
 
+# Where anonymous shoppers' carts are kept: "session" or "cookie" (a signed
+# cookie, see orders/cart.py); signed-in shoppers always use the session
+CART_STORAGE = os.getenv("CART_STORAGE", "session")
+CART_COOKIE_NAME = "cart"
+CART_COOKIE_AGE = SESSION_COOKIE_AGE
+# Bytes; a larger cart moves into the session
+CART_COOKIE_MAX_SIZE = int(os.getenv("CART_COOKIE_MAX_SIZE", "2048"))
+
+# =============================================================================
+# Orders
+# =============================================================================
+# Tax rate used when no TaxRate row matches the shipping destination
+DEFAULT_TAX_RATE = Decimal(os.getenv("DEFAULT_TAX_RATE", "0.08"))
+# Seconds before the in-memory tax/shipping rate table is reloaded
+RATE_TABLE_TTL = int(os.getenv("RATE_TABLE_TTL", "60"))
+
+# =============================================================================
+# HTTP Caching
+# =============================================================================
+# Cache-Control for catalog responses to anonymous clients (see shared/httpcache)
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "60"))
+# How long a CDN keeps them; changes purge them by surrogate key
+CATALOG_CACHE_SHARED_MAX_AGE = int(os.getenv("CATALOG_CACHE_SHARED_MAX_AGE", "3600"))
+CATALOG_CACHE_STALE_SECONDS = int(os.getenv("CATALOG_CACHE_STALE_SECONDS", "60"))
+CATALOG_CACHE_STALE_IF_ERROR_SECONDS = int(os.getenv("CATALOG_CACHE_STALE_IF_ERROR_SECONDS", "86400"))
+# Space-separated keys: "Surrogate-Key" for Fastly, "xkey" for Varnish
+SURROGATE_KEY_HEADER = os.getenv("SURROGATE_KEY_HEADER", "Surrogate-Key")
+
+# =============================================================================
+# Response Compression
+# =============================================================================
+# Compress API responses (turn off when a proxy in front already does)
+COMPRESSION = os.getenv("COMPRESSION", "True").lower() == "true"
+# Smaller bodies aren't worth the CPU or the compression headers
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Brotli (when the brotli package is installed) is offered first; 0-11,
+# with 4-5 a good trade-off for responses compressed on every request
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+# Not HTML: pages that reflect input next to a secret are open to BREACH.
+# Static files are compressed ahead of time by WhiteNoise
+COMPRESSION_TYPES = ["application/json", "application/x-ndjson", "text/csv"]
+
+# =============================================================================
+# Throttling
+# =============================================================================
+# Rates are REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]; turn off to let load
+# tests through
+THROTTLING = os.getenv("THROTTLING", "True").lower() == "true"
+# File shared by the workers on this host, which makes "file" the default
+# store; gunicorn.conf.py creates one on /dev/shm
+THROTTLE_FILE = os.getenv("THROTTLE_FILE", "")
+THROTTLE_FILE_SLOTS = int(os.getenv("THROTTLE_FILE_SLOTS", "65536"))
+# Django cache for limits shared by several hosts, with THROTTLE_STORE=cache
+THROTTLE_CACHE = os.getenv("THROTTLE_CACHE", "default")
+# "memory" (per process), "file" (per host) or "cache"
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "file" if THROTTLE_FILE else "memory")
+
+# =============================================================================
+# Observability
+# =============================================================================
+# Server-Timing headers, per-request timing logs, per-route totals and
+# request metrics
+REQUEST_TIMING = os.getenv("REQUEST_TIMING", "True").lower() == "true"
+# Directory shared by all worker processes for metrics files (see
+# shared/metrics); gunicorn.conf.py creates one when unset
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+# Bearer token required to scrape /metrics; when empty, /metrics is only
+# served with DEBUG on
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Log and keep queries slower than this (ms; 0 turns the log off), with the
+# query plan for a sample of them (see shared/slowqueries)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0.1"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+
 # =============================================================================
 # Logging
 # =============================================================================
+# Header carrying the request id from the proxy and back to the client
+REQUEST_ID_HEADER = os.getenv("REQUEST_ID_HEADER", "X-Request-ID")
+# "json" for one JSON object per line, "text" for plain lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Fraction of DEBUG/INFO records to keep per logger (and its children),
+# e.g. "shared.timing=0.1,django.db=0.01"
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, _, rate in (
+        item.partition("=") for item in os.getenv("LOG_SAMPLE_RATES", "").split(",")
+    )
+    if rate
+}
+# Records waiting for the log writer thread; more than this are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Records are formatted and written on a background thread (see shared/logs)
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "shared.logs.JsonFormatter",
+        },
+        "text": {
+            "format": "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s",
+        },
+    },
+    "filters": {
+        "request_id": {
+            "()": "shared.logs.RequestIdFilter",
+        },
+        "sampling": {
+            "()": "shared.logs.SamplingFilter",
+            "rates": LOG_SAMPLE_RATES,
+        },
+    },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
+            "()": "shared.logs.QueueLogHandler",
+            "queue_size": LOG_QUEUE_SIZE,
+            "formatter": LOG_FORMAT,
+            "filters": ["request_id", "sampling"],
         },
     },
     "root": {
         "handlers": ["console"],
         "level": "INFO",
     },
+    "loggers": {
+        # One line per request with its timings (see shared/timing)
+        "shared.timing": {
+            "level": os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+        },
+    },
 }
@@ -3,9 +3,13 @@ from __future__ import annotations
 from django.contrib import admin
 from django.urls import include, path
 
+from shared.views import RouteTimingView, metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/accounts/", include("accounts.urls")),
     path("api/products/", include("products.urls")),
     path("api/", include("orders.urls")),
+    path("api/timings/", RouteTimingView.as_view(), name="route-timings"),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,14 @@
+"""
+Fixtures shared by every app's tests.
+"""
+import pytest
+
+from shared import throttling
+
+pytest_plugins = ["shared.tests.helpers", "accounts.tests.helpers"]
+
+
+@pytest.fixture(autouse=True)
+def _reset_throttles():
+    """Start every test with fresh throttle counters."""
+    throttling.reset()
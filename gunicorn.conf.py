@@ -0,0 +1,160 @@
+"""
+Gunicorn configuration, driven by environment variables.
+
+    gunicorn -c gunicorn.conf.py                      # WSGI, threaded workers
+    GUNICORN_WORKER_CLASS=sync gunicorn -c gunicorn.conf.py
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn -c gunicorn.conf.py
+
+The uvicorn worker serves config.asgi (async catalog views) and needs
+``uvicorn`` installed. Workers and threads default to sizes suited to the
+worker class and CPU count:
+
+    sync       2 x CPUs + 1 workers, 1 thread
+    gthread    CPUs + 1 workers, 4 threads
+    uvicorn    CPUs workers (one event loop each)
+
+Environment:
+    GUNICORN_WORKER_CLASS         sync | gthread | uvicorn.workers.UvicornWorker (gthread)
+    GUNICORN_WORKERS              worker processes (WEB_CONCURRENCY is also honoured)
+    GUNICORN_THREADS              threads per gthread worker
+    GUNICORN_BIND                 address to listen on (0.0.0.0:$PORT, PORT defaults to 8000)
+    GUNICORN_PRELOAD              import the app once in the master before forking (true)
+    GUNICORN_MAX_REQUESTS         recycle a worker after this many requests, 0 to disable (1000)
+    GUNICORN_MAX_REQUESTS_JITTER  random extra requests so workers don't recycle together (100)
+    GUNICORN_TIMEOUT              seconds before a silent worker is killed and restarted (30)
+    GUNICORN_KEEPALIVE            seconds to hold idle keep-alive connections (5)
+    GUNICORN_ACCESS_LOG           access log path, "-" for stdout (off)
+    METRICS_DIR                   directory where workers share metrics (a fresh
+                                  temporary directory)
+    THROTTLE_FILE                 file where workers share throttle counters (a
+                                  fresh temporary file)
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "")
+    return int(value) if value.strip() else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name, "")
+    return value.strip().lower() == "true" if value.strip() else default
+
+
+cpus = multiprocessing.cpu_count()
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+is_asgi = worker_class.startswith("uvicorn")
+
+if worker_class == "sync":
+    default_workers, default_threads = 2 * cpus + 1, 1
+elif is_asgi:
+    default_workers, default_threads = cpus, 1
+else:
+    default_workers, default_threads = cpus + 1, 4
+
+wsgi_app = "config.asgi:application" if is_asgi else "config.wsgi:application"
+workers = _env_int("GUNICORN_WORKERS", _env_int("WEB_CONCURRENCY", default_workers))
+threads = _env_int("GUNICORN_THREADS", default_threads)
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+# Import Django and the project once in the master; workers share the
+# loaded code copy-on-write and start faster
+preload_app = _env_bool("GUNICORN_PRELOAD", True)
+
+# Recycle workers to bound memory growth, staggered by the jitter
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = timeout
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+
+# Heartbeat files on tmpfs, so a slow disk can't get workers killed
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+# Workers write metrics here so any of them can report the totals. Set
+# before the app loads, since settings read it from the environment.
+_own_metrics_dir = not os.getenv("METRICS_DIR")
+if _own_metrics_dir:
+    os.environ["METRICS_DIR"] = tempfile.mkdtemp(
+        prefix="metrics-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+    )
+metrics_dir = os.environ["METRICS_DIR"]
+
+# Workers count requests against the same rate limits (see shared/throttling)
+_own_throttle_file = not os.getenv("THROTTLE_FILE")
+if _own_throttle_file:
+    _fd, os.environ["THROTTLE_FILE"] = tempfile.mkstemp(
+        prefix="throttle-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+    )
+    os.close(_fd)
+
+
+def on_starting(server):
+    """Discard metrics left behind by a previous run."""
+    for path in Path(metrics_dir).glob("*.db"):
+        path.unlink()
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+    if _own_throttle_file:
+        Path(os.environ["THROTTLE_FILE"]).unlink(missing_ok=True)
+
+
+def when_ready(server):
+    """With preload, resolve URLs (importing all views) once in the master."""
+    if preload_app:
+        from shared.warmup import resolve_urls
+
+        resolve_urls()
+
+
+def pre_fork(server, worker):
+    """Don't let workers inherit the master's database connections."""
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def _warm(worker) -> None:
+    from shared.warmup import warm_caches
+
+    timings = warm_caches()
+    worker.log.info(
+        "Worker %s warmed up: %s",
+        worker.pid,
+        ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()),
+    )
+
+
+def post_fork(server, worker):
+    """Warm per-process caches before the worker accepts requests."""
+    # Without preload the app isn't imported yet; post_worker_init warms up
+    if preload_app:
+        _warm(worker)
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        _warm(worker)
+
+
+def child_exit(server, worker):
+    """Keep an exited worker's counters and drop its gauges."""
+    from shared.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid, metrics_dir)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Order, OrderItem
+from .models import Order, OrderItem, ShippingRate, TaxRate
 
 
 class OrderItemInline(admin.TabularInline):
@@ -89,3 +89,18 @@ class OrderItemAdmin(admin.ModelAdmin):
 
     def line_total(self, obj):
         return f"${obj.line_total:.2f}"
+
+
+@admin.register(TaxRate)
+class TaxRateAdmin(admin.ModelAdmin):
+    list_display = ["country", "state", "postal_prefix", "rate", "name", "is_active"]
+    list_filter = ["country", "is_active"]
+    search_fields = ["country", "state", "postal_prefix", "name"]
+    readonly_fields = ["id", "created_at", "updated_at"]
+
+
+@admin.register(ShippingRate)
+class ShippingRateAdmin(admin.ModelAdmin):
+    list_display = ["country", "basis", "min_value", "max_value", "amount", "name", "is_active"]
+    list_filter = ["basis", "country", "is_active"]
+    readonly_fields = ["id", "created_at", "updated_at"]
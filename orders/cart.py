@@ -1,11 +1,25 @@
 """
 Session-based shopping cart implementation.
+
+Each cart entry stores the unit price as integer cents, so totals are
+plain integer sums.
+
+With ``settings.CART_STORAGE = "cookie"``, anonymous shoppers' carts live in
+a signed cookie (`CookieCartStore`) instead, so they cost no session row;
+the cookie holds quantities only, priced from the products when read.
+A cart moves into the session once the shopper is authenticated or the
+cookie would exceed ``CART_COOKIE_MAX_SIZE`` bytes.
 """
 
+import uuid
 from decimal import Decimal
 from typing import Any
 
+from django.conf import settings
+from django.core import signing
+
 from products.models import Product
+from shared.money import from_cents, to_cents
 
 
 class Cart:
@@ -21,6 +35,14 @@ class Cart:
         if cart is None:
             cart = self.session[self.CART_SESSION_KEY] = {}
         self.cart = cart
+        self._upgrade_legacy_items()
+
+    def _upgrade_legacy_items(self) -> None:
+        """Convert entries saved with a decimal-string "price" to cents."""
+        for item in self.cart.values():
+            if "price" in item:
+                item["price_cents"] = to_cents(item.pop("price"))
+                self.session.modified = True
 
     def add(self, product: Product, quantity: int = 1) -> None:
         """Add a product to the cart or update its quantity."""
@@ -28,7 +50,7 @@ class Cart:
         if product_id not in self.cart:
             self.cart[product_id] = {
                 "quantity": 0,
-                "price": str(product.price),
+                "price_cents": to_cents(product.price),
             }
         self.cart[product_id]["quantity"] += quantity
         self.save()
@@ -48,6 +70,16 @@ class Cart:
             else:
                 self.save()
 
+    def merge(self, items: dict[str, dict]) -> None:
+        """Add the quantities of another cart's `items`, keeping their prices for new products."""
+        for product_id, item in items.items():
+            if product_id in self.cart:
+                self.cart[product_id]["quantity"] += item["quantity"]
+            else:
+                self.cart[product_id] = dict(item)
+        if items:
+            self.save()
+
     def save(self) -> None:
         """Mark the session as modified to save changes."""
         self.session.modified = True
@@ -57,12 +89,18 @@ class Cart:
         del self.session[self.CART_SESSION_KEY]
         self.session.modified = True
 
+    def _products(self):
+        return Product.objects.filter(id__in=list(self.cart.keys())).select_related("category")
+
     def get_items(self) -> list[dict[str, Any]]:
         """Get cart items with product details."""
-        product_ids = list(self.cart.keys())
-        products = Product.objects.filter(id__in=product_ids)
-        products_dict = {str(p.id): p for p in products}
+        return self._build_items({str(p.id): p for p in self._products()})
+
+    async def aget_items(self) -> list[dict[str, Any]]:
+        """Async `get_items()`, using the async ORM."""
+        return self._build_items({str(p.id): p async for p in self._products()})
 
+    def _build_items(self, products_dict: dict[str, Product]) -> list[dict[str, Any]]:
         items = []
         for product_id, item in self.cart.items():
             product = products_dict.get(product_id)
@@ -71,19 +109,24 @@ class Cart:
                     "product_id": product_id,
                     "product": product,
                     "quantity": item["quantity"],
-                    "price": Decimal(item["price"]),
-                    "line_total": Decimal(item["price"]) * item["quantity"],
+                    "price_cents": item["price_cents"],
+                    "line_total_cents": item["price_cents"] * item["quantity"],
                 })
         return items
 
     @property
-    def subtotal(self) -> Decimal:
-        """Calculate the total price of all items in the cart."""
+    def subtotal_cents(self) -> int:
+        """Calculate the total price of all items in the cart, in cents."""
         return sum(
-            Decimal(item["price"]) * item["quantity"]
+            item["price_cents"] * item["quantity"]
             for item in self.cart.values()
         )
 
+    @property
+    def subtotal(self) -> Decimal:
+        """Calculate the total price of all items in the cart."""
+        return from_cents(self.subtotal_cents)
+
     @property
     def item_count(self) -> int:
         """Return the total number of items in the cart."""
@@ -96,3 +139,106 @@ class Cart:
     def __iter__(self):
         """Iterate over cart items."""
         return iter(self.get_items())
+
+
+class CookieCartStore:
+    """
+    Stands in for the session of an anonymous shopper, holding only the cart.
+
+    The cart is serialized as ``[[product id hex, quantity], ...]``, compressed
+    and signed; an invalid or expired cookie is an empty cart. Prices aren't
+    kept: a shopper can replay any cookie signed in the last
+    ``CART_COOKIE_AGE``, so each line is priced from its `Product` on reading.
+    """
+
+    salt = "orders.cart"
+
+    def __init__(self, value: str | None = None) -> None:
+        self._data: dict[str, dict] = {}
+        self.modified = False
+        if value:
+            try:
+                entries = signing.loads(value, salt=self.salt, max_age=settings.CART_COOKIE_AGE)
+                # Cookies signed before prices were dropped carry a third value
+                quantities = {uuid.UUID(entry[0]): int(entry[1]) for entry in entries}
+            except (signing.BadSignature, ValueError, TypeError, IndexError):
+                quantities = {}
+            if quantities:
+                prices = Product.objects.filter(id__in=quantities).values_list("id", "price")
+                self._data[Cart.CART_SESSION_KEY] = {
+                    str(product_id): {"quantity": quantities[product_id], "price_cents": to_cents(price)}
+                    for product_id, price in prices
+                }
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value) -> None:
+        self._data[key] = value
+        self.modified = True
+
+    def __delitem__(self, key) -> None:
+        del self._data[key]
+        self.modified = True
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    @property
+    def cart(self) -> dict[str, dict]:
+        return self._data.get(Cart.CART_SESSION_KEY) or {}
+
+    def dumps(self) -> str:
+        entries = [
+            [uuid.UUID(product_id).hex, item["quantity"]]
+            for product_id, item in self.cart.items()
+        ]
+        return signing.dumps(entries, salt=self.salt, compress=True)
+
+
+def cart_store(request):
+    """
+    Return where `request`'s cart is kept: a `CookieCartStore` for anonymous
+    shoppers in cookie mode, otherwise the session. A cookie cart is moved
+    into the session once the shopper is authenticated.
+    """
+    if settings.CART_STORAGE != "cookie":
+        return request.session
+    value = request.COOKIES.get(settings.CART_COOKIE_NAME)
+    # session_key is read from the cookie without loading the session
+    has_session = request.session.session_key is not None
+    if request.user.is_authenticated or (has_session and Cart.CART_SESSION_KEY in request.session):
+        if value:
+            Cart(request.session).merge(CookieCartStore(value).cart)
+            request.cart_cookie_moved = True
+        return request.session
+    request.cart_cookie = CookieCartStore(value)
+    return request.cart_cookie
+
+
+def save_cart_store(request, response) -> None:
+    """Write the cookie cart of `request`, if it changed, to `response`."""
+    name = settings.CART_COOKIE_NAME
+    store = getattr(request, "cart_cookie", None)
+    if store is not None and store.modified:
+        value = store.dumps() if store.cart else None
+        if value is not None and len(value) > settings.CART_COOKIE_MAX_SIZE:
+            # Too big for a cookie; the session keeps it from now on
+            request.session[Cart.CART_SESSION_KEY] = store.cart
+            value = None
+        if value is not None:
+            response.set_cookie(
+                name,
+                value,
+                max_age=settings.CART_COOKIE_AGE,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        elif name in request.COOKIES:
+            response.delete_cookie(name, samesite="Lax")
+    elif getattr(request, "cart_cookie_moved", False):
+        response.delete_cookie(name, samesite="Lax")
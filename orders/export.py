@@ -0,0 +1,132 @@
+"""
+Streaming order export.
+
+Orders are read with ``QuerySet.iterator(chunk_size=...)`` and their items are
+prefetched one chunk at a time, so memory use stays flat however many orders
+are exported.
+"""
+
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from shared.export import CSV, DEFAULT_CHUNK_SIZE, iter_csv, iter_ndjson
+from shared.money import format_cents
+from .models import Order
+
+ORDER_FIELDS = [
+    "id",
+    "created_at",
+    "customer_email",
+    "customer_first_name",
+    "customer_last_name",
+    "customer_phone",
+    "shipping_address_line1",
+    "shipping_address_line2",
+    "shipping_city",
+    "shipping_state",
+    "shipping_postal_code",
+    "shipping_country",
+    "subtotal",
+    "shipping_cost",
+    "tax",
+    "total",
+    "payment_status",
+    "order_status",
+]
+
+ITEM_FIELDS = [
+    "product_id",
+    "product_name",
+    "product_price",
+    "quantity",
+    "line_total",
+]
+
+# CSV output is flattened to one row per order item.
+CSV_FIELDS = ORDER_FIELDS + [f"item_{field}" for field in ITEM_FIELDS]
+
+
+def _start_of_day(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_orders(
+    queryset: QuerySet[Order],
+    *,
+    order_status: str | None = None,
+    payment_status: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> QuerySet[Order]:
+    """
+    Apply export filters. Date bounds are inclusive and compared against
+    ``created_at`` as a range, so ``orders_created_at_idx`` can be used.
+    """
+    if order_status:
+        queryset = queryset.filter(order_status=order_status)
+    if payment_status:
+        queryset = queryset.filter(payment_status=payment_status)
+    if date_from:
+        queryset = queryset.filter(created_at__gte=_start_of_day(date_from))
+    if date_to:
+        queryset = queryset.filter(created_at__lt=_start_of_day(date_to + timedelta(days=1)))
+    return queryset
+
+
+def iter_orders(
+    queryset: QuerySet[Order], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Order]:
+    """Iterate orders oldest first, prefetching items per chunk."""
+    return (
+        queryset.order_by("created_at", "id")
+        .prefetch_related("items")
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _item_record(item) -> dict[str, Any]:
+    return {
+        "product_id": item.product_id,
+        "product_name": item.product_name,
+        "product_price": item.product_price,
+        "quantity": item.quantity,
+        "line_total": format_cents(item.line_total_cents),
+    }
+
+
+def order_record(order: Order) -> dict[str, Any]:
+    """Return an order with its items nested, as written to NDJSON."""
+    record = {field: getattr(order, field) for field in ORDER_FIELDS}
+    record["items"] = [_item_record(item) for item in order.items.all()]
+    return record
+
+
+def order_csv_rows(order: Order) -> Iterator[dict[str, Any]]:
+    """Yield one flattened row per order item (or one row for an empty order)."""
+    base = {field: getattr(order, field) for field in ORDER_FIELDS}
+    items = order.items.all()
+    if not items:
+        yield base
+        return
+    for item in items:
+        row = dict(base)
+        for field, value in _item_record(item).items():
+            row[f"item_{field}"] = value
+        yield row
+
+
+def export_orders(
+    queryset: QuerySet[Order],
+    export_format: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """Yield the serialized export for `queryset` in the requested format."""
+    orders = iter_orders(queryset, chunk_size)
+    if export_format == CSV:
+        rows = (row for order in orders for row in order_csv_rows(order))
+        return iter_csv(CSV_FIELDS, rows)
+    return iter_ndjson(order_record(order) for order in orders)
@@ -0,0 +1,56 @@
+"""
+Management command to stream orders (with items) to CSV or NDJSON.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from orders.export import export_orders, filter_orders
+from orders.models import Order
+from shared.export import CSV, DEFAULT_CHUNK_SIZE, FORMAT_CHOICES
+
+
+class Command(BaseCommand):
+    help = "Streams orders and their items to CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=FORMAT_CHOICES, default=CSV)
+        parser.add_argument(
+            "--output",
+            help="File to write to (defaults to stdout)",
+        )
+        parser.add_argument("--status", choices=Order.OrderStatus.values)
+        parser.add_argument("--payment-status", choices=Order.PaymentStatus.values)
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            type=date.fromisoformat,
+            help="First day to include (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--to",
+            dest="date_to",
+            type=date.fromisoformat,
+            help="Last day to include (YYYY-MM-DD)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = filter_orders(
+            Order.objects.all(),
+            order_status=options["status"],
+            payment_status=options["payment_status"],
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+        )
+        chunks = export_orders(queryset, options["format"], options["chunk_size"])
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as fh:
+            fh.writelines(chunks)
+        self.stderr.write(self.style.SUCCESS(f"Exported orders to {options['output']}"))
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:48
+
+from decimal import Decimal
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShippingRate',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('country', models.CharField(blank=True, max_length=100)),
+                ('basis', models.CharField(choices=[('weight', 'Weight (grams)'), ('price', 'Order subtotal')], default='price', max_length=10)),
+                ('min_value', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10)),
+                ('max_value', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['country', 'basis', 'min_value'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaxRate',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('country', models.CharField(max_length=100)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('postal_prefix', models.CharField(blank=True, max_length=20)),
+                ('rate', models.DecimalField(decimal_places=5, help_text='e.g. 0.08875 for 8.875%', max_digits=7)),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['country', 'state', 'postal_prefix'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taxrate',
+            constraint=models.UniqueConstraint(fields=('country', 'state', 'postal_prefix'), name='unique_tax_rate_destination'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'id'], name='orders_created_at_idx'),
+        ),
+    ]
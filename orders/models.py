@@ -5,7 +5,66 @@ from decimal import Decimal
 from django.db import models
 
 from shared.models import BaseModel
+from shared.money import from_cents, to_cents
 from products.models import Product
+from .rates import quote
+
+
+class TaxRate(BaseModel):
+    """
+    Sales tax rate for a destination.
+
+    Blank state or postal prefix act as wildcards; the most specific match
+    (longest postal prefix within the state, then the whole country) wins.
+    """
+
+    country = models.CharField(max_length=100)
+    state = models.CharField(max_length=100, blank=True)
+    postal_prefix = models.CharField(max_length=20, blank=True)
+    rate = models.DecimalField(max_digits=7, decimal_places=5, help_text="e.g. 0.08875 for 8.875%")
+    name = models.CharField(max_length=100, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ["country", "state", "postal_prefix"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["country", "state", "postal_prefix"],
+                name="unique_tax_rate_destination",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        region = " ".join(part for part in (self.country, self.state, self.postal_prefix) if part)
+        return f"{region}: {self.rate}"
+
+
+class ShippingRate(BaseModel):
+    """
+    Flat shipping charge for an order whose weight or subtotal falls in a band.
+
+    Bands include `min_value` and exclude `max_value`; a blank country applies
+    to destinations without a country-specific band.
+    """
+
+    class Basis(models.TextChoices):
+        WEIGHT = "weight", "Weight (grams)"
+        PRICE = "price", "Order subtotal"
+
+    country = models.CharField(max_length=100, blank=True)
+    basis = models.CharField(max_length=10, choices=Basis.choices, default=Basis.PRICE)
+    min_value = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    max_value = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    name = models.CharField(max_length=100, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ["country", "basis", "min_value"]
+
+    def __str__(self) -> str:
+        upper = self.max_value if self.max_value is not None else "∞"
+        return f"{self.country or 'Any'} {self.basis} [{self.min_value}, {upper}): {self.amount}"
 
 
 class Order(BaseModel):
@@ -65,6 +124,10 @@ class Order(BaseModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Date-range filters and the export's (created_at, id) order
+            models.Index(fields=["created_at", "id"], name="orders_created_at_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Order {self.id} - {self.customer_email}"
@@ -86,19 +149,24 @@ class Order(BaseModel):
         return "\n".join(line for line in lines if line)
 
     def calculate_totals(self) -> None:
-        """Calculate and update order totals based on items."""
-        self.subtotal = sum(
-            item.line_total for item in self.items.all()
+        """
+        Calculate and update order totals based on items and the current rate
+        tables. Called at checkout; saving an order later keeps its totals.
+        """
+        items = list(self.items.select_related("product"))
+        subtotal = sum(item.line_total_cents for item in items)
+        weight_grams = sum(item.product.weight_grams * item.quantity for item in items)
+        shipping_cost, tax = quote(
+            subtotal_cents=subtotal,
+            weight_grams=weight_grams,
+            country=self.shipping_country,
+            state=self.shipping_state,
+            postal_code=self.shipping_postal_code,
         )
-        # Simple tax calculation (8%)
-        self.tax = self.subtotal * Decimal("0.08")
-        self.total = self.subtotal + self.shipping_cost + self.tax
-
-    def save(self, *args, **kwargs) -> None:
-        # Recalculate totals if items exist
-        if self.pk:
-            self.calculate_totals()
-        super().save(*args, **kwargs)
+        self.subtotal = from_cents(subtotal)
+        self.shipping_cost = from_cents(shipping_cost)
+        self.tax = from_cents(tax)
+        self.total = from_cents(subtotal + shipping_cost + tax)
 
 
 class OrderItem(BaseModel):
@@ -120,10 +188,15 @@ class OrderItem(BaseModel):
     def __str__(self) -> str:
         return f"{self.quantity}x {self.product_name}"
 
+    @property
+    def line_total_cents(self) -> int:
+        """Calculate total price for this line item, in cents."""
+        return to_cents(self.product_price) * self.quantity
+
     @property
     def line_total(self) -> Decimal:
         """Calculate total price for this line item."""
-        return self.product_price * self.quantity
+        return from_cents(self.line_total_cents)
 
     def save(self, *args, **kwargs) -> None:
         # Snapshot product details if not set
@@ -0,0 +1,203 @@
+"""
+Table-driven tax and shipping rates.
+
+`TaxRate` and `ShippingRate` rows are loaded once into an in-memory
+`RateTable` so that quoting an order (which cart previews do constantly)
+is a handful of dict lookups and a bisect rather than a database query.
+Amounts are held as integer cents and rates as scaled integers, so a quote
+does no Decimal arithmetic.
+
+The cached table is dropped whenever a rate row is saved or deleted in this
+process (see orders.signals), and reloaded after `RATE_TABLE_TTL` seconds so
+that edits made through another worker are picked up too.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from shared.metrics import CACHE_REQUESTS
+from shared.money import apply_rate, to_cents, to_scaled_rate
+
+if TYPE_CHECKING:
+    from .models import ShippingRate, TaxRate
+
+_BASIS_ORDER = ("price", "weight")
+
+
+def normalize_region(value: str) -> str:
+    """Normalize a country or state name for lookups."""
+    return value.strip().casefold()
+
+
+def normalize_postal_code(value: str) -> str:
+    """Normalize a postal code (or prefix) for lookups."""
+    return value.replace(" ", "").replace("-", "").upper()
+
+
+class _Bands:
+    """Non-overlapping [min, max) integer bands searchable with bisect."""
+
+    __slots__ = ("lower", "upper", "amounts")
+
+    def __init__(self, rows: list[tuple[int, int | None, int]]) -> None:
+        rows.sort(key=lambda row: row[0])
+        self.lower = [row[0] for row in rows]
+        self.upper = [row[1] for row in rows]
+        self.amounts = [row[2] for row in rows]
+
+    def find(self, value: int) -> int | None:
+        index = bisect_right(self.lower, value) - 1
+        if index < 0:
+            return None
+        upper = self.upper[index]
+        if upper is not None and value >= upper:
+            return None
+        return self.amounts[index]
+
+
+class RateTable:
+    """Immutable in-memory index over the active tax and shipping rates."""
+
+    def __init__(
+        self,
+        tax_rates: Iterable[TaxRate],
+        shipping_rates: Iterable[ShippingRate],
+        default_tax_rate: int = 0,
+    ) -> None:
+        self.default_tax_rate = default_tax_rate
+
+        # (country, state) -> {postal prefix: scaled rate}; "" is the wildcard.
+        self._tax: dict[tuple[str, str], dict[str, int]] = {}
+        self._max_prefix = 0
+        for tax_rate in tax_rates:
+            prefix = normalize_postal_code(tax_rate.postal_prefix)
+            key = (normalize_region(tax_rate.country), normalize_region(tax_rate.state))
+            self._tax.setdefault(key, {})[prefix] = to_scaled_rate(tax_rate.rate)
+            self._max_prefix = max(self._max_prefix, len(prefix))
+
+        # Price bands are held in cents, weight bands in grams.
+        grouped: dict[tuple[str, str], list[tuple[int, int | None, int]]] = {}
+        for shipping_rate in shipping_rates:
+            convert = to_cents if shipping_rate.basis == "price" else int
+            upper = shipping_rate.max_value
+            grouped.setdefault(
+                (normalize_region(shipping_rate.country), shipping_rate.basis), []
+            ).append((
+                convert(shipping_rate.min_value),
+                convert(upper) if upper is not None else None,
+                to_cents(shipping_rate.amount),
+            ))
+        self._shipping = {key: _Bands(rows) for key, rows in grouped.items()}
+
+    def tax_rate(self, country: str, state: str, postal_code: str) -> int | None:
+        """
+        Return the most specific tax rate for a destination (scaled by
+        RATE_SCALE): the longest matching postal prefix within the state, then
+        within the whole country.
+        """
+        country = normalize_region(country)
+        postal_code = normalize_postal_code(postal_code)
+        longest = min(len(postal_code), self._max_prefix)
+        for key in ((country, normalize_region(state)), (country, "")):
+            prefixes = self._tax.get(key)
+            if prefixes is None:
+                continue
+            for length in range(longest, -1, -1):
+                rate = prefixes.get(postal_code[:length])
+                if rate is not None:
+                    return rate
+        return None
+
+    def shipping_cost(
+        self, country: str, subtotal_cents: int, weight_grams: int
+    ) -> int | None:
+        """
+        Return the shipping charge for an order in cents. Country-specific
+        bands are preferred over wildcard ones; price bands (typically
+        free-shipping thresholds) are consulted before weight bands.
+        """
+        values = {"price": subtotal_cents, "weight": weight_grams}
+        for region in (normalize_region(country), ""):
+            for basis in _BASIS_ORDER:
+                bands = self._shipping.get((region, basis))
+                if bands is None:
+                    continue
+                amount = bands.find(values[basis])
+                if amount is not None:
+                    return amount
+        return None
+
+
+_lock = threading.Lock()
+_table: RateTable | None = None
+_loaded_at = 0.0
+
+_hits = CACHE_REQUESTS.labels(cache="rate_table", result="hit")
+_misses = CACHE_REQUESTS.labels(cache="rate_table", result="miss")
+
+
+def _load() -> RateTable:
+    from .models import ShippingRate, TaxRate
+
+    return RateTable(
+        TaxRate.objects.filter(is_active=True).only("country", "state", "postal_prefix", "rate"),
+        ShippingRate.objects.filter(is_active=True).only(
+            "country", "basis", "min_value", "max_value", "amount"
+        ),
+        default_tax_rate=to_scaled_rate(settings.DEFAULT_TAX_RATE),
+    )
+
+
+def get_rate_table() -> RateTable:
+    """Return the cached rate table, loading it if missing or stale."""
+    global _table, _loaded_at
+    table = _table
+    if table is not None and time.monotonic() - _loaded_at < settings.RATE_TABLE_TTL:
+        _hits.inc()
+        return table
+    with _lock:
+        if _table is None or time.monotonic() - _loaded_at >= settings.RATE_TABLE_TTL:
+            _misses.inc()
+            _table = _load()
+            _loaded_at = time.monotonic()
+        else:
+            _hits.inc()
+        return _table
+
+
+def invalidate() -> None:
+    """Drop the cached rate table so the next lookup reloads it."""
+    global _table
+    _table = None
+
+
+def quote(
+    *,
+    subtotal_cents: int,
+    weight_grams: int,
+    country: str,
+    state: str = "",
+    postal_code: str = "",
+) -> tuple[int, int]:
+    """
+    Return `(shipping_cents, tax_cents)` for an order to the given destination.
+
+    Tax is charged on the subtotal, rounded half up to the cent. Destinations
+    without a tax row fall back to `DEFAULT_TAX_RATE`; those without a
+    shipping band ship free.
+    """
+    if not subtotal_cents:
+        return 0, 0
+    table = get_rate_table()
+    rate = table.tax_rate(country, state, postal_code)
+    if rate is None:
+        rate = table.default_tax_rate
+    shipping = table.shipping_cost(country, subtotal_cents, weight_grams)
+    return shipping or 0, apply_rate(subtotal_cents, rate)
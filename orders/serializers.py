@@ -1,15 +1,15 @@
 from rest_framework import serializers
 
 from products.serializers import ProductListSerializer
+from shared.export import CSV, FORMAT_CHOICES
+from shared.serializers import CentsField, SparseFieldsMixin
 from .models import Order, OrderItem
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
     """Serializer for order items."""
 
-    line_total = serializers.DecimalField(
-        max_digits=10, decimal_places=2, read_only=True
-    )
+    line_total = CentsField(source="line_total_cents")
 
     class Meta:
         model = OrderItem
@@ -24,7 +24,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "product_name", "product_price", "line_total"]
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for orders."""
 
     items = OrderItemSerializer(many=True, read_only=True)
@@ -67,6 +67,18 @@ class OrderSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        # Model fields read by the properties, for ?fields=
+        field_columns = {
+            "customer_full_name": ["customer_first_name", "customer_last_name"],
+            "shipping_address": [
+                "shipping_address_line1",
+                "shipping_address_line2",
+                "shipping_city",
+                "shipping_state",
+                "shipping_postal_code",
+                "shipping_country",
+            ],
+        }
 
 
 class CartItemSerializer(serializers.Serializer):
@@ -75,21 +87,25 @@ class CartItemSerializer(serializers.Serializer):
     product_id = serializers.UUIDField()
     product = ProductListSerializer(read_only=True)
     quantity = serializers.IntegerField(min_value=1)
-    line_total = serializers.DecimalField(
-        max_digits=10, decimal_places=2, read_only=True
-    )
+    line_total = CentsField(source="line_total_cents")
 
 
 class CartSerializer(serializers.Serializer):
     """Serializer for cart (session-based)."""
 
     items = CartItemSerializer(many=True, read_only=True)
-    subtotal = serializers.DecimalField(
-        max_digits=10, decimal_places=2, read_only=True
-    )
+    subtotal = CentsField(source="subtotal_cents")
     item_count = serializers.IntegerField(read_only=True)
 
 
+class CartQuoteSerializer(serializers.Serializer):
+    """Serializer for the optional destination used to preview cart totals."""
+
+    country = serializers.CharField(max_length=100, default="United States")
+    state = serializers.CharField(max_length=100, required=False, default="")
+    postal_code = serializers.CharField(max_length=20, required=False, default="")
+
+
 class AddToCartSerializer(serializers.Serializer):
     """Serializer for adding items to cart."""
 
@@ -122,3 +138,13 @@ class CheckoutSerializer(serializers.Serializer):
     card_number = serializers.CharField(max_length=19, write_only=True)
     card_expiry = serializers.CharField(max_length=7, write_only=True)  # MM/YYYY
     card_cvc = serializers.CharField(max_length=4, write_only=True)
+
+
+class OrderExportFilterSerializer(serializers.Serializer):
+    """Serializer for order export query parameters."""
+
+    output = serializers.ChoiceField(choices=FORMAT_CHOICES, default=CSV)
+    order_status = serializers.ChoiceField(choices=Order.OrderStatus.choices, required=False)
+    payment_status = serializers.ChoiceField(choices=Order.PaymentStatus.choices, required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
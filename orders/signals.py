@@ -0,0 +1,16 @@
+"""
+Signal handlers for the orders app.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import rates
+from .models import ShippingRate, TaxRate
+
+
+@receiver([post_save, post_delete], sender=TaxRate)
+@receiver([post_save, post_delete], sender=ShippingRate)
+def invalidate_rate_table(sender, **kwargs) -> None:
+    """Reload tax and shipping rates after any change to the rate tables."""
+    rates.invalidate()
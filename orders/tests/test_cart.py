@@ -3,6 +3,7 @@ Tests for cart functionality.
 """
 
 import pytest
+from asgiref.sync import async_to_sync
 from decimal import Decimal
 from unittest.mock import MagicMock
 
@@ -144,4 +145,25 @@ class TestCart:
         assert items[0]["product_id"] == str(product.id)
         assert items[0]["quantity"] == 2
         assert items[0]["product"].name == "Test Watch"
-        assert items[0]["line_total"] == Decimal("3999.98")
+        assert items[0]["price_cents"] == 199999
+        assert items[0]["line_total_cents"] == 399998
+
+    def test_aget_items_matches_get_items(self, session, product, product2):
+        """Test that the async item lookup returns the same items."""
+        cart = Cart(session)
+        cart.add(product, quantity=2)
+        cart.add(product2)
+
+        items = async_to_sync(cart.aget_items)()
+
+        assert items == cart.get_items()
+        assert items[0]["product"].category.name == "Luxury"
+
+    def test_legacy_decimal_prices_are_upgraded(self, session, product):
+        """Test that carts saved with decimal-string prices are read as cents."""
+        session["cart"] = {str(product.id): {"quantity": 2, "price": "1999.99"}}
+
+        cart = Cart(session)
+
+        assert cart.cart[str(product.id)] == {"quantity": 2, "price_cents": 199999}
+        assert cart.subtotal == Decimal("3999.98")
@@ -0,0 +1,149 @@
+"""
+Tests for streaming order export.
+"""
+
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from products.models import Category, Product
+from orders.export import filter_orders
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client instance."""
+    return APIClient()
+
+
+@pytest.fixture
+def admin_client(db):
+    """Return an API client authenticated as a staff user."""
+    client = APIClient()
+    admin = User.objects.create_user(email="admin@example.com", password="x", is_staff=True)
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.fixture
+def product(db):
+    """Create a test product."""
+    category = Category.objects.create(name="Luxury", slug="luxury")
+    return Product.objects.create(
+        name="Test Watch",
+        slug="test-watch",
+        price="1999.99",
+        category=category,
+        stock_quantity=10,
+    )
+
+
+def make_order(product, quantity=1, order_status=Order.OrderStatus.CONFIRMED):
+    order = Order.objects.create(
+        customer_email="test@example.com",
+        customer_first_name="John",
+        customer_last_name="Doe",
+        shipping_address_line1="123 Main St",
+        shipping_city="New York",
+        shipping_state="NY",
+        shipping_postal_code="10001",
+        order_status=order_status,
+    )
+    OrderItem.objects.create(
+        order=order,
+        product=product,
+        product_name=product.name,
+        product_price=product.price,
+        quantity=quantity,
+    )
+    order.calculate_totals()
+    order.save()
+    return order
+
+
+def read_stream(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class TestOrderExportView:
+    """Tests for the order export endpoint."""
+
+    def test_export_requires_staff(self, api_client, db):
+        """Test that anonymous users cannot export orders."""
+        response = api_client.get(reverse("orders:order-export"))
+
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+    def test_export_csv(self, admin_client, product):
+        """Test CSV export writes one row per order item."""
+        order = make_order(product, quantity=2)
+
+        response = admin_client.get(reverse("orders:order-export"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert len(rows) == 1
+        assert rows[0]["id"] == str(order.id)
+        assert rows[0]["item_quantity"] == "2"
+        assert rows[0]["item_line_total"] == "3999.98"
+
+    def test_export_ndjson_nests_items(self, admin_client, product):
+        """Test NDJSON export writes one order per line with nested items."""
+        make_order(product)
+        make_order(product)
+
+        response = admin_client.get(reverse("orders:order-export"), {"output": "ndjson"})
+
+        lines = read_stream(response).splitlines()
+        assert len(lines) == 2
+        record = json.loads(lines[0])
+        assert record["total"] == "2159.99"
+        assert record["items"][0]["product_price"] == "1999.99"
+
+    def test_export_filters_by_status(self, admin_client, product):
+        """Test filtering exported orders by order status."""
+        make_order(product)
+        shipped = make_order(product, order_status=Order.OrderStatus.SHIPPED)
+
+        response = admin_client.get(
+            reverse("orders:order-export"), {"output": "ndjson", "order_status": "shipped"}
+        )
+
+        lines = read_stream(response).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [str(shipped.id)]
+
+    def test_export_rejects_unknown_format(self, admin_client, db):
+        """Test that an unsupported output format is a validation error."""
+        response = admin_client.get(reverse("orders:order-export"), {"output": "xml"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_export_orders_command_writes_file(product, tmp_path):
+    """Test the export_orders management command writes the export to a file."""
+    make_order(product)
+    path = tmp_path / "orders.ndjson"
+
+    call_command("export_orders", "--format", "ndjson", "--output", str(path), stderr=io.StringIO())
+
+    assert len(path.read_text().splitlines()) == 1
+
+
+@pytest.mark.django_db
+def test_date_filters_use_the_created_at_index():
+    """Test the export's date range is served by the created_at index."""
+    orders = filter_orders(Order.objects.all(), date_from=date(2026, 1, 1), date_to=date(2026, 1, 31))
+
+    assert "orders_created_at_idx" in orders.order_by("created_at", "id").explain()
@@ -0,0 +1,179 @@
+"""
+Tests for the tax and shipping rate engine.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from products.models import Category, Product
+from orders import rates
+from orders.models import Order, ShippingRate, TaxRate
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_table():
+    """Make sure no rate table is cached across tests."""
+    rates.invalidate()
+    yield
+    rates.invalidate()
+
+
+@pytest.fixture
+def rate_rows(db):
+    """Create a small set of tax and shipping rates."""
+    TaxRate.objects.create(country="United States", rate=Decimal("0.05"))
+    TaxRate.objects.create(country="United States", state="NY", rate=Decimal("0.04"))
+    TaxRate.objects.create(
+        country="United States", state="NY", postal_prefix="100", rate=Decimal("0.08875")
+    )
+    ShippingRate.objects.create(
+        basis=ShippingRate.Basis.WEIGHT, min_value=0, max_value=1000, amount=Decimal("9.95")
+    )
+    ShippingRate.objects.create(
+        basis=ShippingRate.Basis.WEIGHT, min_value=1000, amount=Decimal("19.95")
+    )
+    ShippingRate.objects.create(
+        country="United States",
+        basis=ShippingRate.Basis.PRICE,
+        min_value=Decimal("500.00"),
+        amount=Decimal("0.00"),
+    )
+
+
+@pytest.mark.django_db
+class TestRateTable:
+    """Tests for rate resolution."""
+
+    def test_longest_postal_prefix_wins(self, rate_rows):
+        """Test that the longest matching postal prefix is used."""
+        table = rates.get_rate_table()
+
+        assert table.tax_rate("United States", "NY", "10001") == 8875
+        assert table.tax_rate("united states", "ny", "14201") == 4000
+
+    def test_falls_back_to_country_rate(self, rate_rows):
+        """Test that a state without rows uses the country-wide rate."""
+        table = rates.get_rate_table()
+
+        assert table.tax_rate("United States", "CA", "90210") == 5000
+        assert table.tax_rate("Canada", "ON", "M5V") is None
+
+    def test_shipping_bands(self, rate_rows):
+        """Test that price bands take precedence and weight bands are bisected."""
+        table = rates.get_rate_table()
+
+        assert table.shipping_cost("United States", 60000, 5000) == 0
+        assert table.shipping_cost("United States", 10000, 999) == 995
+        assert table.shipping_cost("Canada", 60000, 1000) == 1995
+
+    def test_quote_uses_default_tax_rate(self, db, settings):
+        """Test that destinations without rows fall back to DEFAULT_TAX_RATE."""
+        settings.DEFAULT_TAX_RATE = Decimal("0.10")
+
+        shipping, tax = rates.quote(subtotal_cents=1999, weight_grams=0, country="Nowhere")
+
+        assert shipping == 0
+        assert tax == 200
+
+    def test_saving_a_rate_invalidates_cache(self, rate_rows):
+        """Test that editing a rate is visible to the next lookup."""
+        assert rates.get_rate_table().tax_rate("Canada", "", "") is None
+
+        TaxRate.objects.create(country="Canada", rate=Decimal("0.13"))
+
+        assert rates.get_rate_table().tax_rate("Canada", "", "") == 13000
+
+
+@pytest.fixture
+def product(db):
+    """Create a test product."""
+    category = Category.objects.create(name="Luxury", slug="luxury")
+    return Product.objects.create(
+        name="Test Watch",
+        slug="test-watch",
+        price="100.00",
+        weight_grams=400,
+        category=category,
+        stock_quantity=10,
+    )
+
+
+@pytest.mark.django_db
+class TestRatesInCartAndCheckout:
+    """Tests for rates applied to the cart preview and checkout."""
+
+    def test_cart_preview_quotes_destination(self, rate_rows, product):
+        """Test that the cart preview estimates shipping and tax."""
+        client = APIClient()
+        client.post(reverse("orders:cart-add"), {"product_id": str(product.id), "quantity": 2})
+
+        response = client.get(
+            reverse("orders:cart"),
+            {"country": "United States", "state": "NY", "postal_code": "10001"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["subtotal"] == "200.00"
+        assert response.data["shipping_cost"] == "9.95"
+        assert response.data["tax"] == "17.75"
+        assert response.data["total"] == "227.70"
+
+    def test_checkout_applies_rates(self, rate_rows, product):
+        """Test that checkout computes shipping and tax from the rate tables."""
+        client = APIClient()
+        client.post(reverse("orders:cart-add"), {"product_id": str(product.id), "quantity": 3})
+
+        response = client.post(reverse("orders:checkout"), {
+            "customer_email": "test@example.com",
+            "customer_first_name": "John",
+            "customer_last_name": "Doe",
+            "shipping_address_line1": "123 Main St",
+            "shipping_city": "Buffalo",
+            "shipping_state": "NY",
+            "shipping_postal_code": "14201",
+            "shipping_country": "United States",
+            "card_number": "4111111111111111",
+            "card_expiry": "12/2030",
+            "card_cvc": "123",
+        })
+
+        assert response.status_code == status.HTTP_201_CREATED
+        order = Order.objects.get(id=response.data["id"])
+        assert order.subtotal == Decimal("300.00")
+        assert order.shipping_cost == Decimal("19.95")
+        assert order.tax == Decimal("12.00")
+        assert order.total == Decimal("331.95")
+
+    def test_saving_an_order_keeps_its_totals(self, rate_rows, product):
+        """Test that later rate changes don't reprice a saved order."""
+        client = APIClient()
+        client.post(reverse("orders:cart-add"), {"product_id": str(product.id), "quantity": 3})
+        response = client.post(reverse("orders:checkout"), {
+            "customer_email": "test@example.com",
+            "customer_first_name": "John",
+            "customer_last_name": "Doe",
+            "shipping_address_line1": "123 Main St",
+            "shipping_city": "Buffalo",
+            "shipping_state": "NY",
+            "shipping_postal_code": "14201",
+            "shipping_country": "United States",
+            "card_number": "4111111111111111",
+            "card_expiry": "12/2030",
+            "card_cvc": "123",
+        })
+        TaxRate.objects.filter(state="NY", postal_prefix="").update(rate=Decimal("0.10"))
+        ShippingRate.objects.all().delete()
+        rates.invalidate()
+
+        order = Order.objects.get(id=response.data["id"])
+        order.order_status = Order.OrderStatus.SHIPPED
+        order.save()
+
+        order.refresh_from_db()
+        assert order.tax == Decimal("12.00")
+        assert order.shipping_cost == Decimal("19.95")
+        assert order.total == Decimal("331.95")
@@ -2,13 +2,23 @@
 Tests for orders API views.
 """
 
+from decimal import Decimal
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
 
+from accounts.models import User
 from products.models import Category, Product
 from orders.models import Order, OrderItem
+from orders.views import AsyncCartView, CartView
+from shared import metrics
 
 
 @pytest.fixture
@@ -77,6 +87,26 @@ class TestCartView:
         assert response.data["item_count"] == 0
         assert response.data["subtotal"] == "0"
 
+    def test_async_cart_view_matches(self, api_client, product, settings):
+        """Test that the async cart view (served under ASGI) returns the same cart."""
+        settings.CART_STORAGE = "session"
+        api_client.post(
+            reverse("orders:cart-add"),
+            {"product_id": str(product.id), "quantity": 2},
+            format="json",
+        )
+        session = SessionStore(api_client.cookies[settings.SESSION_COOKIE_NAME].value)
+        factory = APIRequestFactory()
+
+        responses = []
+        for view in (CartView.as_view(), async_to_sync(AsyncCartView.as_view())):
+            request = factory.get("/api/cart/?state=NY&postal_code=10001")
+            request.session = session
+            responses.append(view(request).render())
+
+        assert responses[1].data["item_count"] == 2
+        assert responses[1].content == responses[0].content
+
 
 @pytest.mark.django_db
 class TestCartAddView:
@@ -130,6 +160,119 @@ class TestCheckoutView:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "empty" in response.data["error"].lower()
 
+    def test_checkout_records_metrics(self, api_client, product, django_capture_on_commit_callbacks):
+        """Test completed and rejected checkouts are counted."""
+
+        def checkouts(result):
+            prefix = f'checkouts_total{{result="{result}"}} '
+            lines = [line for line in metrics.exposition().splitlines() if line.startswith(prefix)]
+            return float(lines[0].removeprefix(prefix)) if lines else 0.0
+
+        before = {result: checkouts(result) for result in ("completed", "invalid")}
+        api_client.post(reverse("orders:cart-add"), {"product_id": str(product.id), "quantity": 1})
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(reverse("orders:checkout"), {
+                "customer_email": "test@example.com",
+                "customer_first_name": "John",
+                "customer_last_name": "Doe",
+                "shipping_address_line1": "123 Main St",
+                "shipping_city": "New York",
+                "shipping_state": "NY",
+                "shipping_postal_code": "10001",
+                "shipping_country": "United States",
+                "card_number": "4111111111111111",
+                "card_expiry": "12/2030",
+                "card_cvc": "123",
+            })
+        api_client.post(reverse("orders:checkout"), {"customer_email": "not-an-email"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert checkouts("completed") == before["completed"] + 1
+        assert checkouts("invalid") == before["invalid"] + 1
+
+
+@pytest.mark.django_db
+class TestCookieCart:
+    """Tests for anonymous carts kept in a signed cookie."""
+
+    @pytest.fixture(autouse=True)
+    def cookie_storage(self, settings):
+        settings.CART_STORAGE = "cookie"
+
+    def add(self, client, product, quantity=1):
+        return client.post(
+            reverse("orders:cart-add"), {"product_id": str(product.id), "quantity": quantity}
+        )
+
+    def test_anonymous_cart_has_no_session(self, api_client, product):
+        """Test an anonymous cart round-trips through the cookie without a session row."""
+        self.add(api_client, product, 2)
+        self.add(api_client, product)
+
+        response = api_client.get(reverse("orders:cart"))
+
+        assert response.data["item_count"] == 3
+        assert settings.CART_COOKIE_NAME in api_client.cookies
+        assert settings.SESSION_COOKIE_NAME not in api_client.cookies
+        assert not Session.objects.exists()
+
+    def test_tampered_cookie_is_an_empty_cart(self, api_client, product):
+        """Test a cookie that fails its signature check is ignored."""
+        self.add(api_client, product)
+        cookie = api_client.cookies[settings.CART_COOKIE_NAME]
+        api_client.cookies[settings.CART_COOKIE_NAME] = cookie.value + "x"
+
+        assert api_client.get(reverse("orders:cart")).data["item_count"] == 0
+
+    def test_replayed_cookie_is_repriced(self, api_client, product):
+        """Test an old cookie's items are charged at the product's current price."""
+        self.add(api_client, product, 2)
+        cookie = api_client.cookies[settings.CART_COOKIE_NAME].value
+        api_client.delete(reverse("orders:cart"))
+        product.price = Decimal("25.00")
+        product.save()
+        api_client.cookies[settings.CART_COOKIE_NAME] = cookie
+
+        response = api_client.post(reverse("orders:checkout"), {
+            "customer_email": "test@example.com",
+            "customer_first_name": "John",
+            "customer_last_name": "Doe",
+            "shipping_address_line1": "123 Main St",
+            "shipping_city": "New York",
+            "shipping_state": "NY",
+            "shipping_postal_code": "10001",
+            "shipping_country": "United States",
+            "card_number": "4111111111111111",
+            "card_expiry": "12/2030",
+            "card_cvc": "123",
+        })
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Decimal(response.data["subtotal"]) == Decimal("50.00")
+
+    def test_large_cart_moves_to_session(self, api_client, product, settings):
+        """Test a cart too big for CART_COOKIE_MAX_SIZE is kept in the session."""
+        self.add(api_client, product)
+        settings.CART_COOKIE_MAX_SIZE = 10
+
+        self.add(api_client, product)
+
+        assert api_client.cookies[settings.CART_COOKIE_NAME].value == ""
+        assert Session.objects.count() == 1
+        assert api_client.get(reverse("orders:cart")).data["item_count"] == 2
+
+    def test_signing_in_moves_cart_to_session(self, api_client, product):
+        """Test a cookie cart is merged into the session once the shopper is authenticated."""
+        self.add(api_client, product, 2)
+        user = User.objects.create_user(email="shopper@example.com", password="x")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        response = api_client.get(reverse("orders:cart"))
+
+        assert response.data["item_count"] == 2
+        assert response.cookies[settings.CART_COOKIE_NAME]["max-age"] == 0
+        assert Session.objects.count() == 1
+
 
 @pytest.mark.django_db
 class TestOrderDetailView:
@@ -144,6 +287,15 @@ class TestOrderDetailView:
         assert response.data["customer_email"] == "test@example.com"
         assert len(response.data["items"]) == 1
 
+    def test_sparse_fields(self, api_client, order, django_assert_num_queries):
+        """Test ?fields= without items skips the items query."""
+        url = reverse("orders:order-detail", kwargs={"order_id": order.id})
+        with django_assert_num_queries(1):
+            response = api_client.get(url, {"fields": "id,customer_full_name,order_status"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {"id", "customer_full_name", "order_status"}
+
     def test_get_nonexistent_order(self, api_client):
         """Test retrieving a non-existent order."""
         import uuid
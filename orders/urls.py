@@ -1,21 +1,25 @@
 from django.urls import path
 
+from shared.views import serve
 from .views import (
+    AsyncCartView,
     CartView,
     CartAddView,
     CartItemView,
     CartClearView,
     CheckoutView,
     OrderDetailView,
+    OrderExportView,
 )
 
 app_name = "orders"
 
 urlpatterns = [
-    path("cart/", CartView.as_view(), name="cart"),
+    path("cart/", serve(CartView, AsyncCartView), name="cart"),
     path("cart/items/", CartAddView.as_view(), name="cart-add"),
     path("cart/items/<uuid:product_id>/", CartItemView.as_view(), name="cart-item"),
     path("cart/clear/", CartClearView.as_view(), name="cart-clear"),
     path("checkout/", CheckoutView.as_view(), name="checkout"),
+    path("orders/export/", OrderExportView.as_view(), name="order-export"),
     path("orders/<uuid:order_id>/", OrderDetailView.as_view(), name="order-detail"),
 ]
@@ -1,59 +1,143 @@
-from decimal import Decimal
-
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
 
 from products.models import Product
 from products.serializers import ProductListSerializer
+from shared import metrics
+from shared.export import streaming_export_response
+from shared.money import format_cents, to_cents
+from shared.throttling import TokenBucketThrottle
+from shared.views import AsyncAPIView, SparseFieldsViewMixin
 from .models import Order, OrderItem
-from .cart import Cart
+from .cart import Cart, cart_store, save_cart_store
+from .export import export_orders, filter_orders
+from .rates import quote
 from .serializers import (
     OrderSerializer,
     AddToCartSerializer,
     UpdateCartItemSerializer,
     CheckoutSerializer,
+    CartQuoteSerializer,
+    OrderExportFilterSerializer,
+)
+
+CHECKOUTS = metrics.counter("checkouts_total", "Checkout attempts by result", ["result"])
+ORDER_VALUE = metrics.histogram(
+    "checkout_order_value_cents",
+    "Totals of completed orders, in cents",
+    buckets=(2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000),
 )
 
 
-class CartView(APIView):
+def format_subtotal(cart: Cart) -> str:
+    """Format the cart subtotal; an empty cart has always reported a bare "0"."""
+    return format_cents(cart.subtotal_cents) if cart.cart else "0"
+
+
+def cart_response(cart: Cart, items: list, quoted: tuple[int, int]) -> Response:
+    """Build the cart payload from loaded items and a (shipping, tax) quote."""
+    shipping_cost, tax = quoted
+    subtotal = cart.subtotal_cents
+    return Response({
+        "items": [
+            {
+                "product_id": item["product_id"],
+                "product": ProductListSerializer(item["product"]).data,
+                "quantity": item["quantity"],
+                "line_total": format_cents(item["line_total_cents"]),
+            }
+            for item in items
+        ],
+        "subtotal": format_subtotal(cart),
+        "shipping_cost": format_cents(shipping_cost),
+        "tax": format_cents(tax),
+        "total": format_cents(subtotal + shipping_cost + tax),
+        "item_count": cart.item_count,
+    })
+
+
+def cart_weight(items: list) -> int:
+    return sum(item["product"].weight_grams * item["quantity"] for item in items)
+
+
+class CartMixin:
+    """Keep the cart where `cart_store()` puts it: the session or a signed cookie."""
+
+    def get_cart(self, request) -> Cart:
+        return Cart(cart_store(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        save_cart_store(request, response)
+        return response
+
+
+class CartView(CartMixin, APIView):
     """
-    Get current cart contents.
+    Get current cart contents with estimated shipping and tax.
     GET /api/cart/
+    GET /api/cart/?country=United States&state=NY&postal_code=10001
     """
 
     permission_classes = [AllowAny]
+    # The cart is kept per browser; a token's claims are enough
+    authentication_classes = [JWTStatelessUserAuthentication]
 
     def get(self, request):
-        cart = Cart(request.session)
+        destination = CartQuoteSerializer(data=request.query_params)
+        destination.is_valid(raise_exception=True)
+
+        cart = self.get_cart(request)
         items = cart.get_items()
 
-        # Serialize products
-        serialized_items = []
-        for item in items:
-            serialized_items.append({
-                "product_id": item["product_id"],
-                "product": ProductListSerializer(item["product"]).data,
-                "quantity": item["quantity"],
-                "line_total": str(item["line_total"]),
-            })
+        # Estimate shipping and tax for the (optional) destination
+        quoted = quote(
+            subtotal_cents=cart.subtotal_cents,
+            weight_grams=cart_weight(items),
+            **destination.validated_data,
+        )
+        return cart_response(cart, items, quoted)
 
-        return Response({
-            "items": serialized_items,
-            "subtotal": str(cart.subtotal),
-            "item_count": cart.item_count,
-        })
 
+class AsyncCartView(AsyncAPIView, CartView):
+    """
+    Async variant of CartView, served under ASGI.
+    GET /api/cart/
+    """
+
+    async def get(self, request):
+        destination = CartQuoteSerializer(data=request.query_params)
+        destination.is_valid(raise_exception=True)
+
+        # Sessions have no async API before Django 5.0
+        cart = await sync_to_async(self.get_cart)(request)
+        items = await cart.aget_items()
 
-class CartAddView(APIView):
+        # The rate table may need (re)loading from the database
+        quoted = await sync_to_async(quote)(
+            subtotal_cents=cart.subtotal_cents,
+            weight_grams=cart_weight(items),
+            **destination.validated_data,
+        )
+        return cart_response(cart, items, quoted)
+
+
+class CartAddView(CartMixin, APIView):
     """
     Add item to cart.
     POST /api/cart/items/
     """
 
     permission_classes = [AllowAny]
+    authentication_classes = [JWTStatelessUserAuthentication]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "cart"
 
     def post(self, request):
         serializer = AddToCartSerializer(data=request.data)
@@ -70,17 +154,17 @@ class CartAddView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        cart = Cart(request.session)
+        cart = self.get_cart(request)
         cart.add(product, quantity)
 
         return Response({
             "message": f"Added {quantity} x {product.name} to cart",
             "item_count": cart.item_count,
-            "subtotal": str(cart.subtotal),
+            "subtotal": format_subtotal(cart),
         }, status=status.HTTP_201_CREATED)
 
 
-class CartItemView(APIView):
+class CartItemView(CartMixin, APIView):
     """
     Update or remove cart item.
     PUT /api/cart/items/{product_id}/
@@ -88,41 +172,43 @@ class CartItemView(APIView):
     """
 
     permission_classes = [AllowAny]
+    authentication_classes = [JWTStatelessUserAuthentication]
 
     def put(self, request, product_id):
         serializer = UpdateCartItemSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        cart = Cart(request.session)
+        cart = self.get_cart(request)
         cart.update(str(product_id), serializer.validated_data["quantity"])
 
         return Response({
             "message": "Cart updated",
             "item_count": cart.item_count,
-            "subtotal": str(cart.subtotal),
+            "subtotal": format_subtotal(cart),
         })
 
     def delete(self, request, product_id):
-        cart = Cart(request.session)
+        cart = self.get_cart(request)
         cart.remove(str(product_id))
 
         return Response({
             "message": "Item removed from cart",
             "item_count": cart.item_count,
-            "subtotal": str(cart.subtotal),
+            "subtotal": format_subtotal(cart),
         })
 
 
-class CartClearView(APIView):
+class CartClearView(CartMixin, APIView):
     """
     Clear all items from cart.
     DELETE /api/cart/
     """
 
     permission_classes = [AllowAny]
+    authentication_classes = [JWTStatelessUserAuthentication]
 
     def delete(self, request):
-        cart = Cart(request.session)
+        cart = self.get_cart(request)
         cart.clear()
 
         return Response({
@@ -132,22 +218,27 @@ class CartClearView(APIView):
         })
 
 
-class CheckoutView(APIView):
+class CheckoutView(CartMixin, APIView):
     """
     Process checkout and create order.
     POST /api/checkout/
     """
 
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "checkout"
 
     @transaction.atomic
     def post(self, request):
         serializer = CheckoutSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            CHECKOUTS.labels(result="invalid").inc()
+            raise ValidationError(serializer.errors)
 
-        cart = Cart(request.session)
+        cart = self.get_cart(request)
 
         if cart.item_count == 0:
+            CHECKOUTS.labels(result="empty_cart").inc()
             return Response(
                 {"error": "Cart is empty"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -162,13 +253,13 @@ class CheckoutView(APIView):
 
         order = Order.objects.create(**order_data)
 
-        # Create order items
+        # Create order items, charged at the products' current prices
         for item in cart.get_items():
             OrderItem.objects.create(
                 order=order,
                 product=item["product"],
                 product_name=item["product"].name,
-                product_price=item["price"],
+                product_price=item["product"].price,
                 quantity=item["quantity"],
             )
 
@@ -185,27 +276,62 @@ class CheckoutView(APIView):
         # Clear cart
         cart.clear()
 
+        total_cents = to_cents(order.total)
+
+        def record() -> None:
+            CHECKOUTS.labels(result="completed").inc()
+            ORDER_VALUE.observe(total_cents)
+
+        transaction.on_commit(record)
+
         return Response(
             OrderSerializer(order).data,
             status=status.HTTP_201_CREATED,
         )
 
 
-class OrderDetailView(APIView):
+class OrderDetailView(SparseFieldsViewMixin, APIView):
     """
     Get order details.
     GET /api/orders/{order_id}/
+    GET /api/orders/{order_id}/?fields=id,order_status,total
     """
 
     permission_classes = [AllowAny]
+    sparse_fields = tuple(OrderSerializer.Meta.fields)
 
     def get(self, request, order_id):
+        queryset = self.sparse_queryset(Order.objects.prefetch_related("items"), OrderSerializer)
         try:
-            order = Order.objects.prefetch_related("items").get(id=order_id)
+            order = queryset.get(id=order_id)
         except Order.DoesNotExist:
             return Response(
                 {"error": "Order not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        return Response(OrderSerializer(order).data)
+        return Response(OrderSerializer(order, fields=self.get_sparse_fields()).data)
+
+
+class OrderExportView(APIView):
+    """
+    Stream orders with their items as CSV or NDJSON (staff only).
+    GET /api/orders/export/?output=csv
+    GET /api/orders/export/?output=ndjson&order_status=confirmed
+    GET /api/orders/export/?date_from=2024-01-01&date_to=2024-01-31
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        serializer = OrderExportFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = dict(serializer.validated_data)
+        export_format = filters.pop("output")
+
+        queryset = filter_orders(Order.objects.all(), **filters)
+        return streaming_export_response(
+            export_orders(queryset, export_format),
+            export_format,
+            filename="orders",
+        )
@@ -0,0 +1,36 @@
+"""
+Surrogate keys for cached catalog responses.
+
+Catalog responses cached by a CDN are tagged with the keys below (see
+shared.httpcache), and purged by them when the catalog changes. Purges are
+recorded in the database, so a change made by any process reaches the CDN.
+"""
+from __future__ import annotations
+
+from .models import Category, Product
+
+# Every catalog response; purged after bulk changes that send no signals
+CATALOG_KEY = "catalog"
+# Product list pages, whose membership and order any product change can alter
+PRODUCTS_KEY = "products"
+# The category list, with its product counts
+CATEGORIES_KEY = "categories"
+
+
+def product_key(product_id) -> str:
+    return f"product:{product_id}"
+
+
+def category_key(slug: str) -> str:
+    return f"category:{slug}"
+
+
+def surrogate_keys(instance) -> list[str]:
+    """Return the keys for a product or category shown in a response."""
+    if isinstance(instance, Category):
+        return [category_key(instance.slug)]
+    keys = [product_key(instance.pk)]
+    # Only name the category if it was loaded; never query for it here
+    if Product.category.is_cached(instance) and "slug" not in instance.category.get_deferred_fields():
+        keys.append(category_key(instance.category.slug))
+    return keys
@@ -0,0 +1,66 @@
+"""
+Streaming catalog export.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+from django.db.models import QuerySet
+
+from shared.export import CSV, DEFAULT_CHUNK_SIZE, iter_csv, iter_ndjson
+from .models import Product
+
+PRODUCT_FIELDS = [
+    "id",
+    "sku",
+    "name",
+    "slug",
+    "brand",
+    "category",
+    "price",
+    "stock_quantity",
+    "weight_grams",
+    "is_active",
+    "is_featured",
+    "image",
+    "description",
+    "updated_at",
+]
+
+
+def filter_products(
+    queryset: QuerySet[Product],
+    *,
+    category: str | None = None,
+    active_only: bool = False,
+) -> QuerySet[Product]:
+    """Apply catalog export filters."""
+    if category:
+        queryset = queryset.filter(category__slug=category)
+    if active_only:
+        queryset = queryset.filter(is_active=True)
+    return queryset
+
+
+def product_record(product: Product) -> dict[str, Any]:
+    """Return a flat export record; the category is written as its slug."""
+    record = {field: getattr(product, field) for field in PRODUCT_FIELDS if field != "category"}
+    record["category"] = product.category.slug
+    return record
+
+
+def export_products(
+    queryset: QuerySet[Product],
+    export_format: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """Yield the serialized export for `queryset` in the requested format."""
+    products = (
+        queryset.select_related("category")
+        .order_by("created_at", "id")
+        .iterator(chunk_size=chunk_size)
+    )
+    records = (product_record(product) for product in products)
+    if export_format == CSV:
+        return iter_csv(PRODUCT_FIELDS, records)
+    return iter_ndjson(records)
@@ -0,0 +1,228 @@
+"""
+Streaming catalog import.
+
+Supplier feeds (CSV or JSON Lines) are read one record at a time, validated
+in chunks and upserted by SKU with ``bulk_create(update_conflicts=True)``.
+Categories are resolved from an in-memory slug map loaded once per import.
+"""
+
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+
+from .models import Category, Product
+
+REQUIRED_FIELDS = ("sku", "name", "price", "category")
+
+# Columns that are overwritten on existing products when present in the feed.
+# The slug is only set on insert so that product URLs stay stable.
+UPDATABLE_FIELDS = (
+    "name",
+    "price",
+    "category",
+    "description",
+    "brand",
+    "image",
+    "stock_quantity",
+    "weight_grams",
+    "is_active",
+    "is_featured",
+)
+
+MAX_PRICE = Decimal("99999999.99")
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+FALSE_VALUES = {"0", "false", "no", "n", "f", ""}
+
+
+class RowError(ValueError):
+    """A feed row that cannot be imported."""
+
+
+@dataclass
+class Reject:
+    line: int
+    sku: str
+    error: str
+
+
+@dataclass
+class BatchResult:
+    number: int
+    upserted: int
+    rejects: list[Reject] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.upserted + len(self.rejects)
+
+
+def read_records(path: Path, file_format: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield `(line number, record)` pairs from a CSV or JSON Lines file."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        if file_format == "csv":
+            reader = csv.DictReader(fh)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for line_number, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, {"__error__": f"Invalid JSON: {exc.msg}"}
+                continue
+            yield line_number, record
+
+
+def _text(record: dict[str, Any], name: str, max_length: int) -> str:
+    value = str(record.get(name) or "").strip()
+    if len(value) > max_length:
+        raise RowError(f"{name} is longer than {max_length} characters")
+    return value
+
+
+def _int(record: dict[str, Any], name: str) -> int:
+    value = record.get(name)
+    if value in (None, ""):
+        return 0
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise RowError(f"{name} must be a whole number") from None
+    if number < 0:
+        raise RowError(f"{name} cannot be negative")
+    return number
+
+
+def _bool(record: dict[str, Any], name: str, default: bool) -> bool:
+    value = record.get(name)
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RowError(f"{name} must be true or false")
+
+
+class CatalogImporter:
+    """Validate and upsert feed records in batches."""
+
+    def __init__(self, batch_size: int = 1000, dry_run: bool = False) -> None:
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.categories = {category.slug: category for category in Category.objects.all()}
+
+    def build_product(self, record: dict[str, Any]) -> Product:
+        """Return an unsaved Product for a feed record, or raise RowError."""
+        if "__error__" in record:
+            raise RowError(record["__error__"])
+        missing = [name for name in REQUIRED_FIELDS if not str(record.get(name) or "").strip()]
+        if missing:
+            raise RowError(f"missing {', '.join(missing)}")
+
+        category_slug = _text(record, "category", 100)
+        category = self.categories.get(category_slug)
+        if category is None:
+            raise RowError(f"unknown category '{category_slug}'")
+
+        try:
+            price = Decimal(str(record["price"]).strip())
+        except InvalidOperation:
+            raise RowError("price must be a number") from None
+        if not price.is_finite() or price <= 0 or price > MAX_PRICE:
+            raise RowError("price must be between 0.01 and 99999999.99")
+
+        sku = _text(record, "sku", 50)
+        name = _text(record, "name", 200)
+        return Product(
+            sku=sku,
+            name=name,
+            slug=_text(record, "slug", 200) or slugify(f"{name} {sku}")[:200],
+            price=price.quantize(Decimal("0.01")),
+            category=category,
+            description=_text(record, "description", 100_000),
+            brand=_text(record, "brand", 100),
+            image=_text(record, "image", 500),
+            stock_quantity=_int(record, "stock_quantity"),
+            weight_grams=_int(record, "weight_grams"),
+            is_active=_bool(record, "is_active", True),
+            is_featured=_bool(record, "is_featured", False),
+        )
+
+    def run(self, records: Iterable[tuple[int, dict[str, Any]]]) -> Iterator[BatchResult]:
+        """Import `records`, yielding a result for each batch."""
+        iterator = iter(records)
+        number = 0
+        while chunk := list(islice(iterator, self.batch_size)):
+            number += 1
+            started = time.perf_counter()
+            result = self._import_chunk(number, chunk)
+            result.seconds = time.perf_counter() - started
+            yield result
+
+    def _import_chunk(self, number: int, chunk: list[tuple[int, dict[str, Any]]]) -> BatchResult:
+        result = BatchResult(number=number, upserted=0)
+
+        # Later rows for the same SKU replace earlier ones, as a sequence of
+        # row-by-row updates would.
+        valid: dict[str, tuple[int, Product, frozenset[str]]] = {}
+        for line, record in chunk:
+            try:
+                product = self.build_product(record)
+            except RowError as exc:
+                result.rejects.append(Reject(line, str(record.get("sku") or ""), str(exc)))
+                continue
+            columns = frozenset(name for name in UPDATABLE_FIELDS if name in record)
+            valid[product.sku] = (line, product, columns)
+
+        if self.dry_run:
+            result.upserted = len(valid)
+            return result
+
+        # Rows are grouped by the columns they supplied so that a feed without,
+        # say, a description column doesn't blank existing descriptions.
+        groups: dict[frozenset[str], list[tuple[int, Product]]] = {}
+        for line, product, columns in valid.values():
+            groups.setdefault(columns | {"name", "price", "category"}, []).append((line, product))
+
+        for columns, rows in groups.items():
+            update_fields = [name for name in UPDATABLE_FIELDS if name in columns] + ["updated_at"]
+            try:
+                with transaction.atomic():
+                    self._upsert([product for _, product in rows], update_fields)
+                result.upserted += len(rows)
+            except IntegrityError:
+                # Usually a slug already used by another SKU; retry one by one
+                # so the rest of the batch still goes in.
+                for line, product in rows:
+                    try:
+                        with transaction.atomic():
+                            self._upsert([product], update_fields)
+                        result.upserted += 1
+                    except IntegrityError as exc:
+                        result.rejects.append(Reject(line, product.sku, str(exc)))
+        return result
+
+    @staticmethod
+    def _upsert(products: list[Product], update_fields: list[str]) -> None:
+        Product.objects.bulk_create(
+            products,
+            update_conflicts=True,
+            unique_fields=["sku"],
+            update_fields=update_fields,
+        )
@@ -0,0 +1,40 @@
+"""
+Management command to stream the product catalog to CSV or NDJSON.
+"""
+
+from django.core.management.base import BaseCommand
+
+from products.export import export_products, filter_products
+from products.models import Product
+from shared.export import CSV, DEFAULT_CHUNK_SIZE, FORMAT_CHOICES
+
+
+class Command(BaseCommand):
+    help = "Streams the product catalog to CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=FORMAT_CHOICES, default=CSV)
+        parser.add_argument(
+            "--output",
+            help="File to write to (defaults to stdout)",
+        )
+        parser.add_argument("--category", help="Only export this category slug")
+        parser.add_argument("--active-only", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = filter_products(
+            Product.objects.all(),
+            category=options["category"],
+            active_only=options["active_only"],
+        )
+        chunks = export_products(queryset, options["format"], options["chunk_size"])
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as fh:
+            fh.writelines(chunks)
+        self.stderr.write(self.style.SUCCESS(f"Exported catalog to {options['output']}"))
@@ -0,0 +1,81 @@
+"""
+Management command to import a supplier catalog feed (CSV or JSON Lines).
+"""
+
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.cache import CATALOG_KEY
+from products.importer import CatalogImporter, read_records
+from shared import httpcache
+
+
+class Command(BaseCommand):
+    help = "Streams a CSV/JSONL catalog feed and upserts products by SKU"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Feed format (defaults to the file extension)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--rejects", type=Path, help="Write rejected rows to this CSV file")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the feed without writing to the database",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+        file_format = options["format"] or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+
+        importer = CatalogImporter(batch_size=options["batch_size"], dry_run=options["dry_run"])
+        rejects = []
+        upserted = 0
+        seconds = 0.0
+
+        for batch in importer.run(read_records(path, file_format)):
+            upserted += batch.upserted
+            seconds += batch.seconds
+            rejects.extend(batch.rejects)
+            rate = batch.rows / batch.seconds if batch.seconds else 0
+            self.stdout.write(
+                f"  batch {batch.number}: {batch.upserted:,} upserted, "
+                f"{len(batch.rejects):,} rejected ({rate:,.0f} rows/s)"
+            )
+
+        if options["rejects"] and rejects:
+            with open(options["rejects"], "w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(["line", "sku", "error"])
+                for reject in rejects:
+                    writer.writerow([reject.line, reject.sku, reject.error])
+
+        for reject in rejects[:10]:
+            self.stderr.write(f"  line {reject.line} ({reject.sku or 'no sku'}): {reject.error}")
+        if len(rejects) > 10:
+            self.stderr.write(f"  ... and {len(rejects) - 10:,} more")
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(
+                f"Dry run: {upserted:,} rows valid, {len(rejects):,} rejected"
+            ))
+            return
+
+        # Bulk upserts don't send model signals, so purge the whole catalog once here
+        if upserted:
+            httpcache.purge([CATALOG_KEY])
+
+        total = upserted + len(rejects)
+        rate = total / seconds if seconds else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {upserted:,} products, rejected {len(rejects):,} "
+            f"({rate:,.0f} rows/s)"
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='weight_grams',
+            field=models.PositiveIntegerField(default=0, help_text='Shipping weight'),
+        ),
+    ]
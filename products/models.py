@@ -57,6 +57,7 @@ class Product(BaseModel):
     brand = models.CharField(max_length=100, blank=True)
     sku = models.CharField(max_length=50, unique=True, blank=True, null=True)
     stock_quantity = models.PositiveIntegerField(default=0)
+    weight_grams = models.PositiveIntegerField(default=0, help_text="Shipping weight")
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
 
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from shared.export import CSV, FORMAT_CHOICES
+from shared.serializers import SparseFieldsMixin
 from .models import Category, Product
 
 
@@ -14,10 +16,13 @@ class CategorySerializer(serializers.ModelSerializer):
 
     def get_product_count(self, obj) -> int:
         """Return count of active products in this category."""
+        # Views annotate the count up front when listing categories
+        if hasattr(obj, "active_product_count"):
+            return obj.active_product_count
         return obj.products.filter(is_active=True).count()
 
 
-class ProductListSerializer(serializers.ModelSerializer):
+class ProductListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for product list view (minimal data)."""
 
     category_name = serializers.CharField(source="category.name", read_only=True)
@@ -36,7 +41,7 @@ class ProductListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProductDetailSerializer(serializers.ModelSerializer):
+class ProductDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for product detail view (full data)."""
 
     category = CategorySerializer(read_only=True)
@@ -63,3 +68,16 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        # Model fields read by the properties, for ?fields=
+        field_columns = {
+            "formatted_price": ["price"],
+            "is_in_stock": ["stock_quantity"],
+        }
+
+
+class ProductExportFilterSerializer(serializers.Serializer):
+    """Serializer for catalog export query parameters."""
+
+    output = serializers.ChoiceField(choices=FORMAT_CHOICES, default=CSV)
+    category = serializers.SlugField(required=False)
+    active_only = serializers.BooleanField(default=False)
@@ -0,0 +1,48 @@
+"""
+Signal handlers for the products app.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from shared import httpcache
+from .cache import (
+    CATEGORIES_KEY,
+    PRODUCTS_KEY,
+    category_key,
+    product_key,
+)
+from .models import Category, Product
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_slug(sender, instance, **kwargs) -> None:
+    """Keep the slug being replaced, whose cached pages must be purged too."""
+    instance._previous_slug = (
+        Category.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+        if not instance._state.adding
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Category)
+def purge_category(sender, instance, using, **kwargs) -> None:
+    """Purge CDN-cached pages showing the category (see shared.httpcache)."""
+    keys = {category_key(instance.slug), CATEGORIES_KEY, PRODUCTS_KEY}
+    previous_slug = getattr(instance, "_previous_slug", None)
+    if previous_slug:
+        keys.add(category_key(previous_slug))
+    httpcache.purge(keys, using=using)
+
+
+@receiver([post_save, post_delete], sender=Product)
+def purge_product(sender, instance, using, **kwargs) -> None:
+    """Purge CDN-cached pages showing the product, its category's count and the lists."""
+    keys = {product_key(instance.pk), PRODUCTS_KEY, CATEGORIES_KEY}
+    if Product.category.is_cached(instance):
+        slug = instance.category.slug
+    else:
+        slug = Category.objects.filter(pk=instance.category_id).values_list("slug", flat=True).first()
+    if slug:
+        keys.add(category_key(slug))
+    httpcache.purge(keys, using=using)
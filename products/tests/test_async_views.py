@@ -0,0 +1,112 @@
+"""
+Tests for the async catalog views served under ASGI.
+"""
+
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIRequestFactory
+
+from products.models import Category, Product
+from products.views import (
+    AsyncCategoryListView,
+    AsyncProductBySlugView,
+    AsyncProductDetailView,
+    AsyncProductListView,
+    CategoryListView,
+    ProductBySlugView,
+    ProductDetailView,
+    ProductListView,
+)
+
+
+@pytest.fixture
+def catalog(db):
+    """Create two categories and 25 products, three of them inactive."""
+    luxury = Category.objects.create(name="Luxury", slug="luxury")
+    sport = Category.objects.create(name="Sport", slug="sport")
+    for number in range(25):
+        Product.objects.create(
+            name=f"Watch {number}",
+            slug=f"watch-{number}",
+            description="Diver" if number % 4 == 0 else "Dress",
+            price=f"{100 + number}.00",
+            category=luxury if number % 2 else sport,
+            is_active=number >= 3,
+            is_featured=number % 5 == 0,
+        )
+    return Product.objects.get(slug="watch-10")
+
+
+def responses(sync_view, async_view, path, **kwargs):
+    """Render the same request through the sync and the async view."""
+    factory = APIRequestFactory()
+    sync_response = sync_view.as_view()(factory.get(path), **kwargs)
+    async_response = async_to_sync(async_view.as_view())(factory.get(path), **kwargs)
+    return sync_response.render(), async_response.render()
+
+
+class TestAsyncCatalogViews:
+    """The async views return exactly what the sync views return."""
+
+    @pytest.mark.parametrize("query", [
+        "",
+        "?page=2",
+        "?page=last",
+        "?page=9",
+        "?category=sport&ordering=price",
+        "?search=diver",
+        "?is_featured=true",
+        "?fields=id,name,price,image",
+        "?fields=id,stock_quantity",
+    ])
+    def test_product_list_matches(self, catalog, query):
+        """Test that product list pages, filters and errors match."""
+        sync_response, async_response = responses(
+            ProductListView, AsyncProductListView, f"/api/products/{query}"
+        )
+
+        assert async_response.status_code == sync_response.status_code
+        assert async_response.content == sync_response.content
+
+    def test_category_list_matches(self, catalog):
+        """Test that categories and their active product counts match."""
+        sync_response, async_response = responses(
+            CategoryListView, AsyncCategoryListView, "/api/products/categories/"
+        )
+
+        assert async_response.content == sync_response.content
+        assert [c["product_count"] for c in async_response.data] == [11, 11]
+
+    def test_product_detail_matches(self, catalog):
+        """Test that product detail, by id and by slug, matches."""
+        by_id = responses(
+            ProductDetailView, AsyncProductDetailView, "/", pk=catalog.id
+        )
+        by_slug = responses(
+            ProductBySlugView, AsyncProductBySlugView, "/", slug=catalog.slug
+        )
+
+        assert by_id[1].status_code == 200
+        assert by_id[1].content == by_id[0].content
+        assert by_slug[1].content == by_slug[0].content
+
+    def test_product_detail_fields_match(self, catalog):
+        """Test that a sparse fieldset without the category matches."""
+        sync_response, async_response = responses(
+            ProductDetailView, AsyncProductDetailView, "/?fields=name,is_in_stock", pk=catalog.id
+        )
+
+        assert async_response.content == sync_response.content
+        assert set(async_response.data) == {"name", "is_in_stock"}
+
+    def test_missing_product_matches(self, catalog):
+        """Test that missing and inactive products are a 404 in both."""
+        for pk in (uuid.uuid4(), Product.objects.get(slug="watch-0").id):
+            sync_response, async_response = responses(
+                ProductDetailView, AsyncProductDetailView, "/", pk=pk
+            )
+
+            assert async_response.status_code == 404
+            assert async_response.content == sync_response.content
@@ -0,0 +1,71 @@
+"""
+Tests for streaming catalog export.
+"""
+
+import csv
+import io
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from products.models import Category, Product
+
+
+@pytest.fixture
+def admin_client(db):
+    """Return an API client authenticated as a staff user."""
+    client = APIClient()
+    admin = User.objects.create_user(email="admin@example.com", password="x", is_staff=True)
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.fixture
+def products(db):
+    """Create one active and one inactive product."""
+    category = Category.objects.create(name="Luxury", slug="luxury")
+    active = Product.objects.create(
+        name="Test Watch", slug="test-watch", sku="TW-1", price="1999.99", category=category
+    )
+    inactive = Product.objects.create(
+        name="Old Watch", slug="old-watch", price="99.00", category=category, is_active=False
+    )
+    return active, inactive
+
+
+class TestProductExportView:
+    """Tests for the catalog export endpoint."""
+
+    def test_export_csv(self, admin_client, products):
+        """Test CSV export includes every product with its category slug."""
+        response = admin_client.get(reverse("products:product-export"))
+
+        assert response.status_code == status.HTTP_200_OK
+        body = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert len(rows) == 2
+        assert rows[0]["category"] == "luxury"
+        assert rows[0]["price"] == "1999.99"
+
+    def test_export_active_only(self, admin_client, products):
+        """Test that active_only excludes inactive products."""
+        response = admin_client.get(
+            reverse("products:product-export"), {"output": "ndjson", "active_only": "true"}
+        )
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 1
+
+
+@pytest.mark.django_db
+def test_export_catalog_command_writes_stdout(products):
+    """Test the export_catalog management command writes to stdout."""
+    out = io.StringIO()
+
+    call_command("export_catalog", "--format", "ndjson", stdout=out)
+
+    assert len(out.getvalue().splitlines()) == 2
@@ -0,0 +1,133 @@
+"""
+Tests for the catalog import command.
+"""
+
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from products.cache import CATALOG_KEY
+from products.models import Category, Product
+from shared.models import PendingPurge
+
+
+@pytest.fixture
+def categories(db):
+    """Create the categories referenced by the feeds."""
+    return [
+        Category.objects.create(name="Luxury", slug="luxury"),
+        Category.objects.create(name="Sport", slug="sport"),
+    ]
+
+
+def run_import(path, *args):
+    out, err = io.StringIO(), io.StringIO()
+    call_command("import_catalog", str(path), *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+def test_import_csv_creates_products(categories, tmp_path):
+    """Test that a CSV feed creates products with resolved categories."""
+    feed = tmp_path / "feed.csv"
+    feed.write_text(
+        "sku,name,price,category,brand,stock_quantity,is_featured\n"
+        "RX-1,Rolex One,14500.00,luxury,Rolex,3,true\n"
+        "GA-1,Garmin One,699.99,sport,Garmin,15,false\n"
+    )
+
+    out, _ = run_import(feed)
+
+    assert Product.objects.count() == 2
+    rolex = Product.objects.get(sku="RX-1")
+    assert rolex.category.slug == "luxury"
+    assert rolex.price == Decimal("14500.00")
+    assert rolex.is_featured is True
+    assert "batch 1: 2 upserted, 0 rejected" in out
+
+
+def test_import_updates_existing_sku(categories, tmp_path):
+    """Test that rows for an existing SKU update it in place."""
+    product = Product.objects.create(
+        name="Old Name", slug="old-name", sku="RX-1", price="1.00",
+        category=categories[0], description="Keep me",
+    )
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text(json.dumps(
+        {"sku": "RX-1", "name": "New Name", "price": "15000", "category": "sport"}
+    ) + "\n")
+
+    run_import(feed)
+
+    product.refresh_from_db()
+    assert product.name == "New Name"
+    assert product.price == Decimal("15000.00")
+    assert product.category.slug == "sport"
+    # Columns missing from the feed and the slug are left alone
+    assert product.description == "Keep me"
+    assert product.slug == "old-name"
+
+
+def test_import_reports_rejects(categories, tmp_path):
+    """Test that invalid rows are rejected without stopping the import."""
+    feed = tmp_path / "feed.csv"
+    rejects = tmp_path / "rejects.csv"
+    feed.write_text(
+        "sku,name,price,category\n"
+        "OK-1,Good Watch,100,luxury\n"
+        "BAD-1,Bad Price,abc,luxury\n"
+        "BAD-2,Bad Category,100,nope\n"
+        ",No Sku,100,luxury\n"
+    )
+
+    _, err = run_import(feed, "--batch-size", "2", "--rejects", str(rejects))
+
+    assert list(Product.objects.values_list("sku", flat=True)) == ["OK-1"]
+    assert "line 3 (BAD-1): price must be a number" in err
+    assert "unknown category 'nope'" in err
+    assert len(rejects.read_text().splitlines()) == 4
+
+
+def test_import_rejects_slug_conflicts_individually(categories, tmp_path):
+    """Test that one conflicting slug doesn't reject the rest of its batch."""
+    Product.objects.create(
+        name="Taken", slug="taken", sku="OTHER", price="1.00", category=categories[0]
+    )
+    feed = tmp_path / "feed.csv"
+    feed.write_text(
+        "sku,name,price,category,slug\n"
+        "A-1,First,100,luxury,taken\n"
+        "A-2,Second,100,luxury,second\n"
+    )
+
+    _, err = run_import(feed)
+
+    assert Product.objects.filter(sku="A-2").exists()
+    assert not Product.objects.filter(sku="A-1").exists()
+    assert "A-1" in err
+
+
+def test_import_purges_the_catalog_once(categories, tmp_path, django_capture_on_commit_callbacks):
+    """Test that the import purges the whole catalog once, not per product."""
+    feed = tmp_path / "feed.csv"
+    feed.write_text(
+        "sku,name,price,category\nRX-1,Rolex One,100,luxury\nRX-2,Rolex Two,100,luxury\n"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        run_import(feed)
+
+    assert list(PendingPurge.objects.values_list("key", flat=True)) == [CATALOG_KEY]
+
+
+def test_dry_run_writes_nothing(categories, tmp_path):
+    """Test that --dry-run only validates the feed."""
+    feed = tmp_path / "feed.csv"
+    feed.write_text("sku,name,price,category\nRX-1,Rolex One,100,luxury\n")
+
+    out, _ = run_import(feed, "--dry-run")
+
+    assert Product.objects.count() == 0
+    assert "1 rows valid" in out
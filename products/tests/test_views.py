@@ -3,11 +3,14 @@ Tests for products API views.
 """
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from products.models import Category, Product
+from shared.models import PendingPurge
 
 
 @pytest.fixture
@@ -134,6 +137,33 @@ class TestProductListView:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["count"] == 0
 
+    def test_sparse_fields(self, api_client, product):
+        """Test ?fields= trims the payload and the selected columns."""
+        url = reverse("products:product-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "id,name,price,image"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(response.data["results"][0]) == ["id", "name", "price", "image"]
+        sql = queries.captured_queries[-1]["sql"]
+        assert '"products_product"."description"' not in sql
+        assert "products_category" not in sql
+
+    def test_sparse_fields_through_relations(self, api_client, product):
+        """Test fields read through a relation still join it."""
+        url = reverse("products:product-list")
+        response = api_client.get(url, {"fields": "name,category_name"})
+
+        assert response.data["results"][0] == {"name": "Test Watch", "category_name": "Luxury"}
+
+    def test_unknown_fields_are_rejected(self, api_client, product):
+        """Test fields outside the endpoint's allowed set are a 400."""
+        url = reverse("products:product-list")
+        response = api_client.get(url, {"fields": "name,stock_quantity"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "stock_quantity" in response.data["fields"][0]
+
 
 class TestProductDetailView:
     """Tests for the product detail endpoint."""
@@ -150,6 +180,14 @@ class TestProductDetailView:
         assert response.data["is_featured"] is True
         assert response.data["category"]["name"] == "Luxury"
 
+    def test_sparse_fields_skip_the_category(self, api_client, product, django_assert_num_queries):
+        """Test leaving out the category skips its join and product count."""
+        url = reverse("products:product-detail", kwargs={"pk": product.id})
+        with django_assert_num_queries(1):
+            response = api_client.get(url, {"fields": "name,formatted_price,is_in_stock"})
+
+        assert response.data == {"name": "Test Watch", "formatted_price": "$1,999.99", "is_in_stock": True}
+
     def test_get_nonexistent_product(self, api_client, db):
         """Test retrieving a non-existent product."""
         import uuid
@@ -183,3 +221,51 @@ class TestProductBySlugView:
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestCatalogCaching:
+    """Tests for catalog Cache-Control headers, surrogate keys and purges."""
+
+    def test_product_list_is_cacheable(self, api_client, product, category):
+        """Test anonymous list pages are public and tagged with their products."""
+        response = api_client.get(reverse("products:product-list"))
+
+        assert "public" in response["Cache-Control"]
+        assert "s-maxage" in response["Cache-Control"]
+        assert set(response["Surrogate-Key"].split()) == {
+            "catalog", "products", f"product:{product.id}", "category:luxury",
+        }
+
+    def test_product_detail_keys(self, api_client, product):
+        """Test a product page is tagged with the product and its category."""
+        url = reverse("products:product-detail", kwargs={"pk": product.id})
+        response = api_client.get(url)
+
+        assert set(response["Surrogate-Key"].split()) == {"catalog", f"product:{product.id}", "category:luxury"}
+
+    def test_sparse_pages_only_name_what_they_loaded(self, api_client, product, django_assert_num_queries):
+        """Test keys come from loaded data, without extra queries."""
+        url = reverse("products:product-detail", kwargs={"pk": product.id})
+        with django_assert_num_queries(1):
+            response = api_client.get(url, {"fields": "name"})
+
+        assert set(response["Surrogate-Key"].split()) == {"catalog", f"product:{product.id}"}
+
+    def test_missing_products_are_not_cached(self, api_client, inactive_product):
+        """Test 404s carry no caching headers."""
+        url = reverse("products:product-detail", kwargs={"pk": inactive_product.id})
+
+        assert not api_client.get(url).has_header("Cache-Control")
+
+    def test_changes_record_purges(self, product, category, django_capture_on_commit_callbacks):
+        """Test saving a product or renaming a category records keys to purge."""
+        PendingPurge.objects.all().delete()
+        with django_capture_on_commit_callbacks(execute=True):
+            product.price = "1899.99"
+            product.save()
+            category.slug = "luxe"
+            category.save()
+
+        assert set(PendingPurge.objects.values_list("key", flat=True)) == {
+            f"product:{product.id}", "products", "categories", "category:luxury", "category:luxe",
+        }
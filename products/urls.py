@@ -1,17 +1,38 @@
 from django.urls import path
 
+from shared.views import serve
+
 from .views import (
+    AsyncCategoryListView,
+    AsyncProductBySlugView,
+    AsyncProductDetailView,
+    AsyncProductListView,
     CategoryListView,
     ProductListView,
     ProductDetailView,
     ProductBySlugView,
+    ProductExportView,
 )
 
 app_name = "products"
 
+
 urlpatterns = [
-    path("categories/", CategoryListView.as_view(), name="category-list"),
-    path("", ProductListView.as_view(), name="product-list"),
-    path("<uuid:pk>/", ProductDetailView.as_view(), name="product-detail"),
-    path("by-slug/<slug:slug>/", ProductBySlugView.as_view(), name="product-by-slug"),
+    path(
+        "categories/",
+        serve(CategoryListView, AsyncCategoryListView),
+        name="category-list",
+    ),
+    path("", serve(ProductListView, AsyncProductListView), name="product-list"),
+    path("export/", ProductExportView.as_view(), name="product-export"),
+    path(
+        "<uuid:pk>/",
+        serve(ProductDetailView, AsyncProductDetailView),
+        name="product-detail",
+    ),
+    path(
+        "by-slug/<slug:slug>/",
+        serve(ProductBySlugView, AsyncProductBySlugView),
+        name="product-by-slug",
+    ),
 ]
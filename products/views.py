@@ -1,39 +1,80 @@
+from django.conf import settings
+from django.db.models import Count, Q
+from django.http import Http404
 from rest_framework import generics, filters
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
+from shared.export import streaming_export_response
+from shared.httpcache import CachePolicy
+from shared.throttling import SlidingWindowThrottle
+from shared.views import AsyncAPIView, CachePolicyMixin, SparseFieldsViewMixin
+from .cache import CATALOG_KEY, CATEGORIES_KEY, PRODUCTS_KEY, surrogate_keys
+from .export import export_products, filter_products
 from .models import Category, Product
-from .serializers import CategorySerializer, ProductListSerializer, ProductDetailSerializer
+from .serializers import (
+    CategorySerializer,
+    ProductListSerializer,
+    ProductDetailSerializer,
+    ProductExportFilterSerializer,
+)
 
 
-class CategoryListView(generics.ListAPIView):
+class CatalogCacheMixin(CachePolicyMixin):
+    """Let a CDN serve the catalog to anonymous clients, purged by catalog keys."""
+
+    cache_policy = CachePolicy(
+        max_age=settings.CATALOG_CACHE_MAX_AGE,
+        shared_max_age=settings.CATALOG_CACHE_SHARED_MAX_AGE,
+        stale_while_revalidate=settings.CATALOG_CACHE_STALE_SECONDS,
+        stale_if_error=settings.CATALOG_CACHE_STALE_IF_ERROR_SECONDS,
+    )
+    surrogate_keys = (CATALOG_KEY,)
+
+    def get_instance_keys(self, instance) -> list[str]:
+        return surrogate_keys(instance)
+
+
+class CategoryListView(CatalogCacheMixin, generics.ListAPIView):
     """
     List all categories.
     GET /api/products/categories/
     """
 
-    queryset = Category.objects.all()
+    surrogate_keys = (CATALOG_KEY, CATEGORIES_KEY)
+
+    queryset = Category.objects.annotate(
+        active_product_count=Count("products", filter=Q(products__is_active=True))
+    )
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
     pagination_class = None  # Return all categories without pagination
 
 
-class ProductListView(generics.ListAPIView):
+class ProductListView(CatalogCacheMixin, SparseFieldsViewMixin, generics.ListAPIView):
     """
     List all active products with optional filtering.
     GET /api/products/
     GET /api/products/?category=luxury
     GET /api/products/?search=rolex
     GET /api/products/?is_featured=true
+    GET /api/products/?fields=id,name,price,image
     """
 
     serializer_class = ProductListSerializer
+    sparse_fields = tuple(ProductListSerializer.Meta.fields)
+    surrogate_keys = (CATALOG_KEY, PRODUCTS_KEY)
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ["category__slug", "is_featured"]
     search_fields = ["name", "description", "brand"]
     ordering_fields = ["price", "created_at", "name"]
     ordering = ["-created_at"]
+    # Searches are the costliest requests a scraper can repeat
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = "products"
 
     def get_queryset(self):
         queryset = Product.objects.active().select_related("category")
@@ -46,25 +87,110 @@ class ProductListView(generics.ListAPIView):
         return queryset
 
 
-class ProductDetailView(generics.RetrieveAPIView):
+class ProductDetailView(CatalogCacheMixin, SparseFieldsViewMixin, generics.RetrieveAPIView):
     """
     Retrieve a single product by ID or slug.
     GET /api/products/{id}/
     GET /api/products/by-slug/{slug}/
+    GET /api/products/{id}/?fields=id,name,price,is_in_stock
     """
 
     serializer_class = ProductDetailSerializer
+    sparse_fields = tuple(ProductDetailSerializer.Meta.fields)
     permission_classes = [AllowAny]
     queryset = Product.objects.active().select_related("category")
 
 
-class ProductBySlugView(generics.RetrieveAPIView):
+class ProductBySlugView(CatalogCacheMixin, SparseFieldsViewMixin, generics.RetrieveAPIView):
     """
     Retrieve a single product by slug.
     GET /api/products/by-slug/{slug}/
     """
 
     serializer_class = ProductDetailSerializer
+    sparse_fields = tuple(ProductDetailSerializer.Meta.fields)
     permission_classes = [AllowAny]
     queryset = Product.objects.active().select_related("category")
     lookup_field = "slug"
+
+
+class AsyncCategoryListView(AsyncAPIView, CategoryListView):
+    """
+    Async variant of CategoryListView, served under ASGI.
+    GET /api/products/categories/
+    """
+
+    async def get(self, request, *args, **kwargs):
+        categories = [category async for category in self.filter_queryset(self.get_queryset())]
+        return Response(self.get_serializer(categories, many=True).data)
+
+
+class AsyncProductListView(AsyncAPIView, ProductListView):
+    """
+    Async variant of ProductListView, served under ASGI.
+    GET /api/products/
+    """
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is None:
+            page = [product async for product in queryset]
+            return Response(self.get_serializer(page, many=True).data)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+class AsyncProductDetailView(AsyncAPIView, ProductDetailView):
+    """
+    Async variant of ProductDetailView, served under ASGI.
+    GET /api/products/{id}/
+    """
+
+    async def get(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            product = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except Product.DoesNotExist:
+            raise Http404("No Product matches the given query.") from None
+        self.check_object_permissions(request, product)
+
+        serializer = self.get_serializer(product)
+        if "category" in serializer.fields:
+            # The serializer can't run this query itself in async code
+            product.category.active_product_count = await Product.objects.filter(
+                category_id=product.category_id, is_active=True
+            ).acount()
+        return Response(serializer.data)
+
+
+class AsyncProductBySlugView(AsyncProductDetailView):
+    """
+    Async variant of ProductBySlugView, served under ASGI.
+    GET /api/products/by-slug/{slug}/
+    """
+
+    lookup_field = "slug"
+
+
+class ProductExportView(APIView):
+    """
+    Stream the catalog as CSV or NDJSON (staff only).
+    GET /api/products/export/?output=csv
+    GET /api/products/export/?output=ndjson&category=luxury&active_only=true
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        serializer = ProductExportFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = dict(serializer.validated_data)
+        export_format = filters.pop("output")
+
+        queryset = filter_products(Product.objects.all(), **filters)
+        return streaming_export_response(
+            export_products(queryset, export_format),
+            export_format,
+            filename="catalog",
+        )
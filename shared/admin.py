@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "duration_ms", "route", "database", "short_sql"]
+    list_filter = ["database"]
+    search_fields = ["sql", "route", "view"]
+    ordering = ["-created_at"]
+    fields = ["created_at", "duration_ms", "database", "route", "view", "sql", "params", "plan", "stack"]
+    readonly_fields = fields
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj: SlowQuery) -> str:
+        return obj.sql[:120]
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
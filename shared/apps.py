@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SharedConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "shared"
+
+    def ready(self) -> None:
+        from . import slowqueries
+
+        slowqueries.install()
@@ -1,8 +1,24 @@
+import copy
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from shared.metrics import CACHE_REQUESTS
+
+_hits = CACHE_REQUESTS.labels(cache="auth_user", result="hit")
+_misses = CACHE_REQUESTS.labels(cache="auth_user", result="miss")
 
 
 class DevAutoAuthentication(BaseAuthentication):
@@ -40,3 +56,113 @@ class DevAutoAuthentication(BaseAuthentication):
         DevAutoAuthentication._cached_user = user
 
         return (user, None)
+
+
+class UserCache:
+    """
+    Per-process LRU cache of users by id, bounded by
+    ``settings.AUTH_USER_CACHE_SIZE`` entries that expire after
+    ``AUTH_USER_CACHE_TTL`` seconds (0 disables it).
+
+    Saves and deletes in this process invalidate their user (see
+    ``accounts.signals``); other workers see a change within the TTL.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._users: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        # Bumped by invalidations, so a load racing one isn't stored
+        self._generation = 0
+
+    def get_or_load(self, user_id, load: Callable[[], object | None]):
+        """Return the cached user for `user_id`, calling `load()` on a miss."""
+        ttl = settings.AUTH_USER_CACHE_TTL
+        if ttl <= 0:
+            return load()
+        key = str(user_id)
+        with self._lock:
+            entry = self._users.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._users.move_to_end(key)
+                _hits.inc()
+                return entry[1]
+            generation = self._generation
+        _misses.inc()
+
+        user = load()
+        if user is None:
+            return None
+        with self._lock:
+            if generation == self._generation:
+                self._users[key] = (time.monotonic() + ttl, user)
+                self._users.move_to_end(key)
+                while len(self._users) > settings.AUTH_USER_CACHE_SIZE:
+                    self._users.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._generation += 1
+            self._users.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` that looks users up in `user_cache` rather than the
+    database on every request. Users are loaded with only `user_fields`;
+    each request gets its own copy, so changes to ``request.user`` stay there.
+
+    Views that need no more than the token's claims can use simplejwt's
+    ``JWTStatelessUserAuthentication``, which never reads the database.
+    """
+
+    user_fields = (
+        "email",
+        "first_name",
+        "last_name",
+        "password",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+        "created_at",
+        "updated_at",
+    )
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = user_cache.get_or_load(user_id, lambda: self.load_user(user_id))
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user = copy.copy(user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(
+                user.password
+            ):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+    def load_user(self, user_id):
+        return (
+            self.user_model.objects.only(*self.user_fields)
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .first()
+        )
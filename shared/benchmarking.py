@@ -0,0 +1,122 @@
+"""
+Helpers shared by the benchmark management commands.
+
+`benchmark_database()` runs a block against a throwaway database filled by
+``generate_dataset``, so benchmarks never touch (or depend on) local data.
+"""
+from __future__ import annotations
+
+import io
+import math
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Return the nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies_ms: Sequence[float]) -> dict[str, float]:
+    """Return p50/p95/p99, mean and max of a list of latencies."""
+    ordered = sorted(latencies_ms)
+    summary = {f"p{pct}_ms": round(percentile(ordered, pct), 3) for pct in PERCENTILES}
+    summary["mean_ms"] = round(sum(ordered) / len(ordered), 3) if ordered else 0.0
+    summary["max_ms"] = round(ordered[-1], 3) if ordered else 0.0
+    return summary
+
+
+@contextmanager
+def benchmark_database(
+    *,
+    users: int,
+    products: int,
+    orders: int,
+    seed: int,
+    use_existing: bool = False,
+    test_name: str | None = None,
+) -> Iterator[None]:
+    """
+    Run the block with DEBUG off against a fresh test database holding a
+    generated dataset, or against the configured database if `use_existing`.
+    Throttling is off, since every simulated client shares one address.
+
+    `test_name` overrides the test database name; on SQLite the default is
+    a shared in-memory database, which concurrent writers lock each other out
+    of, so multi-threaded benchmarks should pass a file path.
+    """
+    setup_test_environment(debug=False)
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    default_test_name = test_settings.get("NAME")
+    old_name = None
+    try:
+        if not use_existing:
+            if test_name:
+                test_settings["NAME"] = test_name
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            call_command(
+                "generate_dataset",
+                users=users,
+                products=products,
+                orders=orders,
+                seed=seed,
+                label="bench",
+                stdout=io.StringIO(),
+            )
+        with override_settings(THROTTLING=False):
+            yield
+    finally:
+        if old_name is not None:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = default_test_name
+        teardown_test_environment()
+
+
+def compare(
+    current: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    *,
+    latency_threshold: float,
+    query_allowance: int,
+    bytes_threshold: float,
+) -> list[str]:
+    """
+    Return human-readable regressions of `current` against `baseline`.
+
+    Latency regresses when p95 grows by more than `latency_threshold` (a
+    fraction), queries when they exceed the baseline by more than
+    `query_allowance`, and response size when it grows by more than
+    `bytes_threshold`.
+    """
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + latency_threshold):
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.2f} ms vs baseline {before['p95_ms']:.2f} ms"
+            )
+        if result["queries"] > before["queries"] + query_allowance:
+            regressions.append(
+                f"{name}: {result['queries']} queries vs baseline {before['queries']}"
+            )
+        if result["bytes"] > before["bytes"] * (1 + bytes_threshold):
+            regressions.append(
+                f"{name}: {result['bytes']:,} bytes vs baseline {before['bytes']:,}"
+            )
+        if result["errors"] > before.get("errors", 0):
+            regressions.append(f"{name}: {result['errors']} failed requests")
+    return regressions
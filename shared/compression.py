@@ -0,0 +1,148 @@
+"""
+Response compression for API payloads.
+
+`compress_response()` (run by `CompressionMiddleware`) compresses responses
+whose type is in ``settings.COMPRESSION_TYPES`` with brotli, when the
+``brotli`` package is installed and the client accepts it, or gzip. Bodies
+smaller than ``COMPRESSION_MIN_SIZE`` are sent as they are; streaming
+responses, such as exports, are compressed chunk by chunk.
+"""
+from __future__ import annotations
+
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Preferred first when the client rates them equally
+ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Return the encoding to use for an Accept-Encoding header, or None."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.strip().split(";")
+        coding = coding.strip().lower()
+        if coding == "x-gzip":
+            coding = GZIP
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding] = weight
+
+    default = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, default)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class _Compressor:
+    """Incremental compressor; `process()` returns everything compressed so far."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 31: a gzip header and trailer around the deflate stream
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        # Flush each chunk so a slow stream still reaches the client as it goes
+        if self.encoding == BROTLI:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(content) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    compressor = _Compressor(encoding)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks: AsyncIterable[bytes], encoding: str) -> AsyncIterator[bytes]:
+    compressor = _Compressor(encoding)
+    async for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compressible(response) -> bool:
+    content_type = response.get("Content-Type", "").partition(";")[0].strip().lower()
+    return (
+        content_type in settings.COMPRESSION_TYPES
+        and not response.has_header("Content-Encoding")
+        and "no-transform" not in response.get("Cache-Control", "")
+        # A byte range of the uncompressed body
+        and response.status_code != 206
+    )
+
+
+def compress_response(request, response):
+    """Compress `response` in place if it is worth it and the client accepts it."""
+    if not compressible(response):
+        return response
+    if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+        return response
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+    encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    if encoding is None:
+        return response
+
+    if response.streaming:
+        if response.is_async:
+            response.streaming_content = acompress_stream(response.streaming_content, encoding)
+        else:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+        del response.headers["Content-Length"]
+    else:
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+
+    # The ETag was computed on the uncompressed body, which other encodings
+    # share; a strong ETag would claim byte-for-byte equality
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+    response.headers["Content-Encoding"] = encoding
+    return response
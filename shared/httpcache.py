@@ -0,0 +1,105 @@
+"""
+HTTP caching for responses a CDN or reverse proxy can share.
+
+Views opt in with a `CachePolicy` (see `shared.views.CachePolicyMixin`).
+Successful anonymous GETs then carry ``Cache-Control`` and ``Vary``, and a
+surrogate key header (``settings.SURROGATE_KEY_HEADER``) naming what they
+show, such as ``product:<id>`` and ``category:<slug>``.
+
+When that data changes, `purge()` records the keys once the transaction
+commits. ``manage.py purge_cache`` sends the recorded keys to the receivers
+of `purge_requested`, where a CDN client connects.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+# Sent with keys=[...] by `send_purges()`; receivers purge them from the CDN
+purge_requested = Signal()
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long browsers (`max_age`) and shared caches (`shared_max_age`) keep a response."""
+
+    max_age: int
+    shared_max_age: int | None = None
+    stale_while_revalidate: int | None = None
+    stale_if_error: int | None = None
+    vary: tuple[str, ...] = ("Accept",)
+
+    def directives(self) -> dict[str, int | bool]:
+        directives: dict[str, int | bool] = {"public": True, "max_age": self.max_age}
+        if self.shared_max_age is not None:
+            directives["s_maxage"] = self.shared_max_age
+        if self.stale_while_revalidate is not None:
+            directives["stale_while_revalidate"] = self.stale_while_revalidate
+        if self.stale_if_error is not None:
+            directives["stale_if_error"] = self.stale_if_error
+        return directives
+
+
+def apply(policy: CachePolicy, request, response, keys: Iterable[str] = ()) -> None:
+    """Set the caching headers on a successful GET or HEAD `response`."""
+    if request.method not in CACHEABLE_METHODS or response.status_code != 200:
+        return
+    if response.has_header("Cache-Control"):
+        return
+    if "HTTP_AUTHORIZATION" in request.META:
+        # Only anonymous traffic is offloaded; signed-in clients revalidate
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, **policy.directives())
+    patch_vary_headers(response, policy.vary)
+    keys = sorted(set(keys))
+    if keys:
+        response.headers[settings.SURROGATE_KEY_HEADER] = " ".join(keys)
+
+
+def purge(keys: Iterable[str], using: str | None = None) -> None:
+    """Record surrogate keys to purge once the current transaction commits."""
+    keys = set(keys)
+    if keys:
+        transaction.on_commit(lambda: record(keys), using=using)
+
+
+def record(keys: Iterable[str]) -> None:
+    from .models import PendingPurge
+
+    # A key already waiting is touched, so a send in progress keeps it
+    PendingPurge.objects.bulk_create(
+        [PendingPurge(key=key) for key in keys],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["updated_at"],
+    )
+
+
+def send_purges(limit: int = 1000) -> list[str]:
+    """
+    Send up to `limit` recorded keys to `purge_requested` and forget them.
+    Keys are kept while nothing is connected to receive them.
+    """
+    from .models import PendingPurge
+
+    if not purge_requested.has_listeners():
+        return []
+    started = timezone.now()
+    pending = list(PendingPurge.objects.order_by("id").values_list("id", "key")[:limit])
+    if not pending:
+        return []
+    keys = [key for _, key in pending]
+    # A receiver that raises leaves the keys recorded, to be sent again
+    purge_requested.send(sender=PendingPurge, keys=keys)
+    # Keys recorded again since, for changes after this purge, stay
+    PendingPurge.objects.filter(id__in=[pk for pk, _ in pending], updated_at__lte=started).delete()
+    return keys
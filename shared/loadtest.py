@@ -0,0 +1,249 @@
+"""
+Scripted browse-to-checkout load generation.
+
+Each virtual user repeats a shopping journey (list products, search, view a
+product, add it to the cart, change the quantity, check out) with a random
+think time between steps, until the run's deadline. Users are threads, and
+threads can be spread over several forked processes to get past the GIL.
+
+Requests go either through Django's test client (in-process, no network) or
+over HTTP to a running WSGI server.
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from http.cookiejar import CookieJar
+from multiprocessing import get_context
+from typing import Any, Protocol
+
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+
+from shared.benchmarking import summarize
+
+MAX_PAGES = 5
+
+STEPS = ("list", "search", "detail", "add to cart", "update cart", "checkout")
+
+SEARCH_TERMS = ["diver", "chronograph", "pilot", "gmt", "automatic", "classic", "casio", "seiko"]
+
+CHECKOUT = {
+    "customer_email": "load@example.com",
+    "customer_first_name": "Load",
+    "customer_last_name": "Test",
+    "shipping_address_line1": "1 Main St",
+    "shipping_city": "Austin",
+    "shipping_state": "TX",
+    "shipping_postal_code": "78701",
+    "shipping_country": "United States",
+    "card_number": "4111111111111111",
+    "card_expiry": "12/2030",
+    "card_cvc": "123",
+}
+
+
+class Driver(Protocol):
+    def request(self, method: str, path: str, data: dict[str, Any] | None = None) -> tuple[int, Any]:
+        ...
+
+
+class ClientDriver:
+    """Send requests through the Django test client."""
+
+    def __init__(self) -> None:
+        # Count server errors instead of raising them in the load thread
+        self.client = Client(raise_request_exception=False)
+
+    def request(self, method: str, path: str, data: dict[str, Any] | None = None) -> tuple[int, Any]:
+        kwargs = {}
+        if data is not None:
+            kwargs = {"data": json.dumps(data), "content_type": "application/json"}
+        response = getattr(self.client, method)(path, **kwargs)
+        body = response.json() if response.get("Content-Type") == "application/json" else None
+        return response.status_code, body
+
+
+class HttpDriver:
+    """Send requests to a running server, keeping cookies between them."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+    def request(self, method: str, path: str, data: dict[str, Any] | None = None) -> tuple[int, Any]:
+        body = json.dumps(data).encode() if data is not None else None
+        req = urllib.request.Request(
+            self.base_url + path,
+            data=body,
+            method=method.upper(),
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read() or b"null")
+        except urllib.error.HTTPError as exc:
+            return exc.code, None
+        except (urllib.error.URLError, OSError, ValueError):
+            # Connection refused/reset or an unreadable body
+            return 0, None
+
+
+@dataclass
+class Sample:
+    step: str
+    latency_ms: float
+    ok: bool
+
+
+class JourneyFailed(Exception):
+    """A step failed, so the rest of the journey can't continue."""
+
+
+class VirtualUser:
+    """One shopper repeating the browse-to-checkout journey."""
+
+    def __init__(self, driver: Driver, rng: random.Random, think_time: float) -> None:
+        self.driver = driver
+        self.rng = rng
+        self.think_time = think_time
+        self.samples: list[Sample] = []
+        # Listing pages seen so far; users browse the first few
+        self.pages = 1
+
+    def think(self) -> None:
+        # Uniform around the mean so users don't move in lockstep
+        if self.think_time > 0:
+            time.sleep(self.rng.uniform(0, 2 * self.think_time))
+
+    def step(self, name: str, method: str, path: str, data: dict[str, Any] | None = None,
+             expected: int = 200) -> Any:
+        started = time.perf_counter()
+        status, body = self.driver.request(method, path, data)
+        elapsed = (time.perf_counter() - started) * 1000
+        ok = status == expected
+        self.samples.append(Sample(name, elapsed, ok))
+        if not ok:
+            raise JourneyFailed(f"{name} returned {status}")
+        self.think()
+        return body
+
+    def journey(self) -> None:
+        products_url = reverse("products:product-list")
+        page = self.rng.randint(1, self.pages)
+        listing = self.step("list", "get", f"{products_url}?page={page}")
+        if listing and listing.get("next"):
+            self.pages = min(max(self.pages, page + 1), MAX_PAGES)
+        search = self.step("search", "get", f"{products_url}?search={self.rng.choice(SEARCH_TERMS)}")
+        candidates = (search or {}).get("results") or (listing or {}).get("results") or []
+        if not candidates:
+            raise JourneyFailed("no products to browse")
+        product_id = self.rng.choice(candidates)["id"]
+
+        self.step("detail", "get", reverse("products:product-detail", kwargs={"pk": product_id}))
+        self.step("add to cart", "post", reverse("orders:cart-add"),
+                  {"product_id": product_id, "quantity": 1}, expected=201)
+        self.step("update cart", "put",
+                  reverse("orders:cart-item", kwargs={"product_id": product_id}), {"quantity": 2})
+        self.step("checkout", "post", reverse("orders:checkout"), CHECKOUT, expected=201)
+
+    def run(self, deadline: float) -> list[Sample]:
+        while time.monotonic() < deadline:
+            try:
+                self.journey()
+            except JourneyFailed:
+                self.think()
+        return self.samples
+
+
+def run_threads(
+    make_driver: Callable[[], Driver],
+    *,
+    concurrency: int,
+    duration: float,
+    think_time: float,
+    seed: int,
+) -> list[Sample]:
+    """Run `concurrency` virtual users in threads for `duration` seconds."""
+    deadline = time.monotonic() + duration
+    lock = threading.Lock()
+    samples: list[Sample] = []
+
+    def user(number: int) -> None:
+        try:
+            virtual_user = VirtualUser(make_driver(), random.Random(f"{seed}:{number}"), think_time)
+            result = virtual_user.run(deadline)
+            with lock:
+                samples.extend(result)
+        finally:
+            # Each thread opened its own database connection
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(user, number) for number in range(concurrency)]:
+            future.result()
+    return samples
+
+
+def _process_main(target: str | None, concurrency: int, duration: float, think_time: float,
+                  seed: int) -> list[Sample]:
+    def make_driver() -> Driver:
+        return HttpDriver(target) if target else ClientDriver()
+
+    return run_threads(
+        make_driver, concurrency=concurrency, duration=duration, think_time=think_time, seed=seed
+    )
+
+
+def run_load(
+    *,
+    target: str | None,
+    processes: int,
+    concurrency: int,
+    duration: float,
+    think_time: float,
+    seed: int,
+) -> list[Sample]:
+    """
+    Run `processes` x `concurrency` virtual users against `target` (a base
+    URL), or in-process through the test client when `target` is None.
+    """
+    if processes <= 1:
+        return _process_main(target, concurrency, duration, think_time, seed)
+
+    # Forked children must not share the parent's SQLite handles
+    connections.close_all()
+    samples: list[Sample] = []
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("fork")) as pool:
+        futures = [
+            pool.submit(_process_main, target, concurrency, duration, think_time, seed * 1000 + number)
+            for number in range(processes)
+        ]
+        for future in futures:
+            samples.extend(future.result())
+    return samples
+
+
+def report(samples: list[Sample], elapsed: float) -> dict[str, dict[str, Any]]:
+    """Return requests, errors, throughput and latency percentiles per step."""
+    results = {}
+    for step in STEPS:
+        latencies = [sample.latency_ms for sample in samples if sample.step == step]
+        errors = sum(1 for sample in samples if sample.step == step and not sample.ok)
+        results[step] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+            "throughput": round((len(latencies) - errors) / elapsed, 2) if elapsed else 0.0,
+            **summarize(latencies),
+        }
+    return results
@@ -0,0 +1,209 @@
+"""
+Structured logging off the request thread.
+
+`QueueLogHandler` only copies a record onto a queue; a background
+`QueueListener` thread formats it (as JSON with `JsonFormatter`) and writes
+it, so a slow stdout never holds up a request. Filters run before the
+handoff, on the thread that logged:
+
+* `RequestIdFilter` stamps each record with the id of the request being
+  handled (set by `RequestIdMiddleware`), so all lines of one request can be
+  found together.
+* `SamplingFilter` keeps only a fraction of the records below WARNING from
+  chosen high-volume loggers.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import weakref
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from . import metrics
+
+DROPPED = metrics.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+_request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Incoming ids are echoed into logs and headers, so accept only plain tokens
+_VALID_REQUEST_ID = re.compile(r"^[\w.:-]{1,128}$")
+
+# Attributes every LogRecord has; anything else was passed in `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id",
+}
+
+
+def current_request_id() -> str | None:
+    return _request_id.get()
+
+
+def bind_request_id(value: str | None):
+    """Make `value` the current request id; pass the token to `unbind_request_id()`."""
+    return _request_id.set(value)
+
+
+def unbind_request_id(token) -> None:
+    _request_id.reset(token)
+
+
+def valid_request_id(value: str | None) -> bool:
+    return bool(value) and _VALID_REQUEST_ID.match(value) is not None
+
+
+class RequestIdFilter(logging.Filter):
+    """Add `request_id` to every record ("-" outside requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # django.request logs 4xx/5xx responses after the middleware has
+        # unbound the id, but passes the request along
+        record.request_id = (
+            _request_id.get()
+            or getattr(getattr(record, "request", None), "request_id", None)
+            or "-"
+        )
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of the DEBUG/INFO records from some loggers.
+
+    `rates` maps logger names to the fraction to keep; a name also covers its
+    child loggers. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float] | None = None) -> None:
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._resolved: dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any fields passed in `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+# Live QueueLogHandlers, restarted in forked children by one at-fork hook;
+# per-handler hooks can't be unregistered and would keep old handlers alive
+_queue_handlers: weakref.WeakSet[QueueLogHandler] = weakref.WeakSet()
+
+
+def _restart_queue_handlers() -> None:
+    for handler in list(_queue_handlers):
+        handler._restart()
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Queue records for a background thread that formats and writes them to
+    `stream` (stderr by default). When the queue is full, records are dropped
+    and counted rather than blocking the caller.
+    """
+
+    def __init__(self, stream=None, queue_size: int = 10_000) -> None:
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.target = logging.StreamHandler(stream)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        # Threads don't survive fork: gunicorn workers need their own listener
+        _queue_handlers.add(self)
+
+    def _restart(self) -> None:
+        if not self.running:
+            return
+        self.queue = queue.Queue(self.queue_size)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, formatter: logging.Formatter | None) -> None:
+        # Formatting happens on the listener thread
+        self.target.setFormatter(formatter)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments and render any traceback while they are still
+        # current; leave the rest of the formatting to the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DROPPED.inc()
+
+    @property
+    def running(self) -> bool:
+        return self.listener._thread is not None
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written."""
+        if self.running:
+            self.listener.stop()
+            self.listener.start()
+        self.target.flush()
+
+    def close(self) -> None:
+        # Called by logging.shutdown() at exit, after flush()
+        _queue_handlers.discard(self)
+        if self.running:
+            self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+os.register_at_fork(after_in_child=_restart_queue_handlers)
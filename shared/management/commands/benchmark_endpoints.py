@@ -0,0 +1,336 @@
+"""
+Management command to benchmark every API endpoint against a generated dataset.
+
+Each scenario is requested through Django's test client (the full middleware
+and view stack, without a network hop). For every scenario the command
+records p50/p95/p99 latency, queries per request and response size, and can
+compare the results against a stored baseline.
+
+Examples:
+    python manage.py benchmark_endpoints --save-baseline
+    python manage.py benchmark_endpoints --products 100000 --orders 50000 --requests 200
+    python manage.py benchmark_endpoints --latency-threshold 0.1 --output results.json
+"""
+
+import json
+import logging
+import platform
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from orders.models import Order
+from products.models import Product
+from shared.benchmarking import benchmark_database, compare, summarize
+
+DEFAULT_BASELINE = settings.BASE_DIR / "benchmarks" / "baseline.json"
+
+# URL modules whose endpoints must all have a scenario
+COVERED_URLCONFS = ["products.urls", "orders.urls", "accounts.urls"]
+
+
+class Fixtures:
+    """Ids and credentials sampled from the dataset for building requests."""
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+        self.cart_product = None
+        self.products = list(
+            Product.objects.active().order_by("?").values_list("id", "slug")[:200]
+        )
+        self.orders = list(Order.objects.order_by("?").values_list("id", flat=True)[:200])
+        if not self.products or not self.orders:
+            raise CommandError("The dataset needs active products and orders to benchmark")
+        staff, _ = User.objects.get_or_create(
+            email="bench.staff@example.com", defaults={"is_staff": True}
+        )
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(staff).access_token}"}
+
+    def product(self) -> tuple:
+        return self.rng.choice(self.products)
+
+    def order_id(self):
+        return self.rng.choice(self.orders)
+
+
+def add_to_cart(client: Client, fx: Fixtures) -> None:
+    """Add a random product; used before requests that empty the cart."""
+    product_id, _ = fx.product()
+    fx.cart_product = product_id
+    client.post(
+        reverse("orders:cart-add"),
+        {"product_id": str(product_id), "quantity": 1},
+        content_type="application/json",
+    )
+
+
+def fill_cart(client: Client, fx: Fixtures) -> None:
+    """Put three products in this client's cart once, so it doesn't keep growing."""
+    if getattr(client, "cart_filled", False):
+        return
+    for _ in range(3):
+        add_to_cart(client, fx)
+    client.cart_filled = True
+
+
+def new_session(client: Client, fx: Fixtures) -> None:
+    """Start from an anonymous visitor without a session."""
+    client.cookies.clear()
+
+
+CHECKOUT = {
+    "customer_email": "bench@example.com",
+    "customer_first_name": "Bench",
+    "customer_last_name": "Mark",
+    "shipping_address_line1": "1 Main St",
+    "shipping_city": "New York",
+    "shipping_state": "NY",
+    "shipping_postal_code": "10001",
+    "shipping_country": "United States",
+    "card_number": "4111111111111111",
+    "card_expiry": "12/2030",
+    "card_cvc": "123",
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    url_name: str
+    path: Callable[[Fixtures], str]
+    method: str = "get"
+    data: Callable[[Fixtures], dict[str, Any]] | None = None
+    setup: Callable[[Client, Fixtures], None] | None = None
+    auth: bool = False
+
+
+def _week_ago() -> str:
+    return (date.today() - timedelta(days=7)).isoformat()
+
+
+SCENARIOS = [
+    # products.urls
+    Scenario("categories", "products:category-list",
+             lambda fx: reverse("products:category-list")),
+    Scenario("product list", "products:product-list",
+             lambda fx: reverse("products:product-list")),
+    Scenario("product list (page 20)", "products:product-list",
+             lambda fx: reverse("products:product-list") + "?page=20"),
+    Scenario("product search", "products:product-list",
+             lambda fx: reverse("products:product-list") + "?search=diver"),
+    Scenario("product category filter", "products:product-list",
+             lambda fx: reverse("products:product-list") + "?category=luxury&ordering=price"),
+    Scenario("product detail", "products:product-detail",
+             lambda fx: reverse("products:product-detail", kwargs={"pk": fx.product()[0]})),
+    Scenario("product by slug", "products:product-by-slug",
+             lambda fx: reverse("products:product-by-slug", kwargs={"slug": fx.product()[1]})),
+    Scenario("catalog export", "products:product-export",
+             lambda fx: reverse("products:product-export") + "?category=luxury", auth=True),
+    # orders.urls
+    Scenario("cart", "orders:cart", lambda fx: reverse("orders:cart"), setup=fill_cart),
+    Scenario("cart add", "orders:cart-add", lambda fx: reverse("orders:cart-add"),
+             method="post", setup=new_session,
+             data=lambda fx: {"product_id": str(fx.product()[0]), "quantity": 1}),
+    Scenario("cart update", "orders:cart-item",
+             lambda fx: reverse("orders:cart-item", kwargs={"product_id": fx.cart_product}),
+             method="put", data=lambda fx: {"quantity": 2}, setup=fill_cart),
+    Scenario("cart remove", "orders:cart-item",
+             lambda fx: reverse("orders:cart-item", kwargs={"product_id": fx.cart_product}),
+             method="delete", setup=add_to_cart),
+    Scenario("cart clear", "orders:cart-clear", lambda fx: reverse("orders:cart-clear"),
+             method="delete", setup=add_to_cart),
+    Scenario("checkout", "orders:checkout", lambda fx: reverse("orders:checkout"),
+             method="post", data=lambda fx: CHECKOUT, setup=add_to_cart),
+    Scenario("order detail", "orders:order-detail",
+             lambda fx: reverse("orders:order-detail", kwargs={"order_id": fx.order_id()})),
+    Scenario("order export", "orders:order-export",
+             lambda fx: reverse("orders:order-export") + f"?date_from={_week_ago()}", auth=True),
+    # accounts.urls
+    Scenario("current user", "current-user", lambda fx: reverse("current-user"), auth=True),
+    Scenario("user list", "user-list", lambda fx: reverse("user-list"), auth=True),
+]
+
+
+def uncovered_endpoints(scenarios: list[Scenario]) -> list[str]:
+    """Return URL names in COVERED_URLCONFS that no scenario exercises."""
+    from importlib import import_module
+
+    covered = {scenario.url_name for scenario in scenarios}
+    missing = []
+    for module_name in COVERED_URLCONFS:
+        module = import_module(module_name)
+        namespace = getattr(module, "app_name", None)
+        for pattern in module.urlpatterns:
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            if name not in covered:
+                missing.append(name)
+    return missing
+
+
+class Command(BaseCommand):
+    help = "Benchmarks API endpoints (latency percentiles, queries, bytes) against a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--products", type=int, default=10000)
+        parser.add_argument("--orders", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--requests", type=int, default=100, help="Timed requests per scenario")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument(
+            "--only", action="append", default=[], help="Run scenarios whose name contains this"
+        )
+        parser.add_argument(
+            "--use-existing",
+            action="store_true",
+            help="Benchmark the configured database instead of a generated one (writes orders)",
+        )
+        parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+        parser.add_argument("--save-baseline", action="store_true")
+        parser.add_argument("--output", type=Path, help="Also write results to this JSON file")
+        parser.add_argument(
+            "--latency-threshold",
+            type=float,
+            default=0.25,
+            help="Allowed fractional p95 increase over the baseline",
+        )
+        parser.add_argument(
+            "--query-allowance",
+            type=int,
+            default=0,
+            help="Allowed extra queries per request over the baseline",
+        )
+        parser.add_argument(
+            "--bytes-threshold",
+            type=float,
+            default=0.10,
+            help="Allowed fractional response size increase over the baseline",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1")
+
+        for name in uncovered_endpoints(SCENARIOS):
+            self.stderr.write(self.style.WARNING(f"No benchmark scenario for {name}"))
+
+        scenarios = [
+            scenario for scenario in SCENARIOS
+            if not options["only"] or any(part in scenario.name for part in options["only"])
+        ]
+        dataset = {key: options[key] for key in ("users", "products", "orders", "seed")}
+        # Don't log a timing line for every benchmarked request
+        logging.getLogger("shared.timing").setLevel(logging.WARNING)
+
+        with benchmark_database(**dataset, use_existing=options["use_existing"]):
+            fixtures = Fixtures(random.Random(options["seed"]))
+            results = {}
+            for scenario in scenarios:
+                results[scenario.name] = self._run(scenario, fixtures, options)
+                self._print_row(scenario.name, results[scenario.name])
+
+        report = {
+            "meta": {
+                "dataset": None if options["use_existing"] else dataset,
+                "requests": options["requests"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "results": results,
+        }
+        if options["output"]:
+            options["output"].write_text(json.dumps(report, indent=2) + "\n")
+
+        if options["save_baseline"]:
+            options["baseline"].write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {options['baseline']}"))
+            return
+
+        if not options["baseline"].exists():
+            self.stdout.write(f"No baseline at {options['baseline']}; pass --save-baseline to create one")
+            return
+
+        baseline = json.loads(options["baseline"].read_text())["results"]
+        regressions = compare(
+            results,
+            baseline,
+            latency_threshold=options["latency_threshold"],
+            query_allowance=options["query_allowance"],
+            bytes_threshold=options["bytes_threshold"],
+        )
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(self.style.ERROR(f"  {regression}"))
+            raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
+
+    def _request(self, client: Client, scenario: Scenario, fixtures: Fixtures):
+        if scenario.setup:
+            scenario.setup(client, fixtures)
+        path = scenario.path(fixtures)
+        kwargs = dict(fixtures.auth) if scenario.auth else {}
+        if scenario.data is not None:
+            kwargs["data"] = json.dumps(scenario.data(fixtures))
+            kwargs["content_type"] = "application/json"
+
+        started = time.perf_counter()
+        response = getattr(client, scenario.method)(path, **kwargs)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        elapsed = (time.perf_counter() - started) * 1000
+        return response.status_code, size, elapsed
+
+    def _run(self, scenario: Scenario, fixtures: Fixtures, options) -> dict[str, Any]:
+        client = Client()
+
+        # Count queries on a separate request: capturing them slows the cursor
+        if scenario.setup:
+            scenario.setup(client, fixtures)
+        setup, scenario.setup = scenario.setup, None
+        try:
+            with CaptureQueriesContext(connection) as captured:
+                self._request(client, scenario, fixtures)
+        finally:
+            scenario.setup = setup
+        queries = len(captured.captured_queries)
+
+        for _ in range(options["warmup"]):
+            self._request(client, scenario, fixtures)
+
+        latencies, sizes, errors = [], [], 0
+        for _ in range(options["requests"]):
+            status, size, elapsed = self._request(client, scenario, fixtures)
+            latencies.append(elapsed)
+            sizes.append(size)
+            if status >= 400:
+                errors += 1
+
+        return {
+            **summarize(latencies),
+            "queries": queries,
+            "bytes": round(sum(sizes) / len(sizes)),
+            "errors": errors,
+        }
+
+    def _print_row(self, name: str, result: dict[str, Any]) -> None:
+        self.stdout.write(
+            f"  {name:<26} p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  "
+            f"p99 {result['p99_ms']:>8.2f} ms  {result['queries']:>3} queries  "
+            f"{result['bytes']:>9,} B  {result['errors']} errors"
+        )
@@ -0,0 +1,364 @@
+"""
+Management command to generate a large, deterministic dataset for benchmarking.
+
+Rows are built from a seeded RNG and written with ``bulk_create`` in batches,
+one transaction per batch. Ids are UUIDv7s derived from each row's
+``created_at``, spread over the few years before ``--until`` (by default,
+now). The same seed, label and ``--until`` always produce the same data,
+ids included; without ``--until`` only the timestamps and ids differ.
+
+Examples:
+    python manage.py generate_dataset --products 1000000 --orders 5000000 --users 100000
+    python manage.py generate_dataset --products 10000 --orders 20000 --label smoke
+    python manage.py generate_dataset --seed 7 --until 2026-01-01
+"""
+
+import random
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.models import User
+from orders.models import Order, OrderItem
+from orders.rates import quote
+from products.cache import CATALOG_KEY
+from products.models import Category, Product
+from shared import httpcache
+from shared.ids import uuid7_at
+from shared.money import format_cents
+
+CATEGORIES = ["luxury", "sport", "casual", "vintage", "smart"]
+
+# (brand, category, relative popularity, median price in dollars)
+BRANDS = [
+    ("Casio", "sport", 20, 120),
+    ("Seiko", "casual", 16, 450),
+    ("Timex", "casual", 14, 90),
+    ("Apple", "smart", 12, 450),
+    ("Samsung", "smart", 8, 350),
+    ("Garmin", "sport", 8, 600),
+    ("Tissot", "casual", 6, 700),
+    ("Hamilton", "casual", 4, 900),
+    ("Orient", "vintage", 4, 300),
+    ("Junghans", "vintage", 2, 1100),
+    ("TAG Heuer", "sport", 2, 3500),
+    ("Omega", "luxury", 2, 6000),
+    ("Rolex", "luxury", 1.5, 12000),
+    ("Patek Philippe", "luxury", 0.5, 35000),
+]
+
+MODELS = [
+    "Diver", "Chronograph", "Field", "Pilot", "Dress", "GMT", "Automatic",
+    "Skeleton", "Moonphase", "Explorer", "Heritage", "Classic", "Pro", "Sport",
+]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Kim", "Müller", "Rossi", "Silva", "Nguyen", "Cohen"]
+
+# (city, state, postal code prefix)
+CITIES = [
+    ("New York", "NY", "100"), ("Buffalo", "NY", "142"), ("Los Angeles", "CA", "900"),
+    ("San Francisco", "CA", "941"), ("Austin", "TX", "787"), ("Chicago", "IL", "606"),
+    ("Seattle", "WA", "981"), ("Miami", "FL", "331"), ("Denver", "CO", "802"),
+    ("Boston", "MA", "021"),
+]
+
+# Weighted toward orders that have completed
+ORDER_STATUSES = [
+    (Order.OrderStatus.DELIVERED, 55),
+    (Order.OrderStatus.SHIPPED, 15),
+    (Order.OrderStatus.CONFIRMED, 15),
+    (Order.OrderStatus.PROCESSING, 5),
+    (Order.OrderStatus.PENDING, 5),
+    (Order.OrderStatus.CANCELLED, 5),
+]
+
+
+def moment(value: str) -> datetime:
+    """Parse an ISO 8601 date or datetime, taken as UTC unless it says otherwise."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if timezone.is_aware(parsed) else parsed.replace(tzinfo=dt_timezone.utc)
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to `size` items."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def explicit_timestamps(*model_classes: type[models.Model]):
+    """Let bulk_create keep the generated created_at / updated_at values."""
+    fields = [
+        field
+        for model in model_classes
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.DateTimeField) and (field.auto_now or field.auto_now_add)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Generates a deterministic synthetic dataset (users, products, orders) for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--products", type=int, default=10000)
+        parser.add_argument("--orders", type=int, default=10000)
+        parser.add_argument("--max-items", type=int, default=4, help="Maximum items per order")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--label",
+            default="bench",
+            help="Prefix for generated emails, slugs and SKUs; use a new one to add another dataset",
+        )
+        parser.add_argument(
+            "--years",
+            type=int,
+            default=3,
+            help="Spread created_at over this many years before --until",
+        )
+        parser.add_argument(
+            "--until",
+            type=moment,
+            help="Latest created_at, as an ISO 8601 date or datetime (default: now); "
+            "fix it to get the same timestamps and ids on every run",
+        )
+
+    def handle(self, *args, **options):
+        self.label = slugify(options["label"])
+        self.rng = random.Random(options["seed"])
+        # Ids come from their own stream so datasets that differ only by label
+        # hold the same data without colliding on primary keys.
+        self.id_rng = random.Random(f"{options['seed']}:{self.label}")
+        self.batch_size = options["batch_size"]
+        self.now = options["until"] or timezone.now().replace(microsecond=0)
+        self.start = self.now - timedelta(days=365 * options["years"])
+
+        if (
+            Product.objects.filter(sku__startswith=f"{self.label.upper()}-").exists()
+            or User.objects.filter(email__startswith=f"{self.label}.user").exists()
+        ):
+            raise CommandError(
+                f"A dataset labelled '{self.label}' already exists; pass a different --label"
+            )
+
+        self.categories = self._ensure_categories()
+        overall = time.perf_counter()
+        total = 0
+        with explicit_timestamps(User, Product, Order, OrderItem):
+            total += self._insert("users", User, self._users(options["users"]), options["users"])
+            self.products: list[tuple] = []
+            total += self._insert(
+                "products", Product, self._products(options["products"]), options["products"]
+            )
+            if options["orders"] and not self.products:
+                self.products = [
+                    (p.id, p.name, p.price, p.weight_grams)
+                    for p in Product.objects.only("id", "name", "price", "weight_grams")
+                ]
+            total += self._insert_orders(options["orders"], options["max_items"])
+
+        # bulk_create doesn't send model signals, so purge the whole catalog once
+        httpcache.purge([CATALOG_KEY])
+
+        elapsed = time.perf_counter() - overall
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total:,} rows in {elapsed:,.1f}s ({total / elapsed:,.0f} rows/s)"
+        ))
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    def _ensure_categories(self) -> dict[str, Category]:
+        categories = {}
+        for slug in CATEGORIES:
+            categories[slug], _ = Category.objects.get_or_create(
+                slug=slug, defaults={"name": slug.title()}
+            )
+        return categories
+
+    def _moment(self, index: int, count: int) -> datetime:
+        """Spread `count` rows evenly (with jitter) between start and now."""
+        span = (self.now - self.start).total_seconds()
+        offset = span * (index + self.rng.random()) / max(count, 1)
+        return self.start + timedelta(seconds=offset)
+
+    def _id(self, moment: datetime):
+        return uuid7_at(moment, self.id_rng.getrandbits(74))
+
+    def _insert(
+        self, name: str, model: type[models.Model], rows: Iterable[models.Model], count: int
+    ) -> int:
+        if not count:
+            return 0
+        return self._run_batches(
+            name, count, rows, lambda batch: model.objects.bulk_create(batch)
+        )
+
+    def _run_batches(
+        self,
+        name: str,
+        count: int,
+        rows: Iterable,
+        write: Callable[[list], int | list | None],
+    ) -> int:
+        started = time.perf_counter()
+        inserted = 0
+        for batch in batched(rows, self.batch_size):
+            with transaction.atomic():
+                written = write(batch)
+            inserted += written if isinstance(written, int) else len(batch)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {name}: {inserted:,} rows ({inserted / elapsed:,.0f} rows/s)",
+                ending="\r",
+            )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"  {name}: {inserted:,} rows in {elapsed:,.1f}s ({inserted / elapsed:,.0f} rows/s)"
+        )
+        return inserted
+
+    # -------------------------------------------------------------------------
+    # Row generators
+    # -------------------------------------------------------------------------
+
+    def _users(self, count: int) -> Iterator[User]:
+        # Hashing is deliberately slow, so every user shares one precomputed hash
+        password = make_password("password", salt=f"{self.label}salt")
+        for i in range(count):
+            moment = self._moment(i, count)
+            yield User(
+                id=self._id(moment),
+                email=f"{self.label}.user{i}@example.com",
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                password=password,
+                created_at=moment,
+                updated_at=moment,
+            )
+
+    def _products(self, count: int) -> Iterator[Product]:
+        weights = [brand[2] for brand in BRANDS]
+        for i in range(count):
+            brand, category, _, median = self.rng.choices(BRANDS, weights)[0]
+            model_name = self.rng.choice(MODELS)
+            moment = self._moment(i, count)
+            # Log-normal prices around the brand median, rounded to x9.99 / x5.00
+            price = max(median * self.rng.lognormvariate(0, 0.35), 19)
+            price = round(price, -1) - (0.01 if price < 1000 else 5)
+            # Roughly 10% sold out, the rest with a long tail of stock
+            stock = 0 if self.rng.random() < 0.1 else int(self.rng.expovariate(1 / 25)) + 1
+            name = f"{brand} {model_name} {self.label.upper()}-{i}"
+            product = Product(
+                id=self._id(moment),
+                name=name,
+                slug=slugify(name),
+                description=f"{brand} {model_name.lower()} watch.",
+                price=f"{price:.2f}",
+                category=self.categories[category],
+                brand=brand,
+                sku=f"{self.label.upper()}-{i:07d}",
+                stock_quantity=stock,
+                weight_grams=self.rng.randint(40, 250),
+                is_active=self.rng.random() > 0.02,
+                is_featured=self.rng.random() < 0.01,
+                created_at=moment,
+                updated_at=moment,
+            )
+            self.products.append((product.id, product.name, product.price, product.weight_grams))
+            yield product
+
+    def _orders(self, count: int, max_items: int) -> Iterator[tuple[Order, list[OrderItem]]]:
+        statuses, status_weights = zip(*ORDER_STATUSES)
+        product_count = len(self.products)
+        for i in range(count):
+            moment = self._moment(i, count)
+            city, state, postal_prefix = self.rng.choice(CITIES)
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            order = Order(
+                id=self._id(moment),
+                customer_email=f"{self.label}.customer{self.rng.randrange(count)}@example.com",
+                customer_first_name=first,
+                customer_last_name=last,
+                shipping_address_line1=f"{self.rng.randint(1, 9999)} Main St",
+                shipping_city=city,
+                shipping_state=state,
+                shipping_postal_code=f"{postal_prefix}{self.rng.randint(0, 99):02d}",
+                order_status=self.rng.choices(statuses, status_weights)[0],
+                created_at=moment,
+                updated_at=moment,
+            )
+            order.payment_status = (
+                Order.PaymentStatus.REFUNDED
+                if order.order_status == Order.OrderStatus.CANCELLED
+                else Order.PaymentStatus.COMPLETED
+            )
+
+            items = []
+            subtotal = weight = 0
+            for _ in range(self.rng.randint(1, max_items)):
+                # Popular (older) products are picked far more often
+                product_id, name, price, grams = self.products[
+                    int(product_count * self.rng.random() ** 3)
+                ]
+                quantity = 1 if self.rng.random() < 0.8 else self.rng.randint(2, 3)
+                item = OrderItem(
+                    id=self._id(moment),
+                    order=order,
+                    product_id=product_id,
+                    product_name=name,
+                    product_price=price,
+                    quantity=quantity,
+                    created_at=moment,
+                    updated_at=moment,
+                )
+                items.append(item)
+                subtotal += item.line_total_cents
+                weight += grams * quantity
+
+            shipping, tax = quote(
+                subtotal_cents=subtotal,
+                weight_grams=weight,
+                country=order.shipping_country,
+                state=state,
+                postal_code=order.shipping_postal_code,
+            )
+            order.subtotal = format_cents(subtotal)
+            order.shipping_cost = format_cents(shipping)
+            order.tax = format_cents(tax)
+            order.total = format_cents(subtotal + shipping + tax)
+            yield order, items
+
+    def _insert_orders(self, count: int, max_items: int) -> int:
+        if not count:
+            return 0
+        if not self.products:
+            raise CommandError("Orders need products; generate some with --products")
+
+        def write(batch: list[tuple[Order, list[OrderItem]]]) -> int:
+            Order.objects.bulk_create([order for order, _ in batch])
+            items = [item for _, order_items in batch for item in order_items]
+            OrderItem.objects.bulk_create(items)
+            return len(batch) + len(items)
+
+        return self._run_batches("orders + items", count, self._orders(count, max_items), write)
@@ -0,0 +1,105 @@
+"""
+Management command to run the browse-to-checkout load generator.
+
+By default it builds a throwaway SQLite database with generate_dataset and
+drives the journeys in-process through the Django test client. Pass
+``--target`` to load a running server instead (runserver, gunicorn, ...);
+start it with ``THROTTLING=False``, or its rate limits will refuse most of
+the virtual users' requests.
+
+Examples:
+    python manage.py load_test --concurrency 8 --duration 30
+    python manage.py load_test --processes 4 --concurrency 4 --think-time 0
+    python manage.py load_test --target http://127.0.0.1:8000 --concurrency 16
+"""
+
+import json
+import logging
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from shared.benchmarking import benchmark_database
+from shared.loadtest import run_load, report
+
+
+class Command(BaseCommand):
+    help = "Runs scripted browse-to-checkout journeys and reports per-step throughput and errors"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", help="Base URL of a running server (default: in-process)")
+        parser.add_argument("--processes", type=int, default=1)
+        parser.add_argument("--concurrency", type=int, default=4, help="Virtual users per process")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run for")
+        parser.add_argument(
+            "--think-time", type=float, default=0.5, help="Mean pause between steps in seconds"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--products", type=int, default=5000)
+        parser.add_argument("--orders", type=int, default=2000)
+        parser.add_argument(
+            "--use-existing",
+            action="store_true",
+            help="Load the configured database instead of a generated one (writes orders)",
+        )
+        parser.add_argument("--output", type=Path, help="Also write results to this JSON file")
+
+    def handle(self, *args, **options):
+        if options["processes"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--processes and --concurrency must be at least 1")
+
+        if options["target"]:
+            # The in-process run turns throttling off; a server has to be told
+            self.stderr.write(self.style.WARNING(
+                f"Rate limits on {options['target']} will refuse most requests "
+                "unless the server runs with THROTTLING=False."
+            ))
+
+        # Failed requests are counted per step; don't print a traceback for each
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        logging.getLogger("shared.timing").setLevel(logging.WARNING)
+
+        with ExitStack() as stack:
+            if not (options["target"] or options["use_existing"]):
+                # File-backed so that threads and forked processes share one database
+                tmpdir = stack.enter_context(tempfile.TemporaryDirectory())
+                stack.enter_context(benchmark_database(
+                    users=options["users"],
+                    products=options["products"],
+                    orders=options["orders"],
+                    seed=options["seed"],
+                    test_name=str(Path(tmpdir) / "loadtest.sqlite3"),
+                ))
+            users = options["processes"] * options["concurrency"]
+            self.stdout.write(f"Running {users} virtual users for {options['duration']:g}s...")
+            started = time.monotonic()
+            samples = run_load(
+                target=options["target"],
+                processes=options["processes"],
+                concurrency=options["concurrency"],
+                duration=options["duration"],
+                think_time=options["think_time"],
+                seed=options["seed"],
+            )
+            elapsed = time.monotonic() - started
+
+        results = report(samples, elapsed)
+        for step, result in results.items():
+            self.stdout.write(
+                f"  {step:<12} {result['requests']:>7,} requests  "
+                f"{result['throughput']:>8.2f}/s  {result['error_rate']:>7.2%} errors  "
+                f"p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f} ms"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{results['checkout']['throughput']:.2f} checkouts/s over {elapsed:.1f}s"
+        ))
+        if options["output"]:
+            summary = {"options": {key: options[key] for key in (
+                "target", "processes", "concurrency", "duration", "think_time", "seed"
+            )}, "elapsed": round(elapsed, 3), "results": results}
+            options["output"].write_text(json.dumps(summary, indent=2) + "\n")
@@ -0,0 +1,45 @@
+"""
+Management command to send recorded surrogate key purges (see shared.httpcache).
+
+Run it from cron or after deploys; receivers of
+``shared.httpcache.purge_requested`` purge the keys from the CDN.
+
+Examples:
+    python manage.py purge_cache
+    python manage.py purge_cache --list
+    python manage.py purge_cache --key catalog
+"""
+
+from django.core.management.base import BaseCommand
+
+from shared import httpcache
+from shared.models import PendingPurge
+
+
+class Command(BaseCommand):
+    help = "Sends recorded surrogate keys to the CDN purge hook"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--list", action="store_true", help="Only list the recorded keys")
+        parser.add_argument("--key", action="append", default=[], help="Record this key first")
+        parser.add_argument("--batch", type=int, default=1000, help="Keys per purge request")
+
+    def handle(self, *args, **options):
+        if options["key"]:
+            httpcache.record(options["key"])
+
+        if options["list"]:
+            keys = list(PendingPurge.objects.values_list("key", flat=True))
+            for key in keys:
+                self.stdout.write(key)
+            self.stdout.write(f"{len(keys)} keys to purge.")
+            return
+
+        if not httpcache.purge_requested.has_listeners():
+            self.stderr.write("Nothing is connected to purge_requested; keeping the keys.")
+            return
+
+        sent = 0
+        while keys := httpcache.send_purges(limit=options["batch"]):
+            sent += len(keys)
+        self.stdout.write(self.style.SUCCESS(f"Purged {sent} keys."))
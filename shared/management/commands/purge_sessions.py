@@ -0,0 +1,90 @@
+"""
+Management command to delete expired database sessions in small batches.
+
+Unlike ``clearsessions``, which deletes every expired row in one statement
+and holds SQLite's write lock throughout, each batch is its own short
+transaction, with a pause between batches for requests to write in. It is
+safe to run during traffic, e.g. from cron.
+
+``--analyze`` refreshes the query planner's statistics afterwards.
+``--vacuum`` returns the freed pages to the filesystem; on SQLite that
+rewrites the whole database under an exclusive lock (unless it uses
+``auto_vacuum = incremental``), so schedule it for a quiet time.
+
+Examples:
+    python manage.py purge_sessions
+    python manage.py purge_sessions --batch 5000 --pause 0.5
+    python manage.py purge_sessions --analyze --vacuum
+"""
+
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Deletes expired sessions in batches, without locking out requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=1000, help="Sessions deleted per transaction")
+        parser.add_argument("--pause", type=float, default=0.1, help="Seconds to wait between batches")
+        parser.add_argument("--analyze", action="store_true", help="Update table statistics afterwards")
+        parser.add_argument("--vacuum", action="store_true", help="Reclaim free space afterwards")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database to purge")
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, "get_model_class"):
+            raise CommandError(f"{settings.SESSION_ENGINE} doesn't keep sessions in the database.")
+        if options["batch"] < 1:
+            raise CommandError("--batch must be at least 1.")
+        sessions = store.get_model_class().objects.using(options["database"])
+
+        now = timezone.now()
+        expired = sessions.filter(expire_date__lt=now)
+        total = expired.count()
+        self.stdout.write(f"{total} expired sessions.")
+
+        deleted = 0
+        while True:
+            # One DELETE ... WHERE pk IN (SELECT ... LIMIT n) per batch
+            batch = expired.order_by("expire_date").values("pk")[: options["batch"]]
+            count, _ = sessions.filter(pk__in=batch).delete()
+            deleted += count
+            if count:
+                self.stdout.write(f"Deleted {deleted}/{total} sessions.")
+            if count < options["batch"]:
+                break
+            time.sleep(options["pause"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired sessions."))
+
+        table = sessions.model._meta.db_table
+        if options["analyze"]:
+            self.analyze(options["database"], table)
+        if options["vacuum"]:
+            self.vacuum(options["database"], table)
+
+    def analyze(self, database: str, table: str) -> None:
+        connection = connections[database]
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+        self.stdout.write(f"Analyzed {table}.")
+
+    def vacuum(self, database: str, table: str) -> None:
+        connection = connections[database]
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute("PRAGMA auto_vacuum")
+                if cursor.fetchone()[0] == 2:
+                    # Incremental: frees pages without rewriting the database
+                    cursor.execute("PRAGMA incremental_vacuum")
+                    cursor.fetchall()
+                else:
+                    cursor.execute("VACUUM")
+            else:
+                cursor.execute(f"VACUUM {connection.ops.quote_name(table)}")
+        self.stdout.write(f"Vacuumed {table}.")
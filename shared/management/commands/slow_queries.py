@@ -0,0 +1,55 @@
+"""
+Management command to show the slow query log (see shared.slowqueries).
+
+Examples:
+    python manage.py slow_queries
+    python manage.py slow_queries --limit 5 --min-ms 500 --plans
+    python manage.py slow_queries --clear
+"""
+
+import textwrap
+
+from django.core.management.base import BaseCommand
+
+from shared.models import SlowQuery
+
+
+class Command(BaseCommand):
+    help = "Lists the most recent slow queries with where they came from and sampled query plans"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--min-ms", type=float, default=0, help="Only queries at least this slow")
+        parser.add_argument("--route", help="Only queries from routes containing this")
+        parser.add_argument("--plans", action="store_true", help="Only queries with a query plan")
+        parser.add_argument("--clear", action="store_true", help="Delete the log instead")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} slow queries.")
+            return
+
+        entries = SlowQuery.objects.filter(duration_ms__gte=options["min_ms"])
+        if options["route"]:
+            entries = entries.filter(route__contains=options["route"])
+        if options["plans"]:
+            entries = entries.exclude(plan="")
+        entries = list(entries[:options["limit"]])
+        if not entries:
+            self.stdout.write("No slow queries logged.")
+            return
+
+        for entry in entries:
+            self.stdout.write(self.style.WARNING(
+                f"{entry.created_at:%Y-%m-%d %H:%M:%S}  {entry.duration_ms:,.1f} ms  "
+                f"{entry.route or 'no request'}  [{entry.database}]"
+            ))
+            self.stdout.write(textwrap.indent(entry.sql, "    "))
+            if entry.plan:
+                self.stdout.write("  plan:")
+                self.stdout.write(textwrap.indent(entry.plan, "    "))
+            if entry.stack:
+                self.stdout.write("  from:")
+                self.stdout.write(textwrap.indent(entry.stack, "    "))
+            self.stdout.write("")
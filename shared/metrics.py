@@ -0,0 +1,467 @@
+"""
+Counters, gauges and fixed-bucket histograms in the Prometheus text format.
+
+Define metrics at module level, so every process knows all of them:
+
+    ORDERS = metrics.counter("orders_total", "Orders placed", ["country"])
+    ORDERS.labels(country="US").inc()
+
+Values are kept in memory, which only covers the current process. With
+``settings.METRICS_DIR`` set, each process writes its values to its own
+memory-mapped file in that directory instead, and `exposition()` adds up
+every file, so a scrape answered by any gunicorn worker reports the totals
+for all of them. Gauges are summed over live processes. When a worker
+exits, `mark_process_dead()` (gunicorn's child_exit hook) drops its gauges
+and folds its counters and histograms into an archive file, so totals
+survive worker recycling.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+
+from django.conf import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+ARCHIVE = "metrics_archive.db"
+
+# File layout: bytes used, then entries of key length, key (padded to 8
+# bytes) and a float value. A new entry is written before the used count
+# covers it, so readers never see half an entry.
+_USED = struct.Struct("<Q")
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_SIZE = 64 * 1024
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _entries(buffer) -> Iterator[tuple[str, int]]:
+    """Yield (key, value offset) for each entry in a metrics file."""
+    used = min(_USED.unpack_from(buffer, 0)[0], len(buffer))
+    position = _USED.size
+    while position + _KEY_LENGTH.size <= used:
+        (length,) = _KEY_LENGTH.unpack_from(buffer, position)
+        start = position + _KEY_LENGTH.size
+        key = bytes(buffer[start:start + length]).decode()
+        value_offset = _align(start + length)
+        yield key, value_offset
+        position = value_offset + _VALUE.size
+
+
+def read_file(path: Path) -> list[tuple[str, float]]:
+    """Return the (key, value) pairs stored in a metrics file."""
+    data = path.read_bytes()
+    if len(data) < _USED.size:
+        return []
+    return [
+        (key, _VALUE.unpack_from(data, offset)[0])
+        for key, offset in _entries(data)
+        if offset + _VALUE.size <= len(data)
+    ]
+
+
+class MemoryValues:
+    """Metric values for this process only."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, float] = {}
+
+    def add(self, updates: Iterable[tuple[str, float]]) -> None:
+        with self._lock:
+            for key, amount in updates:
+                self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, key: str, value: float) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def items(self) -> list[tuple[str, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class MmapValues:
+    """Metric values in a memory-mapped file written by one process."""
+
+    def __init__(self, path: Path) -> None:
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size < _INITIAL_SIZE:
+            os.ftruncate(self._fd, _INITIAL_SIZE)
+            size = _INITIAL_SIZE
+        self._map = mmap.mmap(self._fd, size)
+        if _USED.unpack_from(self._map, 0)[0] < _USED.size:
+            _USED.pack_into(self._map, 0, _USED.size)
+        self._offsets = dict(_entries(self._map))
+
+    def _offset(self, key: str) -> int:
+        offset = self._offsets.get(key)
+        if offset is not None:
+            return offset
+
+        encoded = key.encode()
+        used = _USED.unpack_from(self._map, 0)[0]
+        offset = _align(used + _KEY_LENGTH.size + len(encoded))
+        end = offset + _VALUE.size
+        if end > len(self._map):
+            size = len(self._map)
+            while size < end:
+                size *= 2
+            os.ftruncate(self._fd, size)
+            self._map.close()
+            self._map = mmap.mmap(self._fd, size)
+        _KEY_LENGTH.pack_into(self._map, used, len(encoded))
+        self._map[used + _KEY_LENGTH.size:used + _KEY_LENGTH.size + len(encoded)] = encoded
+        _VALUE.pack_into(self._map, offset, 0.0)
+        _USED.pack_into(self._map, 0, end)
+        self._offsets[key] = offset
+        return offset
+
+    def add(self, updates: Iterable[tuple[str, float]]) -> None:
+        with self._lock:
+            for key, amount in updates:
+                offset = self._offset(key)
+                _VALUE.pack_into(self._map, offset, _VALUE.unpack_from(self._map, offset)[0] + amount)
+
+    def set(self, key: str, value: float) -> None:
+        with self._lock:
+            _VALUE.pack_into(self._map, self._offset(key), value)
+
+    def items(self) -> list[tuple[str, float]]:
+        with self._lock:
+            return [(key, _VALUE.unpack_from(self._map, offset)[0])
+                    for key, offset in self._offsets.items()]
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+# Stores for this process: "metrics" (counters, histograms) and "gauge"
+_lock = threading.Lock()
+_pid: int | None = None
+_stores: dict[str, MemoryValues | MmapValues] = {}
+
+
+def _store(kind: str) -> MemoryValues | MmapValues:
+    if _pid != os.getpid():
+        # First use, or a forked worker that must not write to its parent's file
+        _reset_stores()
+    store = _stores.get(kind)
+    if store is None:
+        with _lock:
+            store = _stores.get(kind)
+            if store is None:
+                directory = settings.METRICS_DIR
+                if directory:
+                    store = MmapValues(Path(directory) / f"{kind}_{os.getpid()}.db")
+                else:
+                    store = MemoryValues()
+                _stores[kind] = store
+    return store
+
+
+def _reset_stores() -> None:
+    global _pid
+    with _lock:
+        _stores.clear()
+        _pid = os.getpid()
+
+
+def _key(name: str, labels: Sequence[tuple[str, str]]) -> str:
+    return json.dumps([name, labels], separators=(",", ":"))
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Metric:
+    """A named metric; `labels()` returns the child recording one label set."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._children_lock = threading.Lock()
+
+    def labels(self, **labels: object):
+        try:
+            values = tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            values = None
+        if values is None or len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {list(self.labelnames)}, got {sorted(labels)}")
+        child = self._children.get(values)
+        if child is None:
+            with self._children_lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._child(tuple(zip(self.labelnames, values)))
+        return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels; record through .labels()")
+        return self._children.get(()) or self.labels()
+
+    def _child(self, labels: tuple[tuple[str, str], ...]):
+        raise NotImplementedError
+
+    def sample_names(self) -> tuple[str, ...]:
+        return (self.name,)
+
+    def expose(self, samples: dict[str, dict[tuple, float]]) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+            for labels, value in sorted(samples.get(self.name, {}).items())
+        ]
+
+
+class _CounterChild:
+    __slots__ = ("key",)
+
+    def __init__(self, name: str, labels: tuple[tuple[str, str], ...]) -> None:
+        self.key = _key(name, labels)
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        _store("metrics").add([(self.key, amount)])
+
+
+class Counter(Metric):
+    """A total that only goes up (requests served, orders placed)."""
+
+    type = "counter"
+
+    def _child(self, labels):
+        return _CounterChild(self.name, labels)
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("key",)
+
+    def __init__(self, name: str, labels: tuple[tuple[str, str], ...]) -> None:
+        self.key = _key(name, labels)
+
+    def inc(self, amount: float = 1) -> None:
+        _store("gauge").add([(self.key, amount)])
+
+    def dec(self, amount: float = 1) -> None:
+        _store("gauge").add([(self.key, -amount)])
+
+    def set(self, value: float) -> None:
+        _store("gauge").set(self.key, value)
+
+
+class Gauge(Metric):
+    """A value that goes up and down (requests in progress)."""
+
+    type = "gauge"
+
+    def _child(self, labels):
+        return _GaugeChild(self.name, labels)
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._unlabelled().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "bucket_keys", "sum_key", "count_key")
+
+    def __init__(self, histogram: Histogram, labels: tuple[tuple[str, str], ...]) -> None:
+        self.bounds = histogram.buckets
+        self.bucket_keys = [
+            _key(f"{histogram.name}_bucket", (*labels, ("le", _format_value(bound))))
+            for bound in histogram.buckets
+        ]
+        self.sum_key = _key(f"{histogram.name}_sum", labels)
+        self.count_key = _key(f"{histogram.name}_count", labels)
+
+    def observe(self, value: float) -> None:
+        # Buckets are stored uncumulated; exposition adds them up
+        bucket = self.bucket_keys[bisect.bisect_left(self.bounds, value)]
+        _store("metrics").add([(bucket, 1), (self.sum_key, value), (self.count_key, 1)])
+
+
+class Histogram(Metric):
+    """Counts of observations (durations, sizes) in fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        bounds = sorted(float(bound) for bound in buckets)
+        if not bounds or bounds[-1] != math.inf:
+            bounds.append(math.inf)
+        self.buckets = tuple(bounds)
+
+    def _child(self, labels):
+        return _HistogramChild(self, labels)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def sample_names(self) -> tuple[str, ...]:
+        return (f"{self.name}_bucket", f"{self.name}_sum", f"{self.name}_count")
+
+    def expose(self, samples: dict[str, dict[tuple, float]]) -> list[str]:
+        buckets: dict[tuple, dict[str, float]] = defaultdict(dict)
+        for labels, value in samples.get(f"{self.name}_bucket", {}).items():
+            buckets[labels[:-1]][labels[-1][1]] = value
+
+        lines = []
+        sums = samples.get(f"{self.name}_sum", {})
+        counts = samples.get(f"{self.name}_count", {})
+        for labels in sorted(set(buckets) | set(counts)):
+            cumulative = 0.0
+            for bound in self.buckets:
+                le = _format_value(bound)
+                cumulative += buckets[labels].get(le, 0.0)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels((*labels, ('le', le)))} "
+                    f"{_format_value(cumulative)}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(sums.get(labels, 0.0))}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(counts.get(labels, 0.0))}")
+        return lines
+
+
+class Registry:
+    """The metrics a process exposes, in definition order."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add `metric`, or return the identical one already registered."""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} is already registered differently")
+        return existing
+
+    def metrics(self) -> list[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+
+registry = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return registry.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return registry.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return registry.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def collect() -> dict[str, float]:
+    """Return every sample's value, summed over all processes when shared."""
+    directory = settings.METRICS_DIR
+    totals: dict[str, float] = defaultdict(float)
+    if directory:
+        for path in sorted(Path(directory).glob("*.db")):
+            for key, value in read_file(path):
+                totals[key] += value
+    else:
+        for store in list(_stores.values()) if _pid == os.getpid() else []:
+            for key, value in store.items():
+                totals[key] += value
+    return totals
+
+
+def exposition() -> str:
+    """Render all registered metrics in the Prometheus text format."""
+    samples: dict[str, dict[tuple, float]] = defaultdict(dict)
+    for key, value in collect().items():
+        name, labels = json.loads(key)
+        samples[name][tuple(tuple(pair) for pair in labels)] = value
+
+    lines = []
+    for metric in registry.metrics():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.expose(samples))
+    return "\n".join(lines) + "\n"
+
+
+def mark_process_dead(pid: int, directory: str | os.PathLike) -> None:
+    """Drop a dead process's gauges and archive its counters and histograms."""
+    directory = Path(directory)
+    (directory / f"gauge_{pid}.db").unlink(missing_ok=True)
+    path = directory / f"metrics_{pid}.db"
+    if not path.exists():
+        return
+    archive = MmapValues(directory / ARCHIVE)
+    try:
+        archive.add(read_file(path))
+    finally:
+        archive.close()
+    path.unlink()
+
+
+def reset() -> None:
+    """Forget this process's values (tests)."""
+    with _lock:
+        for store in _stores.values():
+            if isinstance(store, MmapValues):
+                store.close()
+    _reset_stores()
+
+
+CACHE_REQUESTS = counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit or miss)", ["cache", "result"]
+)
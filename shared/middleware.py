@@ -0,0 +1,235 @@
+"""
+Middleware shared by all apps.
+
+Everything here supports both sync and async requests: a single sync-only
+middleware makes Django run the whole chain, async views included, in a
+worker thread under ASGI.
+"""
+
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from . import compression, logs, timing
+from .ids import uuid7
+from .routers import replica_routing
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Holds the time until which this client's reads stay on the primary
+PRIMARY_COOKIE = "primary_until"
+
+
+class RequestIdMiddleware:
+    """
+    Give each request an id, taken from the REQUEST_ID_HEADER header when the
+    proxy sent a usable one, and tag its log records and response with it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = settings.REQUEST_ID_HEADER
+        self.meta_key = "HTTP_" + self.header.upper().replace("-", "_")
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = logs.bind_request_id(self._request_id(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            logs.unbind_request_id(token)
+        response[self.header] = request.request_id
+        return response
+
+    async def __acall__(self, request):
+        token = logs.bind_request_id(self._request_id(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            logs.unbind_request_id(token)
+        response[self.header] = request.request_id
+        return response
+
+    def _request_id(self, request) -> str:
+        request_id = request.META.get(self.meta_key)
+        if not logs.valid_request_id(request_id):
+            request_id = uuid7().hex
+        request.request_id = request_id
+        return request_id
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route catalog reads to read replicas, keeping a client on the primary
+    for a short window after it writes so it reads its own writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        with replica_routing(pinned=self._pinned(request)) as state:
+            response = self.get_response(request)
+        return self._finish(response, state)
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        with replica_routing(pinned=self._pinned(request)) as state:
+            response = await self.get_response(request)
+        return self._finish(response, state)
+
+    def _pinned(self, request) -> bool:
+        return request.method not in SAFE_METHODS or self._sticky(request)
+
+    @staticmethod
+    def _finish(response, state):
+        if state.wrote:
+            window = settings.DATABASE_REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                f"{time.time() + window:.3f}",
+                max_age=window,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    @staticmethod
+    def _sticky(request) -> bool:
+        try:
+            return float(request.COOKIES.get(PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+
+class RequestTimingMiddleware:
+    """
+    Report each request's total, database and render time in a
+    Server-Timing header and the ``shared.timing`` log (see shared/timing).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Django would otherwise run the sync hook in a worker thread
+            self.process_template_response = self._aprocess_template_response
+        timing.install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        request_timing, token = timing.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            timing.stop(token)
+        timing.finish(request, response, request_timing)
+        return response
+
+    async def __acall__(self, request):
+        request_timing, token = timing.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing.stop(token)
+        timing.finish(request, response, request_timing)
+        return response
+
+    def process_template_response(self, request, response):
+        return self._time_render(response)
+
+    async def _aprocess_template_response(self, request, response):
+        return self._time_render(response)
+
+    @staticmethod
+    def _time_render(response):
+        # DRF responses render after the view returns; time that separately
+        request_timing = timing.current()
+        if request_timing is not None:
+            request_timing.start_render()
+            response.add_post_render_callback(request_timing.end_render)
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses with brotli or gzip, whichever the client
+    prefers (see shared/compression).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.COMPRESSION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return compression.compress_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return compression.compress_response(request, await self.get_response(request))
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """WhiteNoise's middleware, able to pass async requests straight through."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Looks on disk, so keep it off the event loop
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:31
+
+from django.db import migrations, models
+import shared.ids
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.UUIDField(default=shared.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sql', models.TextField()),
+                ('params', models.TextField(blank=True)),
+                ('duration_ms', models.FloatField()),
+                ('database', models.CharField(max_length=100)),
+                ('route', models.CharField(blank=True, max_length=255)),
+                ('view', models.CharField(blank=True, max_length=255)),
+                ('stack', models.TextField(blank=True)),
+                ('plan', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
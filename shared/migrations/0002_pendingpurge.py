@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:45
+
+from django.db import migrations, models
+import shared.ids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingPurge',
+            fields=[
+                ('id', models.UUIDField(default=shared.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
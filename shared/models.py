@@ -1,19 +1,53 @@
 from __future__ import annotations
 
-import uuid
-
 from django.db import models
 
+from shared.ids import uuid7
+
 
 class BaseModel(models.Model):
     """
     Abstract base model providing UUID primary key and timestamps.
     All models should inherit from this.
+
+    New ids are time-ordered UUIDv7s, so inserts append to the primary key
+    index. Rows created before the switch keep their random UUIDv4 ids, which
+    is why ordering still uses `created_at`.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
+
+
+class SlowQuery(BaseModel):
+    """A query that took longer than SLOW_QUERY_MS (see shared.slowqueries)."""
+
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    duration_ms = models.FloatField()
+    database = models.CharField(max_length=100)
+    route = models.CharField(max_length=255, blank=True)
+    view = models.CharField(max_length=255, blank=True)
+    stack = models.TextField(blank=True)
+    # EXPLAIN QUERY PLAN output, for the sampled fraction of slow queries
+    plan = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self) -> str:
+        return f"{self.duration_ms:.0f} ms: {self.sql[:80]}"
+
+
+class PendingPurge(BaseModel):
+    """A surrogate key to purge from the CDN (see shared.httpcache)."""
+
+    key = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        ordering = ["created_at"]
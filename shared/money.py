@@ -0,0 +1,50 @@
+"""
+Integer minor-unit (cents) money helpers.
+
+Prices are stored in the database as two-place decimals, but hot paths (the
+cart, order totals, rate quotes) do their arithmetic on plain ``int`` cents
+and only convert to ``Decimal`` or a string at the edges.
+"""
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal
+
+CENTS_PER_UNIT = 100
+
+# Tax rates are stored with five decimal places (e.g. 0.08875) and applied as
+# integers scaled by this factor.
+RATE_SCALE = 100_000
+
+
+def to_cents(value: Decimal | str | int) -> int:
+    """Convert a decimal amount (e.g. Decimal("19.99") or "19.99") to cents."""
+    if isinstance(value, int):
+        return value * CENTS_PER_UNIT
+    amount = Decimal(value) * CENTS_PER_UNIT
+    return int(amount.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Convert cents to a two-place Decimal (e.g. 1999 -> Decimal("19.99"))."""
+    return Decimal(cents).scaleb(-2)
+
+
+def format_cents(cents: int) -> str:
+    """Format cents as a decimal string (e.g. 1999 -> "19.99") without Decimal."""
+    sign = "-" if cents < 0 else ""
+    units, fraction = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"{sign}{units}.{fraction:02d}"
+
+
+def to_scaled_rate(rate: Decimal | str) -> int:
+    """Convert a fractional rate (e.g. Decimal("0.08875")) to an integer of RATE_SCALE."""
+    scaled = Decimal(rate) * RATE_SCALE
+    return int(scaled.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def apply_rate(cents: int, scaled_rate: int) -> int:
+    """Return `cents` multiplied by a scaled rate, rounded half up to the cent."""
+    product = cents * scaled_rate
+    if product >= 0:
+        return (product + RATE_SCALE // 2) // RATE_SCALE
+    return -((-product + RATE_SCALE // 2) // RATE_SCALE)
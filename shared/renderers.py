@@ -0,0 +1,54 @@
+"""
+DRF renderers.
+
+`JSONRenderer` is DRF's, but encodes with orjson when it is installed.
+"""
+from __future__ import annotations
+
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None
+
+# Datetimes go through DRF's encoder, which trims them to milliseconds and
+# writes UTC as "Z"; dataclasses aren't JSON to DRF either
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson else 0
+)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF's JSONRenderer, using orjson for compact UTF-8 output.
+
+    The bytes are the same as DRF's: orjson encodes str, int, float, list,
+    dict and UUID itself and hands everything else (Decimal, datetime, lazy
+    strings, querysets) to DRF's encoder. Anything orjson refuses, such as
+    integers beyond 64 bits or non-string keys, is rendered by DRF. The
+    exceptions are floats Python writes with an exponent (orjson writes
+    ``1e16`` for ``1e+16``) and NaN or infinity, which orjson renders as
+    null where DRF raises. Indented output (the browsable API) is left to
+    DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped by DRF as they end a line in JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
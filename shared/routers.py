@@ -0,0 +1,78 @@
+"""
+Read/write routing for SQLite read replicas.
+
+Reads of models in ``settings.DATABASE_REPLICA_APPS`` (the catalog, by
+default) go to a random alias from ``settings.DATABASE_REPLICAS``; every
+other read and all writes go to ``default``.
+
+Routing only happens inside requests handled by `ReplicaRoutingMiddleware`.
+A request is pinned to the primary when it isn't a safe method, when the
+client wrote replicated data within the last
+``DATABASE_REPLICA_STICKY_SECONDS`` (so users read their own writes while
+replicas catch up) or once it writes replicated data itself. Management
+commands, shells and tests always use the primary.
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@dataclass
+class RoutingState:
+    pinned: bool
+    wrote: bool = False
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("db_routing", default=None)
+
+
+@contextmanager
+def replica_routing(*, pinned: bool = False) -> Iterator[RoutingState]:
+    """Allow replica reads for the duration of the block (one request)."""
+    state = RoutingState(pinned=pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def is_replicated(model) -> bool:
+    return model._meta.app_label in settings.DATABASE_REPLICA_APPS
+
+
+class ReplicaRouter:
+    """Send replicated reads to replicas and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        state = _state.get()
+        if not replicas or state is None or state.pinned or not is_replicated(model):
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see its uncommitted writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and is_replicated(model):
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        return db == DEFAULT_DB_ALIAS
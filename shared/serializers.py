@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from shared.money import format_cents
+
+
+class CentsField(serializers.ReadOnlyField):
+    """
+    Read-only field for integer cents, rendered as a two-place decimal string
+    (the same output as ``DecimalField(max_digits=10, decimal_places=2)``).
+    """
+
+    def to_representation(self, value: int) -> str:
+        return format_cents(value)
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin taking a ``fields`` argument: only those fields are
+    serialized, in their declared order.
+
+    ``Meta.field_columns`` maps fields computed in Python (properties) to the
+    model fields they read, so `narrow_queryset()` can load only those.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        self.sparse_fields = frozenset(fields) if fields is not None else None
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.sparse_fields is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in self.sparse_fields}
+
+    @classmethod
+    def narrow_queryset(cls, queryset, fields):
+        """
+        Load only what `fields` read: their columns with ``only()``, and
+        just the relations they use with ``select_related()`` and
+        ``prefetch_related()``.
+        """
+        columns, select, prefetch = _plan(cls, queryset.model, frozenset(fields))
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*columns) if columns is not None else queryset
+
+
+@lru_cache(maxsize=256)
+def _plan(serializer_class, model, fields: frozenset[str]):
+    """Return (columns or None if unknown, relations to join, relations to prefetch)."""
+    declared = serializer_class().fields
+    field_columns = getattr(serializer_class.Meta, "field_columns", {})
+    columns: set[str] = set()
+    complete = True
+    select: set[str] = set()
+    prefetch: set[str] = set()
+
+    for name in fields:
+        field = declared[name]
+        paths = field_columns.get(name) or [field.source.replace(".", "__")]
+        for path in paths:
+            relation, _, rest = path.partition("__")
+            try:
+                model_field = model._meta.get_field(relation)
+            except FieldDoesNotExist:
+                # Computed without a field_columns entry: load every column
+                complete = False
+                continue
+            if model_field.one_to_many or model_field.many_to_many:
+                prefetch.add(relation)
+                continue
+            if model_field.is_relation and (rest or isinstance(field, serializers.BaseSerializer)):
+                select.add(relation)
+            columns.add(path)
+    return (
+        tuple(sorted(columns)) if complete else None,
+        tuple(sorted(select)),
+        tuple(sorted(prefetch)),
+    )
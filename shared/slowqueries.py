@@ -0,0 +1,163 @@
+"""
+Slow query log.
+
+Every connection carries `log_slow_query` as an execute wrapper. A query
+slower than ``settings.SLOW_QUERY_MS`` is logged to ``shared.slowqueries``
+with the route and view that ran it and the application frames that led to
+it (outside middleware), and saved as a `SlowQuery`. A random ``SLOW_QUERY_EXPLAIN_RATE`` fraction
+of them also stores the query plan.
+
+Only the newest ``SLOW_QUERY_LOG_SIZE`` rows are kept, so the table is a
+ring buffer shared by all workers. Browse it in the admin or with
+``manage.py slow_queries``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import time
+import traceback
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.db.backends.signals import connection_created
+
+from . import timing
+
+logger = logging.getLogger("shared.slowqueries")
+
+STACK_FRAMES = 6
+
+# Frames that every request passes through, which say nothing about the query
+_SKIPPED_FILES = (__file__, os.path.join(os.path.dirname(__file__), "middleware.py"))
+
+# Set while recording, so the log's own queries (and plans) aren't logged
+_recording: ContextVar[bool] = ContextVar("recording_slow_query", default=False)
+
+
+def log_slow_query(execute, sql, params, many, context):
+    """Execute wrapper recording queries slower than SLOW_QUERY_MS."""
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started) * 1000
+    threshold = settings.SLOW_QUERY_MS
+    if threshold and duration_ms >= threshold and not _recording.get():
+        record(sql, params, many, duration_ms, context["connection"])
+    return result
+
+
+def record(sql: str, params, many: bool, duration_ms: float, connection) -> None:
+    from .models import SlowQuery
+
+    token = _recording.set(True)
+    try:
+        request_timing = timing.current()
+        request = request_timing.request if request_timing is not None else None
+        match = getattr(request, "resolver_match", None)
+        entry = SlowQuery(
+            sql=sql,
+            params=repr(params)[:2000],
+            duration_ms=round(duration_ms, 3),
+            database=connection.alias,
+            route=timing.route_name(request) if request is not None else "",
+            # The view's dotted path; generic views run queries in DRF code
+            view=match._func_path if match is not None else "",
+            stack=stack_summary(),
+        )
+        if not many and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE:
+            entry.plan = explain(connection, sql, params)
+
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            duration_ms,
+            entry.route or "no request",
+            sql[:500],
+            extra={
+                "duration_ms": entry.duration_ms,
+                "database": entry.database,
+                "route": entry.route,
+                "view": entry.view,
+                "stack": entry.stack,
+            },
+        )
+        # Save once the query's transaction commits; right away in autocommit
+        transaction.on_commit(lambda: save(entry), using=connection.alias)
+    finally:
+        _recording.reset(token)
+
+
+def stack_summary() -> str:
+    """Return the innermost application frames that led here, outermost first."""
+    root = str(settings.BASE_DIR) + os.sep
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(root)
+        and "site-packages" not in frame.filename
+        and frame.filename not in _SKIPPED_FILES
+    ]
+    return "\n".join(
+        f"{frame.filename.removeprefix(root)}:{frame.lineno} in {frame.name}"
+        for frame in frames[-STACK_FRAMES:]
+    )
+
+
+def explain(connection, sql: str, params) -> str:
+    """Return the query plan for a SELECT, or "" if there isn't one."""
+    if not sql.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+        return ""
+    # A raw cursor, so the EXPLAIN skips the execute wrappers
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+        rows = cursor.fetchall()
+    except connection.Database.Error:
+        logger.debug("Could not explain %s", sql, exc_info=True)
+        return ""
+    finally:
+        cursor.close()
+    return format_plan(rows)
+
+
+def format_plan(rows) -> str:
+    # SQLite returns (id, parent, notused, detail) rows; indent children
+    if rows and len(rows[0]) == 4 and isinstance(rows[0][0], int):
+        depth: dict[int, int] = {}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node] + str(detail))
+        return "\n".join(lines)
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+def save(entry) -> None:
+    """Save `entry` and drop the oldest rows beyond SLOW_QUERY_LOG_SIZE."""
+    from .models import SlowQuery
+
+    token = _recording.set(True)
+    try:
+        entry.save(using=DEFAULT_DB_ALIAS)
+        entries = SlowQuery.objects.using(DEFAULT_DB_ALIAS)
+        size = settings.SLOW_QUERY_LOG_SIZE
+        # UUIDv7 ids sort by creation time
+        oldest_kept = list(entries.order_by("-id").values_list("id", flat=True)[size - 1:size])
+        if oldest_kept:
+            entries.filter(id__lt=oldest_kept[0]).delete()
+    except DatabaseError:
+        logger.warning("Could not save a slow query", exc_info=True)
+    finally:
+        _recording.reset(token)
+
+
+def _install(connection, **kwargs) -> None:
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_query)
+
+
+def install() -> None:
+    """Watch queries on every connection, including ones already open."""
+    connection_created.connect(_install, dispatch_uid="shared.slowqueries")
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
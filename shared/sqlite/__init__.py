@@ -0,0 +1,45 @@
+"""
+SQLite connection tuning.
+
+Out of the box SQLite uses a rollback journal that is fsynced on every
+commit, and a transaction that reads before it writes fails with "database
+is locked" (without waiting) when another connection got the write lock
+first. This package is a thin database backend over Django's SQLite one
+(``ENGINE: "shared.sqlite"``) that takes two extra ``OPTIONS``:
+
+* ``pragmas``: PRAGMAs run on every new connection, e.g. WAL,
+  ``synchronous=NORMAL``, ``busy_timeout`` and larger caches;
+* ``transaction_mode``: ``DEFERRED`` (SQLite's default), ``IMMEDIATE`` or
+  ``EXCLUSIVE``. With ``IMMEDIATE``, ``atomic()`` blocks take the write
+  lock up front, so concurrent writers wait for ``busy_timeout`` instead
+  of failing.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+
+PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+
+def pragma_statements(pragmas: Mapping[str, Any]) -> list[str]:
+    """Return the PRAGMA statements for `pragmas`, skipping empty values."""
+    statements = []
+    for name, value in pragmas.items():
+        if value is None or value == "":
+            continue
+        if not PRAGMA_VALUE.match(name) or not PRAGMA_VALUE.match(str(value)):
+            raise ImproperlyConfigured(f"Invalid SQLite PRAGMA {name}={value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_pragmas(conn, pragmas: Mapping[str, Any]) -> None:
+    """Run the PRAGMA statements for `pragmas` on a sqlite3 connection or cursor."""
+    for statement in pragma_statements(pragmas):
+        conn.execute(statement)
@@ -0,0 +1,104 @@
+"""
+Tests for the cached JWT authentication.
+"""
+from __future__ import annotations
+
+import pytest
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from shared.authentication import CachedJWTAuthentication, user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(email="cached@example.com", password="x", first_name="Ada")
+
+
+def authenticate(user):
+    return CachedJWTAuthentication().get_user(AccessToken.for_user(user))
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def test_cached_between_requests(self, user, django_assert_num_queries):
+        """Test the user is read from the database once, then from the cache."""
+        with django_assert_num_queries(1):
+            first = authenticate(user)
+        with django_assert_num_queries(0):
+            second = authenticate(user)
+
+        assert first == second == user
+        assert first is not second
+
+    def test_loads_only_user_fields(self, user):
+        """Test cached users skip the columns authentication doesn't use."""
+        assert "last_login" in authenticate(user).get_deferred_fields()
+
+    def test_invalidated_on_save(self, user):
+        """Test a saved user, such as after a password change, is reloaded."""
+        authenticate(user)
+
+        user.first_name = "Grace"
+        user.set_password("changed")
+        user.save()
+
+        cached = authenticate(user)
+        assert cached.first_name == "Grace"
+        assert cached.check_password("changed")
+
+    def test_deactivated_users_are_rejected(self, user):
+        """Test a user deactivated since being cached can't authenticate."""
+        authenticate(user)
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(user)
+
+    def test_deleted_users_are_rejected(self, user):
+        """Test a deleted user is dropped from the cache."""
+        token = AccessToken.for_user(user)
+        authenticate(user)
+        user.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            CachedJWTAuthentication().get_user(token)
+
+    def test_bounded(self, user, settings, django_assert_num_queries):
+        """Test the least recently used user is evicted past AUTH_USER_CACHE_SIZE."""
+        settings.AUTH_USER_CACHE_SIZE = 1
+        other = User.objects.create_user(email="other@example.com", password="x")
+        authenticate(user)
+        authenticate(other)
+
+        with django_assert_num_queries(1):
+            authenticate(user)
+
+    def test_disabled_without_ttl(self, user, settings, django_assert_num_queries):
+        """Test AUTH_USER_CACHE_TTL=0 reads the user on every request."""
+        settings.AUTH_USER_CACHE_TTL = 0
+        authenticate(user)
+
+        with django_assert_num_queries(1):
+            authenticate(user)
+
+    def test_current_user_view(self, user, django_assert_num_queries):
+        """Test /me/ makes no queries once the user is cached."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        client.get("/api/accounts/me/")
+
+        with django_assert_num_queries(0):
+            response = client.get("/api/accounts/me/")
+
+        assert response.json()["first_name"] == "Ada"
@@ -0,0 +1,40 @@
+"""Tests for the endpoint benchmark helpers."""
+from __future__ import annotations
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from shared.benchmarking import compare, percentile, summarize
+from shared.management.commands.benchmark_endpoints import SCENARIOS, uncovered_endpoints
+
+
+def test_every_endpoint_has_a_scenario() -> None:
+    """New endpoints in products, orders or accounts need a benchmark scenario."""
+    assert uncovered_endpoints(SCENARIOS) == []
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    """percentile returns the nearest-rank value."""
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 95) == 7.0
+    assert summarize([3.0, 1.0, 2.0])["p50_ms"] == 2.0
+
+
+def test_compare_reports_regressions() -> None:
+    """compare flags latency, query, size and error regressions past the thresholds."""
+    baseline = {"list": {"p95_ms": 10.0, "queries": 2, "bytes": 1000, "errors": 0}}
+    within = {"list": {"p95_ms": 11.0, "queries": 2, "bytes": 1050, "errors": 0}}
+    worse = {"list": {"p95_ms": 20.0, "queries": 3, "bytes": 2000, "errors": 1}}
+    options = {"latency_threshold": 0.2, "query_allowance": 0, "bytes_threshold": 0.1}
+
+    assert compare(within, baseline, **options) == []
+    assert len(compare(worse, baseline, **options)) == 4
+
+
+def test_requests_must_be_positive() -> None:
+    """benchmark_endpoints refuses --requests 0 before building a dataset."""
+    with pytest.raises(CommandError, match="--requests"):
+        call_command("benchmark_endpoints", requests=0)
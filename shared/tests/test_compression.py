@@ -0,0 +1,162 @@
+"""
+Tests for response compression.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from products.models import Category, Product
+from shared import compression
+
+
+@pytest.fixture
+def products(db):
+    """Create enough products for a list page worth compressing."""
+    category = Category.objects.create(name="Luxury", slug="luxury")
+    return Product.objects.bulk_create(
+        Product(
+            name=f"Watch {number}", slug=f"watch-{number}", sku=f"W-{number}",
+            description="A fine watch", price="199.00", category=category,
+        )
+        for number in range(20)
+    )
+
+
+def gzip_request(accept_encoding: str = "gzip"):
+    return RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+
+
+def json_response(size: int) -> HttpResponse:
+    return HttpResponse(b'"' + b"a" * size + b'"', content_type="application/json")
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate", "gzip"),
+        ("x-gzip", "gzip"),
+        ("deflate", None),
+        ("", None),
+        ("gzip;q=0", None),
+        ("*", "br" if compression.brotli else "gzip"),
+        ("*, gzip;q=0", "br" if compression.brotli else None),
+        ("gzip;q=0.5, br;q=1", "br" if compression.brotli else "gzip"),
+        ("gzip;q=1, br;q=0.5", "gzip"),
+    ])
+    def test_negotiate(self, header, expected):
+        """Test the encoding follows the client's weights, brotli first on ties."""
+        assert compression.negotiate(header) == expected
+
+
+class TestCompressResponse:
+    def test_compresses_large_json(self):
+        """Test JSON above the threshold is gzipped and marked as such."""
+        response = compression.compress_response(gzip_request(), json_response(4000))
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert int(response["Content-Length"]) == len(response.content)
+        assert gzip.decompress(response.content) == b'"' + b"a" * 4000 + b'"'
+
+    def test_skips_small_bodies(self, settings):
+        """Test bodies under COMPRESSION_MIN_SIZE are sent as they are."""
+        settings.COMPRESSION_MIN_SIZE = 1024
+
+        response = compression.compress_response(gzip_request(), json_response(100))
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_skips_other_content_types(self):
+        """Test HTML and other types not in COMPRESSION_TYPES are left alone."""
+        response = HttpResponse(b"<p>" * 2000, content_type="text/html")
+
+        assert not compression.compress_response(gzip_request(), response).has_header("Content-Encoding")
+
+    def test_varies_without_compressing_for_identity_clients(self):
+        """Test clients without gzip get the plain body and a Vary header."""
+        response = compression.compress_response(gzip_request("identity"), json_response(4000))
+
+        assert not response.has_header("Content-Encoding")
+        assert response["Vary"] == "Accept-Encoding"
+
+    def test_weakens_etags(self):
+        """Test a strong ETag becomes weak once the body is compressed."""
+        response = json_response(4000)
+        response["ETag"] = '"abc"'
+
+        assert compression.compress_response(gzip_request(), response)["ETag"] == 'W/"abc"'
+
+    def test_compresses_streams(self):
+        """Test streaming responses are compressed as they are read."""
+        response = StreamingHttpResponse(
+            (f"{number},watch\n" for number in range(1000)), content_type="text/csv"
+        )
+
+        response = compression.compress_response(gzip_request(), response)
+
+        assert response["Content-Encoding"] == "gzip"
+        body = gzip.decompress(b"".join(response.streaming_content)).decode()
+        assert body.splitlines()[-1] == "999,watch"
+
+    def test_compresses_async_streams(self):
+        """Test async streaming responses are compressed too."""
+        async def rows():
+            for number in range(1000):
+                yield f"{number},watch\n"
+
+        response = compression.compress_response(
+            gzip_request(), StreamingHttpResponse(rows(), content_type="text/csv")
+        )
+
+        async def read():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        assert gzip.decompress(asyncio.run(read())).decode().startswith("0,watch\n1,watch\n")
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    def test_product_list_is_compressed(self, products):
+        """Test API pages are gzipped and decode to the same JSON."""
+        client = APIClient()
+        plain = client.get(reverse("products:product-list"))
+
+        response = client.get(reverse("products:product-list"), HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert len(response.content) < len(plain.content) / 3
+        assert json.loads(gzip.decompress(response.content)) == plain.json()
+
+    def test_etag_revalidates_compressed_responses(self, products):
+        """Test the weak ETag of a compressed page gets a 304 on revalidation."""
+        client = APIClient()
+        response = client.get(reverse("products:product-list"), HTTP_ACCEPT_ENCODING="gzip")
+
+        revalidated = client.get(
+            reverse("products:product-list"),
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+
+        assert response["ETag"].startswith('W/"')
+        assert revalidated.status_code == 304
+
+    def test_export_is_compressed(self, products):
+        """Test streaming exports are gzipped."""
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(email="admin@example.com", password="x", is_staff=True)
+        )
+
+        response = client.get(reverse("products:product-export"), HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert "Watch 19" in gzip.decompress(b"".join(response.streaming_content)).decode()
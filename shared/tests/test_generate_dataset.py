@@ -0,0 +1,89 @@
+"""Tests for the generate_dataset management command."""
+from __future__ import annotations
+
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from accounts.models import User
+from orders.models import Order, OrderItem
+from products.models import Product
+
+
+def generate(label: str = "test", seed: int = 7, *args: str) -> str:
+    out = io.StringIO()
+    call_command(
+        "generate_dataset",
+        "--users", "5",
+        "--products", "30",
+        "--orders", "20",
+        "--batch-size", "8",
+        "--seed", str(seed),
+        "--label", label,
+        *args,
+        stdout=out,
+    )
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_generate_dataset_creates_rows() -> None:
+    """generate_dataset bulk-inserts users, products, orders and items."""
+    output = generate()
+
+    assert User.objects.count() == 5
+    assert Product.objects.count() == 30
+    assert Order.objects.count() == 20
+    assert OrderItem.objects.count() >= 20
+    assert "rows/s" in output
+
+
+@pytest.mark.django_db
+def test_generate_dataset_totals_match_items() -> None:
+    """Generated order totals add up from their items."""
+    generate()
+
+    for order in Order.objects.prefetch_related("items"):
+        subtotal = sum(item.line_total for item in order.items.all())
+        assert order.subtotal == subtotal
+        assert order.total == order.subtotal + order.shipping_cost + order.tax
+
+
+@pytest.mark.django_db
+def test_generate_dataset_is_deterministic() -> None:
+    """The same seed produces the same data under a different label."""
+    generate(label="first")
+    generate(label="second")
+
+    def prices(label: str) -> list[Decimal]:
+        products = Product.objects.filter(sku__startswith=label.upper()).order_by("sku")
+        return list(products.values_list("price", flat=True))
+
+    assert prices("first") == prices("second")
+
+
+@pytest.mark.django_db
+def test_generate_dataset_until_fixes_timestamps() -> None:
+    """--until anchors created_at, so runs made at different times match."""
+    generate("first", 7, "--until", "2026-01-01")
+    generate("second", 7, "--until", "2026-01-01T00:00:00+00:00")
+
+    def created(label: str) -> list[datetime]:
+        products = Product.objects.filter(sku__startswith=label.upper()).order_by("sku")
+        return list(products.values_list("created_at", flat=True))
+
+    assert created("first") == created("second")
+    assert max(created("first")) < datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.django_db
+def test_generate_dataset_refuses_existing_label() -> None:
+    """Re-using a label fails instead of violating unique constraints."""
+    generate()
+
+    with pytest.raises(CommandError):
+        generate()
@@ -0,0 +1,96 @@
+"""
+Tests for HTTP cache headers and surrogate key purges.
+"""
+from __future__ import annotations
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from shared import httpcache
+from shared.models import PendingPurge
+
+POLICY = httpcache.CachePolicy(max_age=60, shared_max_age=3600, stale_while_revalidate=30)
+
+
+@pytest.fixture
+def receiver():
+    """Connect a purge receiver and return the batches of keys it gets."""
+    batches = []
+
+    def purge(sender, keys, **kwargs):
+        batches.append(keys)
+
+    httpcache.purge_requested.connect(purge)
+    yield batches
+    httpcache.purge_requested.disconnect(purge)
+
+
+class TestApply:
+    def test_public_for_anonymous_requests(self):
+        """Test anonymous GETs get the policy, Vary and surrogate keys."""
+        response = HttpResponse()
+
+        httpcache.apply(POLICY, RequestFactory().get("/"), response, ["b", "a", "a"])
+
+        directives = {value.strip() for value in response["Cache-Control"].split(",")}
+        assert directives == {"public", "max-age=60", "s-maxage=3600", "stale-while-revalidate=30"}
+        assert response["Vary"] == "Accept"
+        assert response["Surrogate-Key"] == "a b"
+
+    def test_private_for_signed_in_requests(self):
+        """Test requests with credentials aren't stored by shared caches."""
+        response = HttpResponse()
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION="Bearer token")
+
+        httpcache.apply(POLICY, request, response)
+
+        assert "private" in response["Cache-Control"]
+        assert "public" not in response["Cache-Control"]
+
+    @pytest.mark.parametrize("method, status", [("post", 200), ("get", 404), ("get", 500)])
+    def test_skips_writes_and_errors(self, method, status):
+        """Test only successful GETs are made cacheable."""
+        response = HttpResponse(status=status)
+
+        httpcache.apply(POLICY, getattr(RequestFactory(), method)("/"), response)
+
+        assert not response.has_header("Cache-Control")
+
+
+@pytest.mark.django_db
+class TestPurge:
+    def test_records_keys_on_commit(self, django_capture_on_commit_callbacks):
+        """Test keys are recorded once the transaction commits, without duplicates."""
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            httpcache.purge(["product:1", "products"])
+            httpcache.purge(["products"])
+            assert not PendingPurge.objects.exists()
+
+        assert len(callbacks) == 2
+        assert sorted(PendingPurge.objects.values_list("key", flat=True)) == ["product:1", "products"]
+
+    def test_send_purges(self, receiver):
+        """Test recorded keys go to the receivers and are then forgotten."""
+        httpcache.record(["a", "b", "c"])
+
+        assert sorted(httpcache.send_purges(limit=2) + httpcache.send_purges(limit=2)) == ["a", "b", "c"]
+        assert len(receiver) == 2
+        assert not PendingPurge.objects.exists()
+
+    def test_keeps_keys_without_receivers(self):
+        """Test keys wait until something can purge them."""
+        httpcache.record(["a"])
+
+        assert httpcache.send_purges() == []
+        assert PendingPurge.objects.count() == 1
+
+    def test_command(self, receiver, capsys):
+        """Test purge_cache records --key values and sends everything."""
+        httpcache.record(["products"])
+
+        call_command("purge_cache", "--key", "catalog")
+
+        assert sorted(receiver[0]) == ["catalog", "products"]
+        assert "Purged 2 keys." in capsys.readouterr().out
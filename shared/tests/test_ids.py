@@ -0,0 +1,38 @@
+"""Tests for UUIDv7 generation."""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from shared.ids import uuid7, uuid7_floor, uuid7_timestamp
+
+
+def test_uuid7_sets_version_and_variant() -> None:
+    """uuid7 returns RFC 9562 version 7 UUIDs."""
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_is_monotonic() -> None:
+    """Ids generated in sequence sort in generation order."""
+    values = [uuid7() for _ in range(10_000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_embeds_current_time() -> None:
+    """The embedded timestamp is the generation time in milliseconds."""
+    before = time.time()
+    value = uuid7()
+
+    assert before - 0.001 <= uuid7_timestamp(value) <= time.time() + 0.001
+
+
+def test_uuid7_floor_bounds_later_ids() -> None:
+    """uuid7_floor gives a lower bound usable for id range scans."""
+    floor = uuid7_floor(datetime.now(timezone.utc))
+
+    assert uuid7() >= floor
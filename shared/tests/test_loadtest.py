@@ -0,0 +1,53 @@
+"""Tests for the browse-to-checkout load generator."""
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from orders.models import Order
+from products.models import Category, Product
+from shared.loadtest import STEPS, ClientDriver, Sample, VirtualUser, report
+
+
+@pytest.fixture
+def product(db) -> Product:
+    category = Category.objects.create(name="Sport", slug="sport")
+    return Product.objects.create(
+        name="Casio Diver",
+        slug="casio-diver",
+        description="A diver watch.",
+        price=Decimal("120.00"),
+        category=category,
+        stock_quantity=10,
+    )
+
+
+def test_journey_runs_every_step_through_checkout(product: Product) -> None:
+    """A virtual user browses, fills a cart and places an order."""
+    user = VirtualUser(ClientDriver(), random.Random(1), think_time=0)
+
+    user.journey()
+
+    assert [sample.step for sample in user.samples] == list(STEPS)
+    assert all(sample.ok for sample in user.samples)
+    assert Order.objects.get().items.get().quantity == 2
+
+
+def test_report_counts_errors_and_throughput() -> None:
+    """report gives per-step totals, error rates and successful requests per second."""
+    samples = [
+        Sample("checkout", 10.0, True),
+        Sample("checkout", 20.0, True),
+        Sample("checkout", 30.0, False),
+        Sample("checkout", 40.0, True),
+    ]
+
+    results = report(samples, elapsed=2.0)
+
+    assert results["checkout"]["requests"] == 4
+    assert results["checkout"]["error_rate"] == 0.25
+    assert results["checkout"]["throughput"] == 1.5
+    assert results["checkout"]["p50_ms"] == 20.0
+    assert results["list"]["requests"] == 0
@@ -0,0 +1,188 @@
+"""
+Tests for structured logging and request ids.
+"""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from shared import logs, metrics
+
+
+@pytest.fixture
+def stream():
+    return io.StringIO()
+
+
+@pytest.fixture
+def handler(stream):
+    handler = logs.QueueLogHandler(stream)
+    handler.setFormatter(logs.JsonFormatter())
+    handler.addFilter(logs.RequestIdFilter())
+    yield handler
+    handler.close()
+
+
+@pytest.fixture
+def logger(handler):
+    logger = logging.getLogger("tests.logs")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.removeHandler(handler)
+
+
+def written(handler, stream) -> list[dict]:
+    handler.flush()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "message", (), None)
+
+
+class TestQueueLogHandler:
+    def test_writes_json_lines(self, logger, handler, stream):
+        """Test records are written as JSON with their extra fields."""
+        logger.info("Order %s placed", "A-1", extra={"total_cents": 1999})
+
+        [entry] = written(handler, stream)
+        assert entry["message"] == "Order A-1 placed"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "tests.logs"
+        assert entry["request_id"] == "-"
+        assert entry["total_cents"] == 1999
+
+    def test_includes_the_traceback(self, logger, handler, stream):
+        """Test exceptions are rendered before the record is queued."""
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            logger.exception("Failed")
+
+        [entry] = written(handler, stream)
+        assert "ValueError: bad" in entry["exception"]
+
+    def test_tags_records_with_the_request_id(self, logger, handler, stream):
+        """Test records logged during a request carry its id."""
+        token = logs.bind_request_id("abc123")
+        try:
+            logger.info("inside")
+        finally:
+            logs.unbind_request_id(token)
+
+        [entry] = written(handler, stream)
+        assert entry["request_id"] == "abc123"
+
+    def test_drops_records_when_the_queue_is_full(self, settings, stream):
+        """Test a full queue drops and counts records instead of blocking."""
+        settings.METRICS_DIR = ""
+        metrics.reset()
+        handler = logs.QueueLogHandler(stream, queue_size=1)
+        handler.listener.stop()
+
+        handler.handle(record("tests.logs"))
+        handler.handle(record("tests.logs"))
+
+        assert handler.queue.qsize() == 1
+        assert "log_records_dropped_total 1.0" in metrics.exposition()
+        handler.close()
+        metrics.reset()
+
+    def test_restarted_in_forked_children(self, handler):
+        """Test a forked child gets its own listener, and closed handlers are forgotten."""
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if handler.listener._thread.is_alive() else 1)
+        _, status = os.waitpid(pid, 0)
+        closed = logs.QueueLogHandler(io.StringIO())
+        closed.close()
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert handler in logs._queue_handlers
+        assert closed not in logs._queue_handlers
+
+
+class TestSamplingFilter:
+    def test_samples_a_logger_and_its_children(self):
+        """Test a rate applies to the named logger and loggers below it."""
+        sampling = logs.SamplingFilter({"shared.timing": 0})
+
+        assert not sampling.filter(record("shared.timing"))
+        assert not sampling.filter(record("shared.timing.detail"))
+        assert sampling.filter(record("shared.timings"))
+        assert sampling.filter(record("orders"))
+
+    def test_keeps_warnings(self):
+        """Test warnings and errors are never sampled away."""
+        sampling = logs.SamplingFilter({"shared": 0})
+
+        assert sampling.filter(record("shared.slowqueries", logging.WARNING))
+        assert sampling.filter(record("shared.timing", logging.ERROR))
+
+    def test_keeps_about_the_rate(self):
+        """Test roughly the configured fraction of records is kept."""
+        sampling = logs.SamplingFilter({"shared.timing": 0.25})
+
+        kept = sum(sampling.filter(record("shared.timing")) for _ in range(4000))
+
+        assert 800 < kept < 1200
+
+
+@pytest.mark.django_db
+class TestRequestIdMiddleware:
+    def test_generates_an_id(self):
+        """Test responses carry a new request id when none was sent."""
+        response = APIClient().get(reverse("products:product-list"))
+
+        assert len(response["X-Request-ID"]) == 32
+
+    def test_keeps_the_proxy_id(self):
+        """Test a valid incoming request id is kept."""
+        response = APIClient().get(
+            reverse("products:product-list"), HTTP_X_REQUEST_ID="edge-42.a"
+        )
+
+        assert response["X-Request-ID"] == "edge-42.a"
+
+    def test_replaces_unsafe_ids(self):
+        """Test ids that could forge log lines are replaced."""
+        response = APIClient().get(
+            reverse("products:product-list"), HTTP_X_REQUEST_ID='x" injected="1'
+        )
+
+        assert response["X-Request-ID"] != 'x" injected="1'
+        assert logs.valid_request_id(response["X-Request-ID"])
+
+    def test_request_logs_carry_the_id(self, handler, stream):
+        """Test the request's timing log line has the response's request id."""
+        timing_logger = logging.getLogger("shared.timing")
+        timing_logger.addHandler(handler)
+        try:
+            response = APIClient().get(reverse("products:product-list"))
+        finally:
+            timing_logger.removeHandler(handler)
+
+        [entry] = written(handler, stream)
+        assert entry["request_id"] == response["X-Request-ID"]
+        assert entry["route"] == "GET /api/products/"
+
+    def test_django_request_logs_carry_the_id(self, handler, stream):
+        """Test the 4xx lines django.request logs after the middleware keep the id."""
+        request_logger = logging.getLogger("django.request")
+        request_logger.addHandler(handler)
+        try:
+            response = APIClient().get("/api/products/00000000-0000-0000-0000-000000000000/")
+        finally:
+            request_logger.removeHandler(handler)
+
+        [entry] = written(handler, stream)
+        assert response.status_code == 404
+        assert entry["logger"] == "django.request"
+        assert entry["request_id"] == response["X-Request-ID"]
@@ -0,0 +1,173 @@
+"""
+Tests for the metrics registry and the Prometheus endpoint.
+"""
+from __future__ import annotations
+
+import threading
+from multiprocessing import get_context
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from shared import metrics
+
+JOBS = metrics.counter("test_jobs_total", "Jobs run", ["queue"])
+WORKERS = metrics.gauge("test_workers", "Busy workers")
+LATENCY = metrics.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+
+@pytest.fixture(autouse=True)
+def fresh_values(settings):
+    settings.METRICS_DIR = ""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def shared_dir(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    metrics.reset()
+    return tmp_path
+
+
+def lines(name: str) -> list[str]:
+    return [line for line in metrics.exposition().splitlines() if line.startswith(name)]
+
+
+def work(count: int) -> None:
+    for _ in range(count):
+        JOBS.labels(queue="default").inc()
+    WORKERS.inc()
+    LATENCY.observe(0.5)
+
+
+class TestMetrics:
+    def test_counter_exposition(self):
+        """Test counters render with HELP, TYPE and one line per label set."""
+        JOBS.labels(queue="default").inc()
+        JOBS.labels(queue="default").inc(2)
+        JOBS.labels(queue='say "hi"').inc()
+
+        text = metrics.exposition()
+
+        assert "# HELP test_jobs_total Jobs run\n# TYPE test_jobs_total counter\n" in text
+        assert 'test_jobs_total{queue="default"} 3.0' in text
+        assert 'test_jobs_total{queue="say \\"hi\\""} 1.0' in text
+
+    def test_gauge_goes_up_and_down(self):
+        """Test gauges can be set, increased and decreased."""
+        WORKERS.set(5)
+        WORKERS.inc()
+        WORKERS.dec(2)
+
+        assert lines("test_workers ") == ["test_workers 4.0"]
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram buckets count observations at or below each bound."""
+        for value in (0.05, 0.1, 0.5, 3.0):
+            LATENCY.observe(value)
+
+        assert lines("test_latency_seconds") == [
+            'test_latency_seconds_bucket{le="0.1"} 2.0',
+            'test_latency_seconds_bucket{le="1.0"} 3.0',
+            'test_latency_seconds_bucket{le="+Inf"} 4.0',
+            "test_latency_seconds_sum 3.65",
+            "test_latency_seconds_count 4.0",
+        ]
+
+    def test_labels_must_match(self):
+        """Test recording with missing or unknown labels fails."""
+        with pytest.raises(ValueError):
+            JOBS.labels(queue="default", extra="x")
+        with pytest.raises(ValueError):
+            JOBS.inc()
+        with pytest.raises(ValueError):
+            JOBS.labels(queue="default").inc(-1)
+
+    def test_reregistering_returns_the_same_metric(self):
+        """Test defining a metric twice is harmless unless it differs."""
+        assert metrics.counter("test_jobs_total", "Jobs run", ["queue"]) is JOBS
+        with pytest.raises(ValueError):
+            metrics.gauge("test_jobs_total", "Jobs run", ["queue"])
+
+    def test_threads_do_not_lose_updates(self):
+        """Test concurrent increments from many threads all count."""
+        threads = [threading.Thread(target=work, args=(1000,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert lines("test_jobs_total") == ['test_jobs_total{queue="default"} 8000.0']
+
+
+class TestSharedDirectory:
+    def test_totals_cover_every_process(self, shared_dir):
+        """Test a scrape adds up the values written by each worker process."""
+        work(10)
+        context = get_context("fork")
+        processes = [context.Process(target=work, args=(100,)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert lines("test_jobs_total") == ['test_jobs_total{queue="default"} 310.0']
+        assert lines("test_workers ") == ["test_workers 4.0"]
+        assert 'test_latency_seconds_count 4.0' in lines("test_latency_seconds_count")
+
+    def test_dead_workers_keep_counters_but_not_gauges(self, shared_dir):
+        """Test mark_process_dead archives counters and drops gauges."""
+        process = get_context("fork").Process(target=work, args=(5,))
+        process.start()
+        process.join()
+
+        metrics.mark_process_dead(process.pid, shared_dir)
+
+        assert not list(shared_dir.glob(f"*_{process.pid}.db"))
+        assert lines("test_jobs_total") == ['test_jobs_total{queue="default"} 5.0']
+        assert lines("test_workers ") == []
+
+    def test_files_grow_past_their_initial_size(self, shared_dir):
+        """Test many label sets fit by growing the mapped file."""
+        for number in range(3000):
+            JOBS.labels(queue=f"queue-{number}").inc()
+
+        assert len(lines("test_jobs_total{")) == 3000
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def test_exposes_request_metrics(self, settings):
+        """Test requests are counted by route and served as text."""
+        settings.METRICS_TOKEN = "secret"
+        client = APIClient()
+        client.get(reverse("products:product-list"))
+
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == metrics.CONTENT_TYPE
+        text = response.content.decode()
+        assert 'http_requests_total{method="GET",route="/api/products/",status="200"} 1.0' in text
+        assert "# TYPE http_request_duration_seconds histogram" in text
+
+    def test_token(self, settings):
+        """Test METRICS_TOKEN must be sent as a bearer token when set."""
+        settings.METRICS_TOKEN = "secret"
+        client = APIClient()
+
+        assert client.get(reverse("metrics")).status_code == 401
+        assert client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+        assert client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+    def test_hidden_without_token(self, settings):
+        """Test /metrics isn't served without METRICS_TOKEN unless DEBUG is on."""
+        settings.METRICS_TOKEN = ""
+        client = APIClient()
+
+        assert client.get(reverse("metrics")).status_code == 404
+        settings.DEBUG = True
+        assert client.get(reverse("metrics")).status_code == 200
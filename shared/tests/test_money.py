@@ -0,0 +1,35 @@
+"""Tests for integer-cents money helpers."""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from shared.money import apply_rate, format_cents, from_cents, to_cents, to_scaled_rate
+
+
+def test_to_cents_accepts_decimals_and_strings() -> None:
+    """to_cents converts decimal amounts to integer cents."""
+    assert to_cents(Decimal("1999.99")) == 199999
+    assert to_cents("0.10") == 10
+    assert to_cents(5) == 500
+
+
+def test_from_cents_round_trips() -> None:
+    """from_cents returns a two-place Decimal."""
+    assert from_cents(199999) == Decimal("1999.99")
+    assert str(from_cents(0)) == "0.00"
+
+
+def test_format_cents_matches_decimal_output() -> None:
+    """format_cents renders the same string as a two-place Decimal."""
+    for cents in (0, 5, 99, 100, 199999, -250):
+        assert format_cents(cents) == str(from_cents(cents))
+
+
+def test_apply_rate_rounds_half_up() -> None:
+    """apply_rate rounds to the nearest cent, halves away from zero."""
+    rate = to_scaled_rate(Decimal("0.08875"))
+
+    assert rate == 8875
+    assert apply_rate(20000, rate) == 1775
+    assert apply_rate(1, to_scaled_rate("0.5")) == 1
+    assert apply_rate(-1, to_scaled_rate("0.5")) == -1
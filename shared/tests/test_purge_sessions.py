@@ -0,0 +1,59 @@
+"""
+Tests for the purge_sessions management command.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+
+def create_sessions(count: int, expire_in: timedelta) -> None:
+    expire_date = timezone.now() + expire_in
+    Session.objects.bulk_create(
+        Session(session_key=f"{expire_in.days}-{number}", session_data="", expire_date=expire_date)
+        for number in range(count)
+    )
+
+
+@pytest.mark.django_db
+class TestPurgeSessions:
+    def test_deletes_expired_sessions_in_batches(self, capsys):
+        """Test only expired sessions are deleted, a batch at a time."""
+        create_sessions(5, timedelta(days=-1))
+        create_sessions(2, timedelta(days=1))
+
+        call_command("purge_sessions", "--batch", "2", "--pause", "0")
+
+        assert Session.objects.count() == 2
+        assert not Session.objects.filter(expire_date__lt=timezone.now()).exists()
+        out = capsys.readouterr().out
+        assert "Deleted 2/5 sessions." in out
+        assert "Deleted 5 expired sessions." in out
+
+    def test_analyze(self, capsys):
+        """Test --analyze updates the session table's statistics."""
+        call_command("purge_sessions", "--analyze")
+
+        assert "Analyzed django_session." in capsys.readouterr().out
+
+    def test_requires_database_sessions(self, settings):
+        """Test sessions kept outside the database are refused."""
+        settings.SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+
+        with pytest.raises(CommandError):
+            call_command("purge_sessions")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_vacuum(capsys):
+    """Test --vacuum runs outside a transaction once the purge is done."""
+    create_sessions(3, timedelta(days=-1))
+
+    call_command("purge_sessions", "--vacuum")
+
+    assert not Session.objects.exists()
+    assert "Vacuumed django_session." in capsys.readouterr().out
@@ -0,0 +1,86 @@
+"""
+Tests for the JSON renderer and parser.
+"""
+from __future__ import annotations
+
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework import parsers as drf_parsers
+from rest_framework import renderers as drf_renderers
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from shared import parsers, renderers
+
+pytestmark = pytest.mark.skipif(renderers.orjson is None, reason="orjson is not installed")
+
+PAYLOADS = [
+    {"id": uuid.UUID("0190a3b2-7c4d-7e8f-9a0b-1c2d3e4f5a6b"), "price": Decimal("19.99")},
+    {"created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)},
+    {"created_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone(timedelta(hours=2)))},
+    {"naive": datetime(2024, 5, 1, 12, 30, 15, 999), "day": date(2024, 5, 1), "at": time(9, 5, 1, 2500)},
+    {"duration": timedelta(minutes=90), "label": gettext_lazy("Products")},
+    ReturnList([ReturnDict({"name": "Montre à plongée ✓", "tags": ("a", "b")}, serializer=None)], serializer=None),
+    {"errors": [ErrorDetail("This field is required.", code="required")]},
+    {"count": 3, "ratio": 0.30000000000000004, "ok": True, "none": None, "nested": {"empty": []}},
+    {"big": 2**70},
+    {"line separator": "para graph"},
+    {1: "integer key"},
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_renders_the_same_bytes_as_drf(payload):
+    """Test the output matches DRF's JSONRenderer byte for byte."""
+    assert renderers.JSONRenderer().render(payload) == drf_renderers.JSONRenderer().render(payload)
+
+
+def test_indented_output_is_left_to_drf():
+    """Test a requested indent is honoured."""
+    context = {"indent": 4}
+
+    assert renderers.JSONRenderer().render({"a": 1}, renderer_context=context) == b'{\n    "a": 1\n}'
+
+
+def test_unserializable_values_fail_like_drf():
+    """Test values neither encoder handles raise DRF's TypeError."""
+    with pytest.raises(TypeError):
+        renderers.JSONRenderer().render({"value": object()})
+
+
+def test_falls_back_without_orjson(monkeypatch):
+    """Test the stdlib renderer and parser are used when orjson is missing."""
+    monkeypatch.setattr(renderers, "orjson", None)
+    monkeypatch.setattr(parsers, "orjson", None)
+
+    assert renderers.JSONRenderer().render({"price": Decimal("1.50")}) == b'{"price":1.5}'
+    assert parsers.JSONParser().parse(io.BytesIO(b'{"a":1}')) == {"a": 1}
+
+
+class TestJSONParser:
+    @pytest.mark.parametrize("body", [
+        b'{"items":[{"product_id":"abc","quantity":2}],"note":"caf\xc3\xa9"}',
+        b"[1, 2.5, -3e2, true, null]",
+        b'{"big": 123456789012345678901234567890}',
+        b'"\\ud83d\\ude00"',
+    ])
+    def test_parses_like_drf(self, body):
+        """Test bodies parse to the same values as with DRF's parser."""
+        parsed = parsers.JSONParser().parse(io.BytesIO(body))
+
+        assert parsed == drf_parsers.JSONParser().parse(io.BytesIO(body))
+
+    @pytest.mark.parametrize("body", [b'{"a": }', b'{"a": NaN}', b""])
+    def test_errors_match_drf(self, body):
+        """Test invalid bodies raise DRF's ParseError with its message."""
+        with pytest.raises(ParseError) as ours:
+            parsers.JSONParser().parse(io.BytesIO(body))
+        with pytest.raises(ParseError) as theirs:
+            drf_parsers.JSONParser().parse(io.BytesIO(body))
+
+        assert str(ours.value) == str(theirs.value)
@@ -0,0 +1,114 @@
+"""Tests for read replica routing."""
+from __future__ import annotations
+
+import time
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from orders.models import Order
+from products.models import Product
+from shared.middleware import PRIMARY_COOKIE, ReplicaRoutingMiddleware
+from shared.routers import ReplicaRouter, replica_routing
+
+router = ReplicaRouter()
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica1"]
+    settings.DATABASE_REPLICA_APPS = ["products"]
+    settings.DATABASE_REPLICA_STICKY_SECONDS = 5
+
+
+@pytest.mark.usefixtures("replicas")
+class TestReplicaRouter:
+    """Tests for the router's database choices."""
+
+    def test_catalog_reads_go_to_a_replica_inside_requests(self) -> None:
+        """Test that catalog reads in a request use a replica."""
+        with replica_routing():
+            assert router.db_for_read(Product) == "replica1"
+            assert router.db_for_read(Order) == "default"
+
+    def test_reads_outside_requests_use_the_primary(self) -> None:
+        """Test that commands and shells read from the primary."""
+        assert router.db_for_read(Product) == "default"
+
+    def test_writing_pins_the_rest_of_the_request(self) -> None:
+        """Test that a catalog write sends later reads to the primary."""
+        with replica_routing() as state:
+            assert router.db_for_write(Product) == "default"
+            assert router.db_for_read(Product) == "default"
+        assert state.wrote
+
+    def test_writes_to_other_apps_do_not_pin(self) -> None:
+        """Test that session or order writes don't pin the request."""
+        with replica_routing() as state:
+            router.db_for_write(Order)
+            assert router.db_for_read(Product) == "replica1"
+        assert not state.wrote
+
+    def test_migrations_only_run_on_the_primary(self) -> None:
+        """Test that replicas are never migrated."""
+        assert router.allow_migrate("default", "products")
+        assert not router.allow_migrate("replica1", "products")
+
+
+@pytest.mark.usefixtures("replicas")
+class TestReplicaRoutingMiddleware:
+    """Tests for the sticky-primary window."""
+
+    @staticmethod
+    def call(request, write: bool = False) -> tuple[HttpResponse, str]:
+        seen = {}
+
+        def view(request):
+            if write:
+                router.db_for_write(Product)
+            seen["db"] = router.db_for_read(Product)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return response, seen["db"]
+
+    def test_safe_requests_read_from_replicas(self) -> None:
+        """Test that GET requests read the catalog from a replica."""
+        response, db = self.call(RequestFactory().get("/api/products/"))
+
+        assert db == "replica1"
+        assert PRIMARY_COOKIE not in response.cookies
+
+    def test_unsafe_requests_use_the_primary(self) -> None:
+        """Test that POST requests read from the primary."""
+        _, db = self.call(RequestFactory().post("/api/cart/items/"))
+
+        assert db == "default"
+
+    def test_writes_keep_the_client_on_the_primary(self) -> None:
+        """Test that a write keeps the client on the primary for the window."""
+        response, _ = self.call(RequestFactory().post("/api/products/"), write=True)
+        cookie = response.cookies[PRIMARY_COOKIE]
+        assert cookie["max-age"] == 5
+
+        request = RequestFactory().get("/api/products/")
+        request.COOKIES[PRIMARY_COOKIE] = cookie.value
+        _, db = self.call(request)
+        assert db == "default"
+
+    def test_expired_window_reads_from_replicas(self) -> None:
+        """Test that an expired window goes back to replicas."""
+        request = RequestFactory().get("/api/products/")
+        request.COOKIES[PRIMARY_COOKIE] = str(time.time() - 1)
+
+        _, db = self.call(request)
+
+        assert db == "replica1"
+
+
+@pytest.mark.django_db
+def test_without_replicas_everything_uses_the_primary() -> None:
+    """With no DB_REPLICAS configured, routing is a no-op."""
+    with replica_routing():
+        assert router.db_for_read(Product) == "default"
@@ -0,0 +1,116 @@
+"""
+Tests for the slow query log.
+"""
+from __future__ import annotations
+
+import logging
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from products.models import Category, Product
+from shared import slowqueries
+from shared.models import SlowQuery
+
+
+@pytest.fixture
+def every_query_is_slow(settings):
+    """Treat every query as slow and explain all of them."""
+    settings.SLOW_QUERY_MS = 0.000001
+    settings.SLOW_QUERY_EXPLAIN_RATE = 1.0
+    settings.SLOW_QUERY_LOG_SIZE = 50
+
+
+@pytest.fixture
+def product(db):
+    category = Category.objects.create(name="Luxury", slug="luxury")
+    return Product.objects.create(
+        name="Diver", slug="diver", description="Diver", price="100.00", category=category
+    )
+
+
+@pytest.mark.usefixtures("every_query_is_slow")
+class TestSlowQueryLog:
+    def test_records_query_plan_and_origin(self, product, django_capture_on_commit_callbacks):
+        """Test a slow query is saved with its plan and the code that ran it."""
+        with django_capture_on_commit_callbacks(execute=True):
+            list(Product.objects.filter(slug="diver"))
+
+        entry = SlowQuery.objects.filter(sql__contains='"products_product"').first()
+        assert entry.database == "default"
+        assert "products_product" in entry.plan
+        assert "test_slowqueries.py" in entry.stack
+        assert entry.route == ""
+
+    def test_records_the_request_route(self, product, django_capture_on_commit_callbacks):
+        """Test queries run by a request name its route and view."""
+        with django_capture_on_commit_callbacks(execute=True):
+            APIClient().get(reverse("products:product-detail", kwargs={"pk": product.pk}))
+
+        entry = SlowQuery.objects.filter(sql__contains='"products_product"').first()
+        assert entry.route == "GET /api/products/<uuid:pk>/"
+        assert entry.view == "products.views.ProductDetailView"
+
+    def test_logs_a_warning(self, product, caplog):
+        """Test slow queries are logged with their duration."""
+        with caplog.at_level(logging.WARNING, logger="shared.slowqueries"):
+            Product.objects.count()
+
+        record = caplog.records[-1]
+        assert record.getMessage().startswith("Slow query")
+        assert record.duration_ms > 0
+
+    def test_keeps_only_the_newest_entries(self, product, settings, django_capture_on_commit_callbacks):
+        """Test the log is a ring buffer of SLOW_QUERY_LOG_SIZE rows."""
+        settings.SLOW_QUERY_LOG_SIZE = 3
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for number in range(10):
+                Product.objects.filter(name=f"query {number}").exists()
+
+        entries = list(SlowQuery.objects.values_list("sql", flat=True))
+        assert len(entries) == 3
+        assert "query 9" in SlowQuery.objects.first().params
+
+    def test_off_when_threshold_is_zero(self, product, settings, django_capture_on_commit_callbacks):
+        """Test SLOW_QUERY_MS=0 turns the log off."""
+        settings.SLOW_QUERY_MS = 0
+        logged = SlowQuery.objects.count()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Product.objects.count()
+
+        assert SlowQuery.objects.count() == logged
+
+
+def test_format_plan_indents_sqlite_trees() -> None:
+    """Test SQLite plan rows are indented under their parents."""
+    rows = [(2, 0, 0, "SCAN products_product"), (5, 2, 0, "USING INDEX x"), (9, 0, 0, "SORT")]
+
+    assert slowqueries.format_plan(rows) == "SCAN products_product\n  USING INDEX x\nSORT"
+
+
+@pytest.mark.django_db
+class TestSlowQueriesCommand:
+    def test_lists_entries(self, capsys):
+        """Test the command prints the newest entries with plans."""
+        SlowQuery.objects.create(
+            sql="SELECT 1", duration_ms=250, database="default", route="GET /api/products/",
+            plan="SCAN products_product",
+        )
+
+        call_command("slow_queries", "--plans")
+
+        output = capsys.readouterr().out
+        assert "250.0 ms  GET /api/products/" in output
+        assert "SCAN products_product" in output
+
+    def test_clear(self, capsys):
+        """Test --clear empties the log."""
+        SlowQuery.objects.create(sql="SELECT 1", duration_ms=250, database="default")
+
+        call_command("slow_queries", "--clear")
+
+        assert not SlowQuery.objects.exists()
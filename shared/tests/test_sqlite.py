@@ -0,0 +1,44 @@
+"""Tests for the tuned SQLite backend."""
+from __future__ import annotations
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from shared.sqlite import pragma_statements
+
+
+def test_pragma_statements_skip_empty_values() -> None:
+    """Empty settings leave SQLite's default in place."""
+    statements = pragma_statements({"journal_mode": "wal", "mmap_size": "", "cache_size": -2000})
+
+    assert statements == ["PRAGMA journal_mode = wal", "PRAGMA cache_size = -2000"]
+
+
+def test_pragma_statements_reject_unsafe_values() -> None:
+    """Values from the environment can't smuggle in other SQL."""
+    with pytest.raises(ImproperlyConfigured):
+        pragma_statements({"synchronous": "off; DROP TABLE products"})
+
+
+@pytest.mark.django_db
+def test_connections_are_tuned() -> None:
+    """New connections get the configured PRAGMAs."""
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1  # NORMAL
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == 5000
+        cursor.execute("PRAGMA temp_store")
+        assert cursor.fetchone()[0] == 2  # MEMORY
+
+
+@pytest.mark.django_db(transaction=True)
+def test_atomic_takes_the_write_lock_up_front() -> None:
+    """atomic() starts with BEGIN IMMEDIATE so writers wait instead of failing."""
+    with CaptureQueriesContext(connection) as captured:
+        with transaction.atomic():
+            pass
+
+    assert captured.captured_queries[0]["sql"] == "BEGIN IMMEDIATE"
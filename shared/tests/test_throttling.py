@@ -0,0 +1,192 @@
+"""
+Tests for rate limiting.
+"""
+from __future__ import annotations
+
+import os
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from shared import throttling
+
+
+def decide(algorithm, state, now, limit=3, period=60):
+    return algorithm(state, now, limit, period)
+
+
+def run(algorithm, times, limit=3, period=60):
+    """Return the allowed flags of requests made at `times`."""
+    state, allowed = None, []
+    for now in times:
+        state, ok, _ = algorithm(state, now, limit, period)
+        allowed.append(ok)
+    return allowed
+
+
+@pytest.fixture
+def rates(settings):
+    """Set the throttle rates for the test."""
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+    return set_rates
+
+
+class TestAlgorithms:
+    def test_token_bucket_bursts_then_refills(self):
+        """Test a full bucket allows the limit at once, then one per period/limit."""
+        allowed = run(throttling.token_bucket, [0, 0, 0, 0, 19, 20])
+
+        assert allowed == [True, True, True, False, False, True]
+
+    def test_token_bucket_wait(self):
+        """Test the wait is the time until the next token."""
+        state = None
+        for _ in range(3):
+            state, _, _ = decide(throttling.token_bucket, state, 0)
+
+        _, allowed, wait = decide(throttling.token_bucket, state, 5)
+
+        assert not allowed
+        assert wait == pytest.approx(15)
+
+    def test_zero_limit_blocks(self):
+        """Test a "0/<period>" rate refuses every request for a period."""
+        for algorithm in (throttling.token_bucket, throttling.sliding_window):
+            _, allowed, wait = decide(algorithm, None, 0, limit=0)
+
+            assert not allowed
+            assert wait == 60
+
+    def test_sliding_window_counts_the_last_period(self):
+        """Test requests in the previous window still count, fading as it ends."""
+        # The first window's three weigh 2.95 at 61s, 2.9 at 62s, 2 at 80s
+        # and 1 at 100s, on top of the one allowed at 61s
+        times = [0, 1, 2, 61, 62, 80, 100]
+        assert run(throttling.sliding_window, times) == [True, True, True, True, False, False, True]
+
+    def test_sliding_window_wait(self):
+        """Test the wait is the time until the estimate drops below the limit."""
+        state = None
+        for now in (0, 1, 2):
+            state, _, _ = decide(throttling.sliding_window, state, now)
+
+        _, allowed, wait = decide(throttling.sliding_window, state, 30)
+
+        assert not allowed
+        assert wait == pytest.approx(30)
+
+    def test_parse_rate(self):
+        """Test DRF's rate format."""
+        assert throttling.parse_rate("30/min") == (30, 60)
+        assert throttling.parse_rate("1000/day") == (1000, 86400)
+
+
+class TestStores:
+    def allowed(self, store, key="client", count=4):
+        def update(state, now):
+            return throttling.token_bucket(state, now, 3, 60)
+        return [store.update(key, update, ttl=60)[0] for _ in range(count)]
+
+    def test_memory_store(self):
+        """Test each key has its own state."""
+        store = throttling.MemoryStore()
+
+        assert self.allowed(store) == [True, True, True, False]
+        assert self.allowed(store, "other", 1) == [True]
+
+    def test_file_store_is_shared_between_processes(self, tmp_path):
+        """Test a forked process and its parent count against one limit."""
+        path = str(tmp_path / "throttle")
+        store = throttling.FileStore(path, slots=64)
+        assert self.allowed(store, count=2) == [True, True]
+
+        pid = os.fork()
+        if pid == 0:
+            child = throttling.FileStore(path, slots=64)
+            os._exit(0 if self.allowed(child, count=1) == [True] else 1)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert self.allowed(store, count=1) == [False]
+        store.close()
+
+    def test_file_store_makes_room_for_new_clients(self, tmp_path):
+        """Test a full group of slots makes room for new clients."""
+        store = throttling.FileStore(str(tmp_path / "throttle"), slots=4)
+
+        for number in range(10):
+            assert self.allowed(store, f"client {number}", count=1) == [True]
+        store.close()
+
+    def test_cache_store(self):
+        """Test state kept in the Django cache."""
+        store = throttling.CacheStore("default")
+
+        assert self.allowed(store, "cache client") == [True, True, True, False]
+
+
+@pytest.mark.django_db
+class TestThrottledViews:
+    def test_cart_add_is_throttled(self, rates):
+        """Test a client past the cart rate gets 429 and Retry-After."""
+        rates(cart="2/min")
+        client = APIClient()
+        url = reverse("orders:cart-add")
+
+        statuses = [client.post(url, {}).status_code for _ in range(3)]
+
+        assert statuses == [400, 400, 429]
+        assert int(client.post(url, {})["Retry-After"]) > 0
+
+    def test_zero_rate_blocks_the_scope(self, rates):
+        """Test a "0/min" rate refuses requests rather than failing."""
+        rates(cart="0/min")
+
+        response = APIClient().post(reverse("orders:cart-add"), {})
+
+        assert response.status_code == 429
+        assert int(response["Retry-After"]) == 60
+
+    def test_clients_are_limited_separately(self, rates):
+        """Test another address has its own limit."""
+        rates(products="1/min")
+        url = reverse("products:product-list")
+
+        assert APIClient(REMOTE_ADDR="10.0.0.1").get(url).status_code == 200
+        assert APIClient(REMOTE_ADDR="10.0.0.1").get(url).status_code == 429
+        assert APIClient(REMOTE_ADDR="10.0.0.2").get(url).status_code == 200
+
+    def test_forwarded_for_does_not_pick_the_client(self, rates):
+        """Test rotating X-Forwarded-For doesn't give a client fresh limits."""
+        rates(products="2/min")
+        url = reverse("products:product-list")
+
+        statuses = [
+            APIClient().get(url, HTTP_X_FORWARDED_FOR=f"198.51.100.{number}").status_code
+            for number in range(3)
+        ]
+
+        assert statuses == [200, 200, 429]
+
+    def test_signed_in_rate(self, rates):
+        """Test a "<scope>:user" rate applies to signed-in clients."""
+        rates(products="1/min", **{"products:user": "5/min"})
+        user = User.objects.create_user(email="shopper@example.com", password="x")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        url = reverse("products:product-list")
+
+        assert [client.get(url).status_code for _ in range(3)] == [200, 200, 200]
+
+    def test_can_be_turned_off(self, rates, settings):
+        """Test THROTTLING=False lets every request through."""
+        rates(products="1/min")
+        settings.THROTTLING = False
+        client = APIClient()
+        url = reverse("products:product-list")
+
+        assert [client.get(url).status_code for _ in range(3)] == [200, 200, 200]
@@ -0,0 +1,141 @@
+"""
+Tests for per-request timing and the Server-Timing header.
+"""
+from __future__ import annotations
+
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from products.models import Category, Product
+from shared import timing
+from shared.middleware import RequestTimingMiddleware
+
+
+@pytest.fixture
+def product(db):
+    category = Category.objects.create(name="Luxury", slug="luxury")
+    return Product.objects.create(
+        name="Diver", slug="diver", description="Diver", price="100.00", category=category
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_routes():
+    timing.routes.reset()
+    yield
+    timing.routes.reset()
+
+
+def server_timing(response) -> dict[str, str]:
+    """Parse a Server-Timing header into {metric: parameters}."""
+    metrics = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, _, params = entry.partition(";")
+        metrics[name] = params
+    return metrics
+
+
+def duration(params: str) -> float:
+    return float(re.search(r"dur=([\d.]+)", params).group(1))
+
+
+class TestServerTiming:
+    def test_header_breaks_down_the_request(self, product):
+        """Test the header has total, database and render timings."""
+        response = APIClient().get(reverse("products:product-detail", kwargs={"pk": product.pk}))
+
+        metrics = server_timing(response)
+        assert set(metrics) == {"total", "db", "render"}
+        assert duration(metrics["db"]) <= duration(metrics["total"])
+        assert duration(metrics["render"]) <= duration(metrics["total"])
+        assert int(re.search(r'desc="(\d+) queries"', metrics["db"]).group(1)) >= 1
+
+    def test_async_requests_count_queries(self, product):
+        """Test queries run in worker threads under ASGI are counted."""
+
+        async def get():
+            return await AsyncClient().get(reverse("products:product-list"))
+
+        response = async_to_sync(get)()
+
+        assert response.status_code == 200
+        assert 'desc="0 queries"' not in server_timing(response)["db"]
+
+    def test_queries_outside_requests_are_not_counted(self, product):
+        """Test the execute wrapper passes queries straight through between requests."""
+        timing.install()
+
+        assert timing.current() is None
+        assert Product.objects.count() == 1
+
+    def test_disabled(self, settings):
+        """Test REQUEST_TIMING=False removes the middleware."""
+        settings.REQUEST_TIMING = False
+
+        with pytest.raises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: HttpResponse())
+
+
+class TestRequestLog:
+    def test_logs_timings_as_fields(self, product, caplog):
+        """Test each request is logged with its route and timings."""
+        with caplog.at_level(logging.INFO, logger="shared.timing"):
+            APIClient().get(reverse("products:product-detail", kwargs={"pk": product.pk}))
+
+        record = caplog.records[-1]
+        assert record.route == "GET /api/products/<uuid:pk>/"
+        assert record.status == 200
+        assert record.db_queries >= 1
+        assert record.duration_ms >= record.db_ms
+
+
+class TestRouteStats:
+    def test_aggregates_by_route_pattern(self, product):
+        """Test requests for different ids are totalled under one route."""
+        client = APIClient()
+        client.get(reverse("products:product-detail", kwargs={"pk": product.pk}))
+        client.get(reverse("products:product-by-slug", kwargs={"slug": product.slug}))
+        client.get(reverse("products:product-by-slug", kwargs={"slug": "missing"}))
+        client.get("/nowhere/")
+
+        stats = timing.route_stats()
+
+        assert stats["GET /api/products/by-slug/<slug:slug>/"]["requests"] == 2
+        assert stats["GET /api/products/<uuid:pk>/"]["requests"] == 1
+        assert stats["GET <unmatched>"]["requests"] == 1
+        detail = stats["GET /api/products/<uuid:pk>/"]
+        assert detail["max_ms"] >= detail["mean_ms"] >= detail["db_mean_ms"]
+
+    def test_unknown_methods_share_a_route(self, product):
+        """Test methods outside the standard set are totalled as "other"."""
+        client = APIClient()
+        for method in ("BREW", "PROPFIND"):
+            client.generic(method, reverse("products:product-list"))
+
+        stats = timing.route_stats()
+
+        assert stats["other /api/products/"]["requests"] == 2
+        assert not any(route.startswith(("BREW", "PROPFIND")) for route in stats)
+
+    def test_endpoint_is_admin_only(self, product):
+        """Test only staff can read the per-route timings."""
+        client = APIClient()
+        assert client.get(reverse("route-timings")).status_code in (401, 403)
+
+        admin = User.objects.create_user(email="admin@example.com", password="x", is_staff=True)
+        client.force_authenticate(user=admin)
+        client.get(reverse("products:product-list"))
+
+        response = client.get(reverse("route-timings"))
+
+        assert response.status_code == 200
+        assert response.json()["GET /api/products/"]["requests"] == 1
@@ -0,0 +1,27 @@
+"""
+Tests for per-process cache warm-up.
+"""
+from __future__ import annotations
+
+import pytest
+
+from orders import rates
+from shared.warmup import STEPS, warm_caches
+
+
+@pytest.mark.django_db
+class TestWarmCaches:
+    def test_times_every_step(self):
+        """Test every step reports how long it took."""
+        timings = warm_caches()
+
+        assert list(timings) == [name for name, _ in STEPS]
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    def test_loads_rate_table(self):
+        """Test the rate table is cached after warming up."""
+        rates.invalidate()
+
+        warm_caches()
+
+        assert rates._table is not None
@@ -0,0 +1,272 @@
+"""
+Per-client rate limits for DRF views.
+
+A view names its limit with ``throttle_scope`` and picks an algorithm:
+
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "cart"
+
+Rates come from ``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]`` in DRF's
+``"<requests>/<period>"`` form. Each client (a signed-in user by id,
+otherwise the address DRF's ``get_ident()`` finds, which trusts
+X-Forwarded-For only as far as ``NUM_PROXIES`` allows) has its own limit per
+scope; a ``"<scope>:user"`` rate, when set, applies to signed-in clients.
+
+* `TokenBucketThrottle` allows bursts of up to the limit, refilled evenly
+  over the period;
+* `SlidingWindowThrottle` counts requests in the last period, estimated
+  from the current and previous fixed windows.
+
+Their state lives in the store named by ``settings.THROTTLE_STORE``:
+``"memory"`` (this process only), ``"file"`` (a memory-mapped file at
+``THROTTLE_FILE`` shared by the workers on one host; gunicorn.conf.py puts
+one on /dev/shm) or ``"cache"`` (the Django cache ``THROTTLE_CACHE``, shared
+by every host).
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from shared import metrics
+
+THROTTLED = metrics.counter("throttled_requests_total", "Requests refused by throttles", ["scope"])
+
+# Per-client state: three floats whose meaning depends on the algorithm
+State = tuple[float, float, float]
+# The new state, whether the request is allowed and seconds to wait
+Decision = tuple[State, bool, float]
+Update = Callable[[State | None, float], Decision]
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@lru_cache(maxsize=64)
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Return (requests, period in seconds) for a rate such as ``"30/min"``."""
+    requests, _, period = rate.partition("/")
+    return int(requests), PERIODS[period[0]]
+
+
+def token_bucket(state: State | None, now: float, limit: int, period: int) -> Decision:
+    """State: (tokens left, when they were counted, unused)."""
+    if limit < 1:
+        # A zero rate blocks the scope; there's no refill to wait for
+        return (0.0, now, 0.0), False, float(period)
+    rate = limit / period
+    tokens, updated = (limit, now) if state is None else (state[0], state[1])
+    tokens = min(limit, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now, 0.0), True, 0.0
+    return (tokens, now, 0.0), False, (1 - tokens) / rate
+
+
+def sliding_window(state: State | None, now: float, limit: int, period: int) -> Decision:
+    """State: (start of the current window, previous window's count, current count)."""
+    start = now - now % period
+    previous = current = 0.0
+    if state is not None:
+        window, previous, current = state
+        if start - window >= 2 * period:
+            previous = current = 0.0
+        elif start != window:
+            previous, current = current, 0.0
+    elapsed = now - start
+    # The previous window's requests, spread evenly, still in the last period
+    if previous * (1 - elapsed / period) + current < limit:
+        return (start, previous, current + 1), True, 0.0
+    if current >= limit:
+        wait = period - elapsed
+    else:
+        wait = period * (1 - (limit - current) / previous) - elapsed
+    return (start, previous, current), False, max(wait, 0.0)
+
+
+class MemoryStore:
+    """State in this process, for the most recently seen `size` clients."""
+
+    def __init__(self, size: int = 100_000) -> None:
+        self._lock = threading.Lock()
+        self._size = size
+        self._states: OrderedDict[str, tuple[float, State]] = OrderedDict()
+
+    def update(self, key: str, update: Update, ttl: float) -> tuple[bool, float]:
+        with self._lock:
+            now = time.time()
+            expires, state = self._states.get(key, (0.0, None))
+            state, allowed, wait = update(state if expires > now else None, now)
+            self._states[key] = (now + ttl, state)
+            self._states.move_to_end(key)
+            if len(self._states) > self._size:
+                self._states.popitem(last=False)
+        return allowed, wait
+
+
+# Slot layout: key hash (0 for empty), expiry time, then the state
+_SLOT = struct.Struct("<Q4d")
+# Slots a key may occupy; the group is locked as one byte range
+_WAYS = 4
+
+
+class FileStore:
+    """
+    State in a memory-mapped file shared by the processes on one host.
+
+    The file is a hash table of `slots` fixed-size slots, in groups of
+    `_WAYS`. A key takes a slot in the group its hash picks; when the group
+    is full, the entry expiring first is replaced. A group is updated under
+    a thread lock and an fcntl lock on its bytes.
+    """
+
+    def __init__(self, path: str, slots: int = 65536) -> None:
+        self._lock = threading.Lock()
+        self._groups = max(slots // _WAYS, 1)
+        size = self._groups * _WAYS * _SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def update(self, key: str, update: Update, ttl: float) -> tuple[bool, float]:
+        # Python's hash() differs between processes; never 0, which marks empty slots
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        digest = int.from_bytes(digest, "little") | 1
+        start = (digest % self._groups) * _WAYS * _SLOT.size
+        length = _WAYS * _SLOT.size
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                now = time.time()
+                slot, state, soonest = None, None, None
+                for offset in range(start, start + length, _SLOT.size):
+                    hashed, expires, *values = _SLOT.unpack_from(self._map, offset)
+                    if hashed == digest:
+                        slot = offset
+                        if expires > now:
+                            state = tuple(values[:3])
+                        break
+                    if soonest is None or expires < soonest:
+                        slot, soonest = offset, expires
+                state, allowed, wait = update(state, now)
+                _SLOT.pack_into(self._map, slot, digest, now + ttl, *state)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+        return allowed, wait
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+class CacheStore:
+    """
+    State in a Django cache, shared by every host using it.
+
+    Updates read and then write the state, so concurrent requests from one
+    client may each see the same state and let a few extra requests through.
+    """
+
+    def __init__(self, alias: str) -> None:
+        self._cache = caches[alias]
+
+    def update(self, key: str, update: Update, ttl: float) -> tuple[bool, float]:
+        key = f"throttle:{key}"
+        state, allowed, wait = update(self._cache.get(key), time.time())
+        self._cache.set(key, state, timeout=ttl)
+        return allowed, wait
+
+
+_store_lock = threading.Lock()
+_store: MemoryStore | FileStore | CacheStore | None = None
+_store_pid: int | None = None
+
+
+def get_store() -> MemoryStore | FileStore | CacheStore:
+    """Return this process's store, opening it on first use."""
+    global _store, _store_pid
+    store = _store
+    if store is not None and _store_pid == os.getpid():
+        return store
+    with _store_lock:
+        # A forked worker opens its own; the parent's locks aren't its own
+        if _store is None or _store_pid != os.getpid():
+            if settings.THROTTLE_STORE == "file":
+                _store = FileStore(settings.THROTTLE_FILE, settings.THROTTLE_FILE_SLOTS)
+            elif settings.THROTTLE_STORE == "cache":
+                _store = CacheStore(settings.THROTTLE_CACHE)
+            else:
+                _store = MemoryStore()
+            _store_pid = os.getpid()
+        return _store
+
+
+def reset() -> None:
+    """Forget the store, so the next request opens it again (for tests)."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+class Throttle(BaseThrottle):
+    """Limit each client to the rate of the view's ``throttle_scope``."""
+
+    algorithm = staticmethod(token_bucket)
+    # How many periods the state matters for
+    periods_kept = 1
+
+    def get_rate(self, request, scope: str) -> str | None:
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        if request.user and request.user.is_authenticated:
+            return rates.get(f"{scope}:user", rates.get(scope))
+        return rates.get(scope)
+
+    def get_client(self, request) -> str:
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view) -> bool:
+        self._wait = None
+        scope = getattr(view, "throttle_scope", None)
+        rate = self.get_rate(request, scope) if scope and settings.THROTTLING else None
+        if rate is None:
+            return True
+        limit, period = parse_rate(rate)
+        allowed, wait = get_store().update(
+            f"{scope}:{self.get_client(request)}",
+            lambda state, now: self.algorithm(state, now, limit, period),
+            ttl=period * self.periods_kept,
+        )
+        if not allowed:
+            THROTTLED.labels(scope=scope).inc()
+            self._wait = wait
+        return allowed
+
+    def wait(self) -> float | None:
+        return self._wait
+
+
+class TokenBucketThrottle(Throttle):
+    """Bursts of up to the limit, refilled evenly over the period."""
+
+    algorithm = staticmethod(token_bucket)
+
+
+class SlidingWindowThrottle(Throttle):
+    """At most the limit in any period, estimated from two fixed windows."""
+
+    algorithm = staticmethod(sliding_window)
+    periods_kept = 2
@@ -0,0 +1,210 @@
+"""
+Per-request timing: total, database and render time.
+
+`RequestTimingMiddleware` starts a `RequestTiming` for each request. Every
+database connection carries `record_query` as an execute wrapper, which adds
+each query's time to the current request's timing. The request is tracked in
+a ContextVar, so queries the async ORM runs in worker threads still count.
+Outside a request the wrapper only does one ContextVar lookup.
+
+Finished requests are logged to the ``shared.timing`` logger with their
+timings as structured fields, added to in-process per-route totals
+(`route_stats()`) and recorded in the request metrics.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from . import metrics
+
+logger = logging.getLogger("shared.timing")
+
+REQUESTS = metrics.counter(
+    "http_requests_total", "Requests handled by method, route and status",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = metrics.gauge("http_requests_in_progress", "Requests being handled")
+REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "Request duration by method and route", ["method", "route"]
+)
+REQUEST_DB_DURATION = metrics.histogram(
+    "http_request_db_duration_seconds", "Database time per request by method and route",
+    ["method", "route"],
+)
+DB_QUERIES = metrics.counter("db_queries_total", "Database queries run by requests")
+
+
+class RequestTiming:
+    """Time spent by one request, in seconds."""
+
+    __slots__ = ("request", "started", "db", "queries", "render_started", "render")
+
+    def __init__(self, request=None) -> None:
+        self.request = request
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.render_started = 0.0
+        self.render = 0.0
+
+    def start_render(self) -> None:
+        self.render_started = time.perf_counter()
+
+    def end_render(self, response=None) -> None:
+        self.render = time.perf_counter() - self.render_started
+
+    def header(self, total: float) -> str:
+        """Format as a Server-Timing header value (durations in ms)."""
+        metrics = [
+            f"total;dur={total * 1000:.1f}",
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+        ]
+        if self.render_started:
+            metrics.append(f"render;dur={self.render * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+def current() -> RequestTiming | None:
+    return _current.get()
+
+
+def start(request=None) -> tuple[RequestTiming, object]:
+    """Start timing a request; pass the token to `stop()`."""
+    timing = RequestTiming(request)
+    REQUESTS_IN_PROGRESS.inc()
+    return timing, _current.set(timing)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding the query's duration to the current request."""
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db += time.perf_counter() - started
+        timing.queries += 1
+
+
+def _install(connection, **kwargs) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install() -> None:
+    """Time queries on every connection, including ones already open."""
+    connection_created.connect(_install, dispatch_uid="shared.timing")
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
+
+
+class RouteStats:
+    """Thread-safe running totals per route."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[str, list[float]] = {}
+
+    def add(self, route: str, total: float, timing: RequestTiming) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = [0, 0.0, 0.0, 0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += total
+            stats[2] += timing.db
+            stats[3] += timing.queries
+            stats[4] += timing.render
+            stats[5] = max(stats[5], total)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Return the request count and mean/max timings (ms) per route."""
+        with self._lock:
+            routes = {route: list(stats) for route, stats in self._routes.items()}
+        return {
+            route: {
+                "requests": count,
+                "mean_ms": round(total / count * 1000, 3),
+                "max_ms": round(longest * 1000, 3),
+                "db_mean_ms": round(db / count * 1000, 3),
+                "queries_mean": round(queries / count, 2),
+                "render_mean_ms": round(render / count * 1000, 3),
+            }
+            for route, (count, total, db, queries, render, longest) in sorted(routes.items())
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+routes = RouteStats()
+
+
+def route_stats() -> dict[str, dict[str, float]]:
+    """Per-route timings for the requests this process has served."""
+    return routes.snapshot()
+
+
+# Clients can send any method; others share one label rather than each adding
+# series to the metrics (and entries to their files) for good
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+def method_name(request) -> str:
+    return request.method if request.method in METHODS else "other"
+
+
+def route_pattern(request) -> str:
+    # The URL pattern rather than the path, so ids don't make new routes
+    match = request.resolver_match
+    return f"/{match.route}" if match is not None else "<unmatched>"
+
+
+def route_name(request) -> str:
+    return f"{method_name(request)} {route_pattern(request)}"
+
+
+def stop(token) -> None:
+    _current.reset(token)
+    REQUESTS_IN_PROGRESS.dec()
+
+
+def finish(request, response, timing: RequestTiming) -> None:
+    """Set Server-Timing, log the request and add it to the route totals."""
+    total = time.perf_counter() - timing.started
+    response["Server-Timing"] = timing.header(total)
+
+    method, pattern = method_name(request), route_pattern(request)
+    route = f"{method} {pattern}"
+    routes.add(route, total, timing)
+    REQUESTS.labels(method=method, route=pattern, status=response.status_code).inc()
+    REQUEST_DURATION.labels(method=method, route=pattern).observe(total)
+    REQUEST_DB_DURATION.labels(method=method, route=pattern).observe(timing.db)
+    DB_QUERIES.inc(timing.queries)
+    logger.info(
+        "%s %s %s %.1fms",
+        request.method,
+        request.path,
+        response.status_code,
+        total * 1000,
+        extra={
+            "route": route,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 3),
+            "db_ms": round(timing.db * 1000, 3),
+            "db_queries": timing.queries,
+            "render_ms": round(timing.render * 1000, 3),
+        },
+    )
@@ -0,0 +1,211 @@
+"""
+Shared DRF views and async building blocks.
+
+DRF only dispatches synchronously. `AsyncAPIView` is an APIView whose
+handlers are coroutines: authentication, permissions and throttles still run
+through DRF (in a worker thread, since they may touch the database), while
+the handler itself uses Django's async ORM. Under ASGI this frees the event
+loop while queries run; under WSGI Django runs the view with async_to_sync.
+"""
+from __future__ import annotations
+
+import asyncio
+import hmac
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import httpcache, metrics, timing
+
+
+class SparseFieldsViewMixin:
+    """
+    Let clients ask for only some fields, e.g. ``?fields=id,name,price``.
+
+    `sparse_fields` caps which fields may be asked for. The serializer must
+    use `shared.serializers.SparseFieldsMixin`; generic views then serialize
+    just those fields from a queryset loading just what they read. Other
+    views call `get_sparse_fields()` and `sparse_queryset()` themselves.
+    """
+
+    sparse_fields: tuple[str, ...] = ()
+    sparse_fields_param = "fields"
+
+    def get_sparse_fields(self) -> list[str] | None:
+        """Return the requested fields, or None for all of them."""
+        value = self.request.query_params.get(self.sparse_fields_param, "")
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        if not fields or not self.sparse_fields:
+            return None
+        unknown = [name for name in fields if name not in self.sparse_fields]
+        if unknown:
+            raise ValidationError({
+                self.sparse_fields_param: [
+                    f"Unknown fields: {', '.join(unknown)}. "
+                    f"Choose from: {', '.join(self.sparse_fields)}."
+                ]
+            })
+        return fields
+
+    def sparse_queryset(self, queryset, serializer_class):
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return serializer_class.narrow_queryset(queryset, fields)
+
+    def filter_queryset(self, queryset):
+        # Not get_queryset(), which views override
+        return self.sparse_queryset(super().filter_queryset(queryset), self.get_serializer_class())
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+
+class CachePolicyMixin:
+    """
+    Let browsers and shared caches keep successful anonymous GETs, as set
+    by `cache_policy`, and tag them with surrogate keys (see
+    shared/httpcache): `surrogate_keys` plus `get_instance_keys()` of each
+    object serialized.
+    """
+
+    cache_policy: httpcache.CachePolicy | None = None
+    surrogate_keys: tuple[str, ...] = ()
+
+    def get_instance_keys(self, instance) -> list[str]:
+        return []
+
+    def get_serializer(self, *args, **kwargs):
+        if args:
+            self._serialized = args[0]
+        return super().get_serializer(*args, **kwargs)
+
+    def get_surrogate_keys(self) -> set[str]:
+        keys = set(self.surrogate_keys)
+        serialized = getattr(self, "_serialized", None)
+        if serialized is not None:
+            instances = serialized if isinstance(serialized, (list, QuerySet)) else [serialized]
+            for instance in instances:
+                keys.update(self.get_instance_keys(instance))
+        return keys
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.cache_policy is not None:
+            httpcache.apply(self.cache_policy, request, response, self.get_surrogate_keys())
+        return response
+
+
+class AsyncAPIView(APIView):
+    """An APIView with `async def` handlers."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # csrf_exempt() wraps the view in a plain function on Django 4.2,
+        # hiding that it returns a coroutine
+        if cls.view_is_async:
+            markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def apaginate_queryset(self, queryset):
+        """Async `paginate_queryset()`: return one page of objects, or None."""
+        if self.paginator is None:
+            return None
+        return await apaginate(self.paginator, queryset, self.request)
+
+
+class RouteTimingView(APIView):
+    """Per-route request timings from the process serving this request."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(timing.route_stats())
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint, behind settings.METRICS_TOKEN. Without a
+    token it is only served with DEBUG on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        raise Http404
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            response = HttpResponse(status=401)
+            response["WWW-Authenticate"] = "Bearer"
+            return response
+    return HttpResponse(metrics.exposition(), content_type=metrics.CONTENT_TYPE)
+
+
+def serve(sync_view: type[APIView], async_view: type[AsyncAPIView]):
+    """Route to `async_view` when settings.ASYNC_VIEWS is on (under ASGI)."""
+    return (async_view if settings.ASYNC_VIEWS else sync_view).as_view()
+
+
+async def apaginate(paginator: PageNumberPagination, queryset, request) -> list | None:
+    """
+    Fill `paginator` with a page of `queryset` using the async ORM, exactly
+    as `PageNumberPagination.paginate_queryset()` would.
+    """
+    paginator.request = request
+    page_size = paginator.get_page_size(request)
+    if not page_size:
+        return None
+
+    # Paginate the row numbers, then fetch only the rows on the page
+    django_paginator = paginator.django_paginator_class(range(await queryset.acount()), page_size)
+    page_number = paginator.get_page_number(request, django_paginator)
+    try:
+        page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        msg = paginator.invalid_page_message.format(page_number=page_number, message=str(exc))
+        raise NotFound(msg)
+
+    rows = page.object_list
+    page.object_list = [obj async for obj in queryset[rows.start:rows.stop]]
+    paginator.page = page
+    if django_paginator.num_pages > 1 and paginator.template is not None:
+        paginator.display_page_controls = True
+    return page.object_list
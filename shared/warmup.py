@@ -0,0 +1,42 @@
+"""
+Per-process cache warm-up.
+
+A freshly forked worker would otherwise pay for URL resolution, the
+tax/shipping rate table and its first database connection on its first
+few requests. gunicorn.conf.py calls `warm_caches()` in each new worker.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from django.db import connection
+from django.urls import reverse
+
+from orders.rates import get_rate_table
+
+
+def resolve_urls() -> None:
+    """Import every view and build the URL resolver's lookup tables."""
+    reverse("products:product-list")
+
+
+def connect() -> None:
+    connection.ensure_connection()
+
+
+STEPS: list[tuple[str, Callable[[], object]]] = [
+    ("urls", resolve_urls),
+    ("database", connect),
+    ("rate table", get_rate_table),
+]
+
+
+def warm_caches() -> dict[str, float]:
+    """Fill this process's caches; return the seconds each step took."""
+    timings = {}
+    for name, step in STEPS:
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+    return timings